@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from apps.kachel1_auftragsverwaltung.models import Auftrag
 from apps.kachel2_analyse.models import Arbeitsprobe, Script
@@ -57,6 +58,23 @@ class ArbeitsprobeSerializer(serializers.ModelSerializer):
         return arbeitsprobe
 
 
+class ArbeitsprobenBatchSerializer(serializers.Serializer):
+    """Eingabe für batch_generate (mehrere Qualitätsstufen für einen Job)"""
+
+    auftrag = serializers.CharField()
+    upwork_job_description = serializers.CharField()
+    upwork_job_url = serializers.URLField(required=False, allow_blank=True, allow_null=True)
+    word_count = serializers.IntegerField(
+        default=500,
+        min_value=settings.SCRIPT_WORD_COUNT['MIN'],
+        max_value=settings.SCRIPT_WORD_COUNT['MAX']
+    )
+    qualities = serializers.ListField(
+        child=serializers.ChoiceField(choices=Arbeitsprobe.QUALITY_CHOICES),
+        required=False
+    )
+
+
 class ScriptSerializer(serializers.ModelSerializer):
     """Serializer für Script Model (AKTIVE Aufträge)"""
     
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from apps.kachel1_auftragsverwaltung.models import Auftrag
+from apps.kachel2_analyse.models import Arbeitsprobe
+from apps.kachel2_analyse.workflows_offen.upwork_analyzer import UpworkAnalyzer
 
-# Create your tests here.
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class BatchGenerateTest(TestCase):
+    """POST /api/arbeitsproben/batch_generate/"""
+
+    url = '/api/arbeitsproben/batch_generate/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('redakteur', password='geheim'))
+        self.auftrag = Auftrag.objects.create(id='UP-1', titel='Job', beschreibung='Text')
+
+    def _post(self, **data):
+        body = {'auftrag': self.auftrag.id, 'upwork_job_description': 'Video über KI', **data}
+        return self.client.post(self.url, body, content_type='application/json')
+
+    def test_stores_successful_qualities_together(self):
+        batch = {
+            'success': True,
+            'generated_title': 'KI im Alltag',
+            'results': {
+                'bronze': {'success': True, 'content': 'Script B', 'cost': 0.1},
+                'gold': {'success': False, 'error': 'Timeout', 'cost': 0.0},
+            },
+            'cost': 0.1
+        }
+        with mock.patch.object(UpworkAnalyzer, 'create_arbeitsproben_batch', return_value=batch):
+            response = self._post(qualities=['bronze', 'gold'])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['errors'], {'gold': 'Timeout'})
+        arbeitsprobe = Arbeitsprobe.objects.get()
+        self.assertEqual((arbeitsprobe.quality, arbeitsprobe.content), ('bronze', 'Script B'))
+
+    def test_rejects_invalid_input(self):
+        self.assertEqual(self._post(qualities=['platin']).status_code, 400)
+        self.assertEqual(self._post(word_count='viel').status_code, 400)
+        self.assertEqual(self._post(upwork_job_description='').status_code, 400)
+
+    def test_rejects_wrong_types_and_out_of_range_word_count(self):
+        self.assertEqual(self._post(upwork_job_description={'text': 'KI'}).status_code, 400)
+        self.assertEqual(self._post(qualities=5).status_code, 400)
+        self.assertEqual(self._post(qualities=[{'stufe': 'gold'}]).status_code, 400)
+        self.assertEqual(self._post(qualities='gold').status_code, 400)
+        self.assertEqual(self._post(word_count=10 ** 9).status_code, 400)
+        self.assertEqual(self._post(word_count=-5).status_code, 400)
+
+    def test_requires_open_auftrag(self):
+        Auftrag.objects.filter(id=self.auftrag.id).update(status='AKTIV')
+
+        self.assertEqual(self._post().status_code, 404)
+
+    def test_reports_failed_batch(self):
+        batch = {'success': False, 'error': 'Keine Stufe erfolgreich', 'results': {}, 'cost': 0.05}
+        with mock.patch.object(UpworkAnalyzer, 'create_arbeitsproben_batch', return_value=batch):
+            response = self._post()
+
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(Arbeitsprobe.objects.exists())
@@ -1,12 +1,14 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.db.models import Sum, Count
 from apps.kachel1_auftragsverwaltung.models import Auftrag
 from apps.kachel2_analyse.models import Arbeitsprobe, Script
+from apps.kachel2_analyse.workflows_offen.upwork_analyzer import UpworkAnalyzer
 from .serializers import (
-    AuftragSerializer, ArbeitsprobeSerializer, ScriptSerializer,
-    DashboardStatsSerializer
+    AuftragSerializer, ArbeitsprobeSerializer, ArbeitsprobenBatchSerializer,
+    ScriptSerializer, DashboardStatsSerializer
 )
 
 
@@ -119,6 +121,72 @@ class ArbeitsprobeViewSet(viewsets.ModelViewSet):
 
         return Response(result)
 
+    @action(detail=False, methods=['post'])
+    def batch_generate(self, request):
+        """
+        Generiert Arbeitsproben mehrerer Qualitätsstufen für einen Job
+
+        Titel wird einmal generiert, die Stufen laufen gleichzeitig.
+        Alle erfolgreichen Arbeitsproben werden in einer Transaktion gespeichert.
+
+        Body: auftrag, upwork_job_description, optional upwork_job_url,
+              word_count (Default 500, Bereich SCRIPT_WORD_COUNT), qualities (Default alle drei)
+        """
+        serializer = ArbeitsprobenBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'error': 'Ungültige Eingabe', 'details': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        auftrag_id = serializer.validated_data['auftrag']
+        upwork_text = serializer.validated_data['upwork_job_description']
+        upwork_url = serializer.validated_data.get('upwork_job_url') or None
+        word_count = serializer.validated_data['word_count']
+        qualities = serializer.validated_data.get('qualities') or ['bronze', 'silber', 'gold']
+
+        auftrag = Auftrag.objects.filter(id=auftrag_id, status='OFFEN').first()
+        if auftrag is None:
+            return Response({'error': 'OFFENER Auftrag nicht gefunden'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            analyzer = UpworkAnalyzer()
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        batch = analyzer.create_arbeitsproben_batch(upwork_text, word_count=word_count, qualities=qualities)
+        if not batch['success']:
+            return Response({
+                'error': batch.get('error', 'Keine Arbeitsprobe generiert'),
+                'errors': {q: r['error'] for q, r in batch.get('results', {}).items()},
+                'cost': batch.get('cost', 0.00)
+            }, status=status.HTTP_502_BAD_GATEWAY)
+
+        arbeitsproben = []
+        for quality, result in batch['results'].items():
+            if not result['success']:
+                continue
+            arbeitsprobe = Arbeitsprobe(
+                auftrag=auftrag,
+                generated_title=batch['generated_title'][:200],
+                content=result['content'],
+                quality=quality,
+                upwork_job_url=upwork_url,
+                upwork_job_description=upwork_text
+            )
+            arbeitsprobe.api_kosten = arbeitsprobe.get_api_cost()
+            arbeitsproben.append(arbeitsprobe)
+
+        with transaction.atomic():
+            created = Arbeitsprobe.objects.bulk_create(arbeitsproben)
+
+        return Response({
+            'generated_title': batch['generated_title'],
+            'arbeitsproben': ArbeitsprobeSerializer(created, many=True).data,
+            'errors': {q: r['error'] for q, r in batch['results'].items() if not r['success']},
+            'cost': batch['cost']
+        }, status=status.HTTP_201_CREATED)
+
 
 class ScriptViewSet(viewsets.ModelViewSet):
     """
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Arbeitsprobe, Script
+from .models import Arbeitsprobe, Script, ApiCacheEntry
 
 @admin.register(Arbeitsprobe)
 class ArbeitsprobeAdmin(admin.ModelAdmin):
@@ -75,3 +75,11 @@ class ScriptAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
         self.message_user(request, f"Script für AKTIVEN Auftrag erstellt. Serper API-Calls: {obj.serper_api_calls}")
+
+
+@admin.register(ApiCacheEntry)
+class ApiCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['namespace', 'key', 'hit_count', 'erstellt_am', 'last_accessed', 'expires_at']
+    list_filter = ['namespace']
+    search_fields = ['key']
+    readonly_fields = ['namespace', 'key', 'value', 'erstellt_am', 'last_accessed', 'expires_at', 'hit_count']
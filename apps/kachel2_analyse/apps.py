@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class Kachel2AnalyseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.kachel2_analyse'
+
+    def ready(self):
+        # Optional: Verbindungen zu OpenRouter beim Worker-Start aufwärmen
+        if settings.HTTP_TRANSPORT.get('WARMUP_ON_START'):
+            from .services.http_transport import warmup_transports
+            warmup_transports()
@@ -0,0 +1,67 @@
+"""
+Massen-Import von Upwork-Jobs (OFFENER Workflow)
+
+Beispiel:
+    python manage.py ingest_upwork_jobs jobs.jsonl --workers 4 --quality bronze
+
+Ein erneuter Aufruf mit derselben Datei setzt am Checkpoint fort.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.kachel2_analyse.models import Arbeitsprobe
+from apps.kachel2_analyse.workflows_offen.job_ingestion import (
+    AUTO_QUALITY, JobIngestionService, get_ingestion_settings
+)
+
+
+class Command(BaseCommand):
+    help = 'Erstellt Arbeitsproben für alle Upwork-Jobs einer JSONL- oder CSV-Datei'
+
+    def add_arguments(self, parser):
+        config = get_ingestion_settings()
+
+        parser.add_argument('path', help='JSONL- oder CSV-Datei (Felder: id, title, text/description, url)')
+        parser.add_argument('--checkpoint', help='Checkpoint-Datei (Default: <path>.checkpoint.json)')
+        parser.add_argument('--workers', type=int, default=config['WORKERS'], help='Gleichzeitige Jobs')
+        parser.add_argument('--batch-size', type=int, default=config['BATCH_SIZE'], help='Jobs pro Datenbank-Batch')
+        parser.add_argument('--word-count', type=int, default=config['WORD_COUNT'])
+        parser.add_argument(
+            '--quality',
+            default=config['QUALITY'],
+            choices=[choice for choice, _ in Arbeitsprobe.QUALITY_CHOICES] + [AUTO_QUALITY],
+            help="'auto' = Qualitätsstufe aus dem lokalen Job-Score"
+        )
+        parser.add_argument(
+            '--no-prioritize', dest='prioritize', action='store_false', default=config['PRIORITIZE'],
+            help='Reihenfolge der Datei beibehalten statt beste Jobs zuerst'
+        )
+        parser.add_argument('--priority-window', type=int, default=config['PRIORITY_WINDOW'],
+                            help='Beste Jobs zuerst jeweils innerhalb so vieler Jobs')
+        parser.add_argument('--min-score', type=float, default=config['MIN_SCORE'],
+                            help='Jobs mit niedrigerem Score überspringen (0-100)')
+        parser.add_argument('--limit', type=int, help='Höchstens so viele Jobs in diesem Lauf')
+        parser.add_argument('--retry-failed', action='store_true', help='Fehlgeschlagene Jobs erneut versuchen')
+
+    def handle(self, *args, **options):
+        try:
+            service = JobIngestionService(
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                word_count=options['word_count'],
+                quality=options['quality'],
+                prioritize=options['prioritize'],
+                priority_window=options['priority_window'],
+                min_score=options['min_score']
+            )
+            stats = service.ingest(
+                options['path'],
+                checkpoint_path=options['checkpoint'],
+                retry_failed=options['retry_failed'],
+                limit=options['limit']
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['created']} Arbeitsproben erstellt, {stats['failed']} fehlgeschlagen, "
+            f"{stats['skipped']} übersprungen, {stats['filtered']} unter Mindest-Score - Kosten ${stats['cost']:.4f}"
+        ))
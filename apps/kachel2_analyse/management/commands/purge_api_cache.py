@@ -0,0 +1,44 @@
+"""
+Löscht abgelaufene Einträge aus dem persistenten API-Cache
+
+Beispiel:
+    python manage.py purge_api_cache
+    python manage.py purge_api_cache --namespace serper_search --namespace serper_news
+
+Sinnvoll als täglicher Cron-Job - abgelaufene Einträge werden beim Lesen
+zwar ignoriert, belegen aber weiter Platz in der Datenbank.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+from apps.kachel2_analyse.models import ApiCacheEntry
+
+
+class Command(BaseCommand):
+    help = 'Löscht abgelaufene Einträge aus dem API-Cache (LLM und Serper)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--namespace', action='append', dest='namespaces',
+            help="Nur diesen Cache-Bereich bereinigen, z.B. 'serper_search' (mehrfach möglich)"
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Nur zählen, nichts löschen')
+
+    def handle(self, *args, **options):
+        stale = ApiCacheEntry.objects.filter(expires_at__lte=timezone.now())
+        if options['namespaces']:
+            stale = stale.filter(namespace__in=options['namespaces'])
+
+        counts = {
+            row['namespace']: row['count']
+            for row in stale.values('namespace').annotate(count=Count('pk')).order_by('namespace')
+        }
+        for namespace, count in counts.items():
+            self.stdout.write(f"{namespace}: {count} abgelaufen")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{sum(counts.values())} Einträge würden gelöscht (Dry Run)"))
+            return
+
+        deleted, _ = stale.delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} abgelaufene Cache-Einträge gelöscht"))
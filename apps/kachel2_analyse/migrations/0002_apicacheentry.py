@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kachel2_analyse', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('namespace', models.CharField(help_text="Cache-Bereich, z.B. 'llm'", max_length=50)),
+                ('key', models.CharField(help_text='SHA-256 über die Request-Parameter', max_length=64)),
+                ('value', models.JSONField(help_text='Gespeicherte API-Antwort')),
+                ('erstellt_am', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('last_accessed', models.DateTimeField(db_index=True)),
+                ('hit_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'API-Cache Eintrag',
+                'verbose_name_plural': 'API-Cache Einträge',
+                'ordering': ['-last_accessed'],
+                'unique_together': {('namespace', 'key')},
+            },
+        ),
+    ]
@@ -127,3 +127,29 @@ class Script(models.Model):
         self.serper_api_calls += 1
         self.serper_kosten += cost
         self.save()
+
+
+class ApiCacheEntry(models.Model):
+    """
+    Persistenter Cache für API-Antworten (LLM und Research)
+    - Schlüssel ist ein Hash über die Request-Parameter
+    - TTL über expires_at, Größenbegrenzung über last_accessed (LRU)
+    """
+    namespace = models.CharField(max_length=50, help_text="Cache-Bereich, z.B. 'llm'")
+    key = models.CharField(max_length=64, help_text="SHA-256 über die Request-Parameter")
+    value = models.JSONField(help_text="Gespeicherte API-Antwort")
+
+    # Tracking
+    erstellt_am = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    last_accessed = models.DateTimeField(db_index=True)
+    hit_count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "API-Cache Eintrag"
+        verbose_name_plural = "API-Cache Einträge"
+        unique_together = [('namespace', 'key')]
+        ordering = ['-last_accessed']
+
+    def __str__(self):
+        return f"{self.namespace}:{self.key[:12]} ({self.hit_count} Treffer)"
@@ -0,0 +1,82 @@
+"""
+Async Runner - asyncio-Anbindung für die blockierenden API-Services
+
+Die Services arbeiten intern mit dem gepoolten requests-Transport.
+Für async Views (ASGI) und parallele Fan-Outs werden die blockierenden
+Aufrufe in einem eigenen, begrenzten Thread-Pool ausgeführt, sodass ein
+Worker viele LLM-Aufrufe gleichzeitig offen halten kann.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ASYNC_SETTINGS = {
+    'MAX_WORKERS': 32,
+    'MAX_CONCURRENCY': 8,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_async_settings() -> dict:
+    """
+    Liefert die Async-Einstellungen (settings.LLM_ASYNC mit Defaults)
+    """
+    config = dict(DEFAULT_ASYNC_SETTINGS)
+    config.update(getattr(settings, 'LLM_ASYNC', {}) or {})
+    return config
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Prozessweiter Thread-Pool für blockierende API-Aufrufe
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = get_async_settings()['MAX_WORKERS']
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix='llm-async'
+                )
+                logger.info(f"Async Thread-Pool erstellt - Worker: {max_workers}")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Führt eine blockierende Funktion im API-Thread-Pool aus
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+async def gather_bounded(coroutines, max_concurrency: int = None) -> list:
+    """
+    Wartet auf viele Coroutines mit begrenzter Parallelität
+
+    Args:
+        coroutines: Iterable von Coroutines
+        max_concurrency: Maximale Anzahl gleichzeitig laufender Aufrufe
+
+    Returns:
+        Liste der Ergebnisse in Eingabereihenfolge
+    """
+    max_concurrency = max_concurrency or get_async_settings()['MAX_CONCURRENCY']
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(_bounded(c) for c in coroutines))
@@ -0,0 +1,174 @@
+"""
+HTTP Transport - Gemeinsame, prozessweite Verbindungsschicht
+
+Alle externen API-Aufrufe (OpenRouter, Serper) laufen über eine geteilte
+requests.Session pro Host. Dadurch bleiben TCP/TLS-Verbindungen offen
+(Keep-Alive) und werden zwischen Titel-, Briefing- und Script-Aufrufen
+wiederverwendet, statt bei jedem Aufruf neu aufgebaut zu werden.
+"""
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+SERPER_BASE_URL = "https://google.serper.dev"
+
+DEFAULT_TRANSPORT_SETTINGS = {
+    'POOL_CONNECTIONS': 4,
+    'POOL_MAXSIZE': 20,
+    'POOL_BLOCK': False,
+    'CONNECT_TIMEOUT': 5.0,
+    'WARMUP_ON_START': False,
+}
+
+
+def get_transport_settings() -> dict:
+    """
+    Liefert die Transport-Einstellungen (settings.HTTP_TRANSPORT mit Defaults)
+    """
+    config = dict(DEFAULT_TRANSPORT_SETTINGS)
+    config.update(getattr(settings, 'HTTP_TRANSPORT', {}) or {})
+    return config
+
+
+class HttpTransport:
+    """
+    Gepoolte HTTP-Verbindung zu genau einem Host
+
+    Die Session ist thread-safe genug für parallele POST-Aufrufe; der
+    Connection-Pool (pool_maxsize) bestimmt, wie viele Verbindungen
+    gleichzeitig offen gehalten werden.
+    """
+
+    def __init__(self, base_url: str, headers: dict = None, pool_connections: int = 4,
+                 pool_maxsize: int = 20, pool_block: bool = False, connect_timeout: float = 5.0):
+        self.base_url = base_url.rstrip('/')
+        self.connect_timeout = connect_timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+
+        # Keine automatischen Retries auf Adapter-Ebene - Fehler gehen an die Services
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post(self, path: str, json: dict = None, timeout: float = 60, **kwargs) -> requests.Response:
+        """
+        POST-Request über die gepoolte Session
+
+        Args:
+            path: Pfad relativ zur Base-URL (z.B. '/chat/completions')
+            json: JSON-Payload
+            timeout: Read-Timeout in Sekunden (Connect-Timeout kommt aus den Settings)
+        """
+        return self.session.post(
+            f"{self.base_url}{path}",
+            json=json,
+            timeout=(self.connect_timeout, timeout),
+            **kwargs
+        )
+
+    def warmup(self) -> bool:
+        """
+        Baut vorab eine Verbindung zum Host auf (TCP + TLS Handshake)
+        """
+        try:
+            self.session.head(self.base_url, timeout=(self.connect_timeout, self.connect_timeout))
+            logger.info(f"HTTP Transport aufgewärmt: {self.base_url}")
+            return True
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"HTTP Transport Warmup fehlgeschlagen ({self.base_url}): {e}")
+            return False
+
+    def close(self):
+        """Schließt alle offenen Verbindungen"""
+        self.session.close()
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def _build_transport(base_url: str, headers: dict) -> HttpTransport:
+    config = get_transport_settings()
+    return HttpTransport(
+        base_url=base_url,
+        headers=headers,
+        pool_connections=config['POOL_CONNECTIONS'],
+        pool_maxsize=config['POOL_MAXSIZE'],
+        pool_block=config['POOL_BLOCK'],
+        connect_timeout=config['CONNECT_TIMEOUT']
+    )
+
+
+def get_transport(name: str, base_url: str, headers: dict = None) -> HttpTransport:
+    """
+    Gibt den prozessweiten Transport für einen Namen zurück (lazy erstellt)
+    """
+    transport = _transports.get(name)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(name)
+            if transport is None:
+                transport = _build_transport(base_url, headers)
+                _transports[name] = transport
+                logger.info(f"HTTP Transport erstellt: {name} ({base_url})")
+    return transport
+
+
+def get_openrouter_transport() -> HttpTransport:
+    """
+    Gemeinsamer Transport für alle OpenRouter Services (Opus, Sonnet, Gemini, ...)
+    """
+    if not settings.OPENROUTER_API_KEY:
+        raise ValueError("OPENROUTER_API_KEY nicht konfiguriert!")
+
+    return get_transport('openrouter', OPENROUTER_BASE_URL, {
+        'Authorization': f'Bearer {settings.OPENROUTER_API_KEY}',
+        'Content-Type': 'application/json',
+        'HTTP-Referer': 'https://pw-script-studio.com',
+        'X-Title': 'PW Script Studio'
+    })
+
+
+def get_serper_transport() -> HttpTransport:
+    """
+    Gemeinsamer Transport für alle Serper-Aufrufe (nur AKTIVE Aufträge)
+    """
+    if not settings.SERPER_API_KEY:
+        raise ValueError("SERPER_API_KEY nicht konfiguriert!")
+
+    return get_transport('serper', SERPER_BASE_URL, {
+        'X-API-KEY': settings.SERPER_API_KEY,
+        'Content-Type': 'application/json'
+    })
+
+
+def warmup_transports():
+    """
+    Wärmt die Verbindungen aller konfigurierten APIs auf (z.B. beim Worker-Start)
+    """
+    if settings.OPENROUTER_API_KEY:
+        get_openrouter_transport().warmup()
+    if getattr(settings, 'SERPER_API_KEY', None):
+        get_serper_transport().warmup()
+
+
+def close_transports():
+    """
+    Schließt alle Transports (z.B. in Tests oder beim Worker-Shutdown)
+    """
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
@@ -0,0 +1,234 @@
+"""
+Keyword Extractor - gerankte Keywords aus Research-Ergebnissen und Briefings
+
+Läuft komplett lokal (keine API-Kosten) und ist in beiden Workflows nutzbar:
+- Kandidaten: Wortfolgen zwischen Stoppwörtern (Deutsch + Englisch) und
+  Satzzeichen, daraus 1- bis 3-Gramme (wie bei RAKE)
+- Scoring: TF-IDF - Termfrequenz innerhalb einer Gruppe (z.B. alle Treffer
+  eines Research plus Briefing), IDF über die einzelnen Dokumente der Gruppe
+  (Titel, Snippets, Briefing)
+- Deterministisch: Gleichstand wird alphabetisch aufgelöst
+
+Im Workflow läuft extract() pro Auftrag (KundeProcessor) und als lokaler
+Fallback, wenn der Opus-Keyword-Aufruf in analyze_job scheitert (job_documents). Für Auswertungen
+über mehrere Researches gibt es die Batch-API mit IDF über die Gruppen:
+    KeywordExtractor().extract_many([docs_montag, docs_dienstag, ...])
+Begriffe, die in jedem Research der Woche auftauchen ("2026", "news"),
+werden dabei automatisch abgewertet.
+"""
+import math
+import re
+from collections import Counter
+
+STOPWORDS_DE = frozenset("""
+aber alle allem allen aller alles als also am an ander andere anderem anderen anderer
+anderes auch auf aus bei beim bin bis bist da damit dann das dass dein deine dem den
+der des dessen die dies diese diesem diesen dieser dieses doch dort du durch ein eine
+einem einen einer eines einige er es etwas euch euer eure für gegen gibt hat hatte
+hatten hier hin hinter ich ihm ihn ihnen ihr ihre ihrem ihren ihrer im in ins ist ja
+jede jedem jeden jeder jedes jetzt kann kein keine keinem keinen keiner können könnte
+man manche mehr mein meine mit muss müssen nach nicht nichts noch nun nur ob oder ohne
+schon sehr sein seine seinem seinen seiner sich sie sind so solche soll sollte sondern
+sowie über um und uns unser unsere unter viel vom von vor war waren warum was weil
+welche welchem welchen welcher welches wenn wer werden wie wieder will wir wird wo
+wurde wurden zu zum zur zwar zwischen heute neue neuen neuer neues
+bitte gerne
+""".split()) | frozenset("""
+wollen willst wollt wollte wollten sollen sollst sollt sollten dürfen darf darfst
+dürft durfte durften dürfte dürften mögen mag magst mögt möchte möchten möchtest
+möchtet kannst könnt konnte konnten könnten musst müsst musste mussten müsste
+müssten haben habe hast habt hätte hätten seid wäre wären gewesen werde wirst
+werdet würde würden worden geworden
+""".split())                  # Modal- und Hilfsverben ("Wir wollen ein Video über ...")
+
+STOPWORDS_EN = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers him his how i if in into
+is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then
+there these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours new get got one two via
+may might must shall
+""".split())
+
+STOPWORDS = STOPWORDS_DE | STOPWORDS_EN
+
+MAX_NGRAM = 3
+MIN_WORD_LENGTH = 3
+MIN_PHRASE_COUNT = 2          # Mehrwort-Phrasen erst ab zwei Vorkommen
+TITLE_WEIGHT = 2              # Treffer-Titel zählen doppelt
+
+# Wörter inkl. Umlaute, Ziffern und Bindestrich ("KI-Agenten", "gpt-5")
+_WORD_RE = re.compile(r"[^\W_][\w-]*[^\W_]|[^\W_]", re.UNICODE)
+# Grenzen, über die keine Phrase hinweggeht
+_BOUNDARY_RE = re.compile(r"[.,;:!?()\[\]{}\"'|/…–—]|\s-\s")
+# Satz- und Zeilenenden (job_documents)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def tokenize(text: str, stopwords=STOPWORDS) -> list:
+    """
+    Wörter eines Texts (klein geschrieben, ohne Stoppwörter) - z.B. für BM25
+    """
+    return [word for word in _WORD_RE.findall((text or '').lower()) if len(word) > 1 and word not in stopwords]
+
+
+def research_documents(research_data: dict, briefing: str = None, limit: int = None) -> list:
+    """
+    Dokumente für die Keyword-Extraktion aus einem Research (_conduct_research)
+
+    Args:
+        research_data: dict mit 'organic' (und optional 'news') Treffern
+        briefing: Optionaler Kunden-Text, zählt als eigenes Dokument
+        limit: Höchstens so viele organische Treffer
+
+    Returns:
+        Liste von (Text, Gewicht)
+    """
+    documents = []
+    organic = (research_data or {}).get('organic', [])
+    for item in organic[:limit] if limit else organic:
+        documents.append((item.get('title', ''), TITLE_WEIGHT))
+        documents.append((item.get('snippet', ''), 1))
+    for item in (research_data or {}).get('news', []):
+        documents.append((item.get('title', ''), 1))
+    if briefing:
+        documents.append((briefing, TITLE_WEIGHT))
+    return [(text, weight) for text, weight in documents if text]
+
+
+def job_documents(job_text: str) -> list:
+    """
+    Dokumente für die Keyword-Extraktion aus einem Job-Text
+
+    Jeder Satz bzw. jede Zeile ist ein eigenes Dokument - sonst wäre die IDF
+    konstant und bei kurzen Jobs entschiede nur das Alphabet.
+    """
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(job_text or '') if sentence.strip()]
+
+
+class KeywordExtractor:
+    """
+    Gerankte Keywords per TF-IDF über n-Gramme
+
+    Beispiel:
+        extractor = KeywordExtractor()
+        extractor.extract(research_documents(research, briefing), top_n=5)
+        # -> [('ki-agenten', 4.2), ('mittelstand', 3.1), ...]
+    """
+
+    def __init__(self, max_ngram: int = MAX_NGRAM, stopwords=None, min_word_length: int = MIN_WORD_LENGTH):
+        self.max_ngram = max_ngram
+        self.stopwords = STOPWORDS if stopwords is None else frozenset(stopwords)
+        self.min_word_length = min_word_length
+
+    def candidates(self, text: str) -> list:
+        """
+        Alle n-Gramme eines Texts - nur innerhalb von Phrasen ohne Stoppwörter
+        """
+        terms = []
+        for fragment in _BOUNDARY_RE.split((text or '').lower()):
+            phrase = []
+            for word in _WORD_RE.findall(fragment) + [None]:
+                if word is not None and self._is_content_word(word):
+                    phrase.append(word)
+                    continue
+                for size in range(1, min(self.max_ngram, len(phrase)) + 1):
+                    for start in range(len(phrase) - size + 1):
+                        terms.append(' '.join(phrase[start:start + size]))
+                phrase = []
+        return terms
+
+    def extract(self, documents, top_n: int = 8) -> list:
+        """
+        Keywords einer Dokumentgruppe (z.B. ein Research plus Briefing)
+
+        Die IDF wird über die einzelnen Dokumente berechnet - Begriffe, die in
+        jedem Snippet stehen, ranken niedriger als trefferspezifische.
+
+        Args:
+            documents: Texte oder (Text, Gewicht)-Paare
+            top_n: Anzahl Keywords
+
+        Returns:
+            Liste von (Keyword, Score), beste zuerst
+        """
+        counts, occurrences, document_frequency = self._term_frequencies(documents)
+        idf = self._idf(document_frequency, len(documents))
+        return self._rank((counts, occurrences), idf, top_n)
+
+    def extract_many(self, groups, top_n: int = 8) -> list:
+        """
+        Batch-API: Keywords für viele Dokumentgruppen in einem Durchlauf
+
+        Die IDF wird über alle Gruppen berechnet - Begriffe, die überall
+        vorkommen, ranken niedriger als gruppenspezifische.
+
+        Returns:
+            Liste (gleiche Reihenfolge wie groups) von Listen (Keyword, Score)
+        """
+        frequencies = [self._term_frequencies(documents)[:2] for documents in groups]
+
+        group_frequency = Counter()
+        for counts, _ in frequencies:
+            group_frequency.update(counts.keys())
+
+        idf = self._idf(group_frequency, len(frequencies))
+        return [self._rank(group, idf, top_n) for group in frequencies]
+
+    @staticmethod
+    def _idf(document_frequency: Counter, total: int) -> dict:
+        """Geglättete IDF - auch Begriffe aus allen Dokumenten behalten Gewicht 1"""
+        return {
+            term: math.log((1 + total) / (1 + count)) + 1.0
+            for term, count in document_frequency.items()
+        }
+
+    def _is_content_word(self, word: str) -> bool:
+        return (
+            len(word) >= self.min_word_length
+            and word not in self.stopwords
+            and not word.replace('-', '').isdigit()
+        ) or (word.isdigit() and len(word) == 4)        # Jahreszahlen behalten
+
+    def _term_frequencies(self, documents):
+        """Gewichtete Termfrequenz, Anzahl Vorkommen (ungewichtet) und Dokumentfrequenz"""
+        counts = Counter()
+        occurrences = Counter()
+        document_frequency = Counter()
+        for document in documents:
+            text, weight = document if isinstance(document, tuple) else (document, 1)
+            terms = self.candidates(text)
+            for term in terms:
+                counts[term] += weight
+                occurrences[term] += 1
+            document_frequency.update(set(terms))
+        return counts, occurrences, document_frequency
+
+    def _rank(self, frequencies, idf: dict, top_n: int) -> list:
+        counts, occurrences = frequencies
+        scored = []
+        for term, count in counts.items():
+            size = term.count(' ') + 1
+            if size > 1 and occurrences[term] < MIN_PHRASE_COUNT:
+                continue
+            # Längere Phrasen sind spezifischer - leicht bevorzugen
+            score = count * idf[term] * (1 + 0.5 * (size - 1))
+            scored.append((term, round(score, 4)))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+
+        selected = []
+        for term, score in scored:
+            # Teile bereits gewählter Phrasen überspringen ("ki" neben "ki agenten")
+            if any(self._contains(chosen, term) for chosen, _ in selected):
+                continue
+            selected.append((term, score))
+            if len(selected) >= top_n:
+                break
+        return selected
+
+    @staticmethod
+    def _contains(phrase: str, term: str) -> bool:
+        return f' {term} ' in f' {phrase} '
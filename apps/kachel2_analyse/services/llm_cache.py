@@ -0,0 +1,54 @@
+"""
+LLM Response Cache - Content-adressierter Cache vor generate_content
+
+Schlüssel: (Modell, Prompt-Hash, Temperature, max_tokens)
+Opt-in pro Aufruf über generate_content(..., use_cache=True), z.B. für
+Titel- und Keyword-Prompts, die bei erneuten Job-Läufen identisch sind.
+"""
+import hashlib
+import logging
+import threading
+from django.conf import settings
+from .response_cache import ResponseCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CACHE_SETTINGS = {
+    'TTL_SECONDS': 7 * 24 * 3600,
+    'MEMORY_MAX_ENTRIES': 256,
+    'DB_ENABLED': True,
+    'DB_MAX_ENTRIES': 5000,
+    'DB_EVICT_INTERVAL': 100,     # LRU-Limit nur alle N Schreibvorgänge prüfen
+}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> ResponseCache:
+    """
+    Prozessweiter LLM-Cache (settings.LLM_CACHE mit Defaults)
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = dict(DEFAULT_LLM_CACHE_SETTINGS)
+                config.update(getattr(settings, 'LLM_CACHE', {}) or {})
+                _cache = ResponseCache(
+                    namespace='llm',
+                    ttl_seconds=config['TTL_SECONDS'],
+                    memory_max_entries=config['MEMORY_MAX_ENTRIES'],
+                    db_enabled=config['DB_ENABLED'],
+                    db_max_entries=config['DB_MAX_ENTRIES'],
+                    db_evict_interval=config['DB_EVICT_INTERVAL']
+                )
+    return _cache
+
+
+def llm_cache_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """
+    Cache-Schlüssel für einen LLM-Aufruf
+    """
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return make_cache_key(model, prompt_hash, round(float(temperature), 3), int(max_tokens))
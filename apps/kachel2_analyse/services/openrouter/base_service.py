@@ -0,0 +1,449 @@
+"""
+Basis-Service für alle Modelle über OpenRouter API
+Gemeinsamer Request-Ablauf für Opus, Sonnet und Gemini
+"""
+import functools
+import json
+import time
+import requests
+import logging
+from django.conf import settings
+from ..http_transport import get_openrouter_transport, OPENROUTER_BASE_URL
+from ..async_runner import run_blocking
+from ..llm_cache import get_llm_cache, llm_cache_key
+from core.single_flight import SingleFlight
+from core.rate_limiter import get_rate_limiter, parse_retry_after, RateLimitTimeout
+from core.resilience import RetryPolicy, DeadlineExceeded, budget_for, get_latency_tracker
+from core.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from ..token_counter import count_tokens, check_context_window, is_cacheable_prefix, PromptBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+# Fehler, die als {'success': False} an den Aufrufer gehen
+API_ERRORS = (
+    requests.exceptions.RequestException, RateLimitTimeout, DeadlineExceeded,
+    CircuitOpenError, PromptBudgetExceeded
+)
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """
+    True wenn der Fehler auf ein gestörtes Modell hindeutet
+    (Verbindung, Timeout, 5xx) - zählt für den Circuit Breaker
+    """
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code >= 500
+
+# Prozessweit: identische LLM-Aufrufe laufen nur einmal gleichzeitig
+_llm_requests = SingleFlight('LLM Single-Flight')
+
+
+class BaseOpenRouterService:
+    """
+    Basisklasse für OpenRouter Modell-Services
+
+    Unterklassen setzen nur Modell, Timeout, Token-Default und Kosten.
+    Alle Aufrufe laufen über den prozessweiten OpenRouter Transport.
+    """
+
+    model = None
+    service_name = 'OpenRouter'
+    default_max_tokens = 3000
+    timeout = 60
+
+    def __init__(self, model: str = None):
+        self.api_key = settings.OPENROUTER_API_KEY
+        self.base_url = OPENROUTER_BASE_URL
+
+        if model:
+            self.model = model
+
+        if not self.api_key:
+            raise ValueError("OPENROUTER_API_KEY nicht konfiguriert!")
+
+        self.transport = get_openrouter_transport()
+        self.retry_policy = RetryPolicy.from_settings('LLM_RETRY')
+
+    def generate_content(self, prompt: str, max_tokens: int = None, temperature: float = 0.7,
+                         use_cache: bool = False, deadline=None, coalesce: bool = True,
+                         prompt_prefix: str = None) -> dict:
+        """
+        Generiert Content mit dem Modell des Services
+
+        Args:
+            prompt: Variabler Teil des Prompts (bzw. der ganze Prompt)
+            prompt_prefix: Optionaler stabiler Prompt-Anfang (Anweisungen) - wird
+                mit Cache-Hinweis gesendet, damit der Provider ihn cachen kann
+            use_cache: Antwort aus dem LLM-Cache nutzen bzw. dort ablegen (opt-in)
+            deadline: Optionale core.resilience.Deadline - Timeout wird auf die Restzeit begrenzt
+            coalesce: Identische laufende Aufrufe teilen (False z.B. für Hedge-Duplikate)
+        """
+        max_tokens = max_tokens or self.default_max_tokens
+        payload = self._build_payload(prompt, max_tokens, temperature, prompt_prefix=prompt_prefix)
+
+        return self._execute(
+            payload, (prompt_prefix or '') + prompt,
+            functools.partial(self._complete, deadline=deadline),
+            use_cache, coalesce
+        )
+
+    def _complete(self, payload: dict, deadline=None) -> dict:
+        """
+        Führt den Chat-Completion Aufruf aus und baut das Ergebnis-dict
+        """
+        max_tokens = payload['max_tokens']
+
+        try:
+            logger.info(f"{self.service_name} API Aufruf - Tokens: {max_tokens}")
+
+            data = self._post_chat(payload, timeout=self.timeout, deadline=deadline)
+            content = data['choices'][0]['message']['content']
+            tokens_used = data.get('usage', {}).get('total_tokens', max_tokens)
+            cached_tokens = self._cached_tokens(data.get('usage'))
+
+            logger.info(f"{self.service_name} erfolgreich - Tokens: {tokens_used} (gecacht: {cached_tokens})")
+
+            return {
+                'success': True,
+                'content': content,
+                'tokens_used': tokens_used,
+                'cached_tokens': cached_tokens,
+                'model': payload['model'],
+                'cost': self._calculate_cost(tokens_used)
+            }
+
+        except API_ERRORS as e:
+            logger.error(f"{self.service_name} API Fehler: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'cost': 0.00
+            }
+        except (KeyError, IndexError) as e:
+            logger.error(f"{self.service_name} Response Format Fehler: {e}")
+            return {
+                'success': False,
+                'error': f"Unerwartetes Response Format: {e}",
+                'cost': 0.00
+            }
+
+    def _execute(self, payload: dict, prompt: str, call, use_cache: bool,
+                 coalesce: bool = True) -> dict:
+        """
+        Führt call(payload) aus - mit Single-Flight und optionalem LLM-Cache
+
+        Identische, gleichzeitige Aufrufe (gleiches Modell, Prompt und
+        Parameter) teilen sich einen Upstream-Aufruf.
+        """
+        key = llm_cache_key(payload['model'], prompt, payload['temperature'], payload['max_tokens'])
+
+        def _run():
+            if not use_cache:
+                return call(payload)
+
+            cache = get_llm_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                logger.info(f"{self.service_name} Cache-Treffer - kein API Aufruf")
+                return {**cached, 'cached': True, 'cost': 0.00}
+
+            result = call(payload)
+            if result['success']:
+                cache.set(key, result)
+            return result
+
+        if not coalesce:
+            return _run()
+        return _llm_requests.do(key, _run)
+
+    async def agenerate_content(self, *args, **kwargs) -> dict:
+        """
+        Async-Variante von generate_content (gleiche Argumente)
+
+        Der Aufruf läuft im API-Thread-Pool, der Event-Loop bleibt frei.
+        """
+        return await run_blocking(self.generate_content, *args, **kwargs)
+
+    def stream_content(self, prompt: str, max_tokens: int = None, temperature: float = 0.7,
+                       deadline=None, prompt_prefix: str = None):
+        """
+        Generiert Content als Stream (Server-Sent Events von OpenRouter)
+
+        Args:
+            deadline: Optionale Deadline - begrenzt den Timeout des Requests
+            prompt_prefix: Optionaler stabiler Prompt-Anfang (siehe generate_content)
+
+        Yields:
+            dicts mit 'type':
+            - 'delta': {'content': Text-Stück}
+            - 'done':  {'content', 'tokens_used', 'cached_tokens', 'model', 'cost'}
+            - 'error': {'error', 'cost'}
+        """
+        max_tokens = max_tokens or self.default_max_tokens
+        payload = self._build_payload(prompt, max_tokens, temperature, prompt_prefix=prompt_prefix)
+        payload['stream'] = True
+
+        response = None
+        parts = []
+        tokens_used = None
+        cached_tokens = 0
+        breaker = get_circuit_breaker(payload['model'])
+        admitted = False
+        started = time.monotonic()
+        outcome = None
+
+        try:
+            logger.info(f"{self.service_name} Stream Aufruf - Tokens: {max_tokens}")
+            check_context_window(self._prompt_text(payload), payload['model'], max_tokens)
+            breaker.check()
+            admitted = True
+
+            # Slot nur bis zu den Response-Headern - lange Streams sollen kurze
+            # Aufrufe nicht bis zu MAX_WAIT auf einen freien Slot warten lassen
+            with get_rate_limiter(payload['model']).slot() as slot:
+                response = self.transport.post(
+                    '/chat/completions',
+                    json=payload,
+                    timeout=budget_for(self.timeout, deadline),
+                    stream=True
+                )
+                self._check_throttled(response, slot)
+                response.raise_for_status()
+
+            for event in self._iter_sse_events(response):
+                if 'error' in event:
+                    raise requests.exceptions.RequestException(
+                        event['error'].get('message', str(event['error']))
+                    )
+
+                usage = event.get('usage')
+                if usage:
+                    tokens_used = usage.get('total_tokens', tokens_used)
+                    cached_tokens = self._cached_tokens(usage)
+
+                for choice in event.get('choices', []):
+                    delta = choice.get('delta', {}).get('content')
+                    if delta:
+                        parts.append(delta)
+                        yield {'type': 'delta', 'content': delta}
+
+            content = ''.join(parts)
+            if tokens_used is None:
+                # Kein Usage-Block im Stream - Schätzung aus Prompt und Text
+                tokens_used = count_tokens(self._prompt_text(payload), payload['model']) \
+                    + count_tokens(content, payload['model'])
+
+            logger.info(f"{self.service_name} Stream erfolgreich - Tokens: {tokens_used}")
+            outcome = True
+
+            yield {
+                'type': 'done',
+                'content': content,
+                'tokens_used': tokens_used,
+                'cached_tokens': cached_tokens,
+                'model': payload['model'],
+                'cost': self._calculate_cost(tokens_used)
+            }
+
+        except API_ERRORS as e:
+            logger.error(f"{self.service_name} Stream Fehler: {e}")
+            if is_upstream_failure(e):
+                outcome = False
+            yield {
+                'type': 'error',
+                'error': str(e),
+                'cost': 0.00
+            }
+        finally:
+            # Verbindung auch bei vorzeitigem Abbruch des Konsumenten freigeben
+            if response is not None:
+                response.close()
+
+            if admitted:
+                output_tokens = count_tokens(''.join(parts), payload['model']) if parts else 0
+                self._record_outcome(breaker, outcome, time.monotonic() - started, output_tokens)
+
+    def _iter_sse_events(self, response):
+        """
+        Zerlegt eine SSE-Antwort in JSON-Events (Kommentare und [DONE] werden übersprungen)
+        """
+        response.encoding = 'utf-8'
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or line.startswith(':'):
+                # Leerzeilen trennen Events, ':' sind Keep-Alive Kommentare
+                continue
+            if not line.startswith('data:'):
+                continue
+
+            data = line[5:].strip()
+            if data == '[DONE]':
+                break
+
+            try:
+                yield json.loads(data)
+            except json.JSONDecodeError:
+                logger.warning(f"{self.service_name} Stream: ungültiges Event übersprungen")
+
+    def _build_payload(self, prompt: str, max_tokens: int, temperature: float,
+                       model: str = None, prompt_prefix: str = None) -> dict:
+        """
+        Erstellt den Chat-Completion Payload
+
+        Mit prompt_prefix besteht die Nachricht aus zwei Text-Blöcken: dem
+        stabilen Prefix mit cache_control (Prompt-Caching bei Anthropic/Gemini
+        über OpenRouter) und dem variablen Teil. Prefixe unter der Mindestgröße
+        des Providers (MIN_CACHE_TOKENS, z.B. 1024 bzw. 2048 bei Haiku) werden
+        nie gecacht - sie gehen ohne cache_control als normaler Text raus.
+        """
+        model = model or self.model
+        if prompt_prefix and settings.PROMPT_CACHE['ENABLED'] and is_cacheable_prefix(prompt_prefix, model):
+            content = [
+                {
+                    'type': 'text',
+                    'text': prompt_prefix,
+                    'cache_control': {'type': 'ephemeral'}
+                },
+                {
+                    'type': 'text',
+                    'text': prompt
+                }
+            ]
+        else:
+            content = (prompt_prefix or '') + prompt
+
+        return {
+            'model': model,
+            'messages': [
+                {
+                    'role': 'user',
+                    'content': content
+                }
+            ],
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'top_p': 0.9,
+            # Liefert u.a. prompt_tokens_details.cached_tokens zurück
+            'usage': {'include': True}
+        }
+
+    def _prompt_text(self, payload: dict) -> str:
+        """
+        Gesamter Prompt-Text aller Nachrichten (für die Token-Zählung)
+        """
+        texts = []
+        for message in payload['messages']:
+            content = message['content']
+            if isinstance(content, str):
+                texts.append(content)
+            else:
+                texts.extend(block.get('text', '') for block in content)
+        return '\n'.join(texts)
+
+    def _cached_tokens(self, usage: dict) -> int:
+        """
+        Aus dem Provider-Cache gelesene Prompt-Tokens (0 wenn nicht gemeldet)
+        """
+        details = (usage or {}).get('prompt_tokens_details') or {}
+        return details.get('cached_tokens') or 0
+
+    def _post_chat(self, payload: dict, timeout: float, deadline=None) -> dict:
+        """
+        Sendet den Payload an /chat/completions und gibt das JSON zurück
+
+        Passt der Prompt nicht ins Kontextfenster, wird nicht gesendet
+        (PromptBudgetExceeded). Ist der Circuit Breaker des Modells offen,
+        wird sofort mit CircuitOpenError abgebrochen. Das Ergebnis
+        (inkl. Latenz) fließt in den Breaker ein.
+        """
+        check_context_window(self._prompt_text(payload), payload['model'], payload['max_tokens'])
+
+        breaker = get_circuit_breaker(payload['model'])
+        breaker.check()
+
+        started = time.monotonic()
+        outcome = None
+        output_tokens = None
+        try:
+            data = self._post_chat_with_retry(payload, timeout, deadline)
+            outcome = True
+            output_tokens = (data.get('usage') or {}).get('completion_tokens')
+            return data
+        except requests.exceptions.RequestException as e:
+            if is_upstream_failure(e):
+                outcome = False
+            raise
+        finally:
+            self._record_outcome(breaker, outcome, time.monotonic() - started, output_tokens)
+
+    def _record_outcome(self, breaker, outcome, latency: float, output_tokens: int = None):
+        """
+        Meldet das Ergebnis an den Circuit Breaker
+        (True = Erfolg, False = Modell-Fehler, None = ohne Aussage)
+
+        output_tokens skaliert das Latenz-SLO - lange Antworten sind nicht "langsam".
+        """
+        if outcome is True:
+            breaker.record_success(latency, output_tokens)
+        elif outcome is False:
+            breaker.record_failure(latency, output_tokens)
+        else:
+            breaker.record_neutral()
+
+    def _post_chat_with_retry(self, payload: dict, timeout: float, deadline=None) -> dict:
+        """
+        Transiente Fehler (Verbindung, Timeout, 429, 5xx) werden mit
+        exponentiellem Backoff + Jitter wiederholt, solange die Deadline es zulässt.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._post_chat_once(payload, budget_for(timeout, deadline))
+
+            except requests.exceptions.RequestException as e:
+                response = getattr(e, 'response', None)
+                status_code = response.status_code if response is not None else None
+
+                retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)) \
+                    or (status_code is not None and self.retry_policy.is_retryable_status(status_code))
+                if not retryable or attempt >= self.retry_policy.max_attempts:
+                    raise
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+                delay = self.retry_policy.delay(attempt, retry_after)
+                if deadline and delay >= deadline.remaining():
+                    raise
+
+                logger.warning(
+                    f"{self.service_name} Versuch {attempt}/{self.retry_policy.max_attempts} "
+                    f"fehlgeschlagen ({e}) - neuer Versuch in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def _post_chat_once(self, payload: dict, timeout: float) -> dict:
+        """
+        Ein einzelner Request (mit Rate-Limit-Slot und Latenz-Messung)
+        """
+        with get_rate_limiter(payload['model']).slot() as slot:
+            started = time.monotonic()
+            response = self.transport.post('/chat/completions', json=payload, timeout=timeout)
+            self._check_throttled(response, slot)
+            response.raise_for_status()
+            data = response.json()
+
+        get_latency_tracker(payload['model']).record(time.monotonic() - started)
+        return data
+
+    def _check_throttled(self, response, slot):
+        """
+        Meldet Überlast-Antworten (429 inkl. Retry-After, 5xx) an den Rate Limiter
+        """
+        slot.record_status(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+
+    def _calculate_cost(self, tokens: int) -> float:
+        """
+        Berechnet geschätzte Kosten - wird von Unterklassen überschrieben
+        """
+        return 0.00
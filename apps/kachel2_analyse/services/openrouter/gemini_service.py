@@ -2,81 +2,20 @@
 Google Gemini Service über OpenRouter API
 Spezialisiert auf schnelle Content-Generierung
 """
-import requests
 import logging
-from django.conf import settings
+from .base_service import BaseOpenRouterService
 
 logger = logging.getLogger(__name__)
 
-class GeminiService:
+class GeminiService(BaseOpenRouterService):
     """
     Service für Google Gemini über OpenRouter
     """
     
-    def __init__(self):
-        self.api_key = settings.OPENROUTER_API_KEY
-        self.base_url = "https://openrouter.ai/api/v1"
-        self.model = "google/gemini-2.5-flash"
-        
-        if not self.api_key:
-            raise ValueError("OPENROUTER_API_KEY nicht konfiguriert!")
-    
-    def generate_content(self, prompt: str, max_tokens: int = 3000, temperature: float = 0.7) -> dict:
-        """
-        Generiert Content mit Gemini
-        """
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-            'HTTP-Referer': 'https://pw-script-studio.com',
-            'X-Title': 'PW Script Studio'
-        }
-        
-        payload = {
-            'model': self.model,
-            'messages': [
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ],
-            'max_tokens': max_tokens,
-            'temperature': temperature,
-            'top_p': 0.9
-        }
-        
-        try:
-            logger.info(f"Gemini API Aufruf - Tokens: {max_tokens}")
-            
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            content = data['choices'][0]['message']['content']
-            tokens_used = data.get('usage', {}).get('total_tokens', max_tokens)
-            
-            logger.info(f"Gemini erfolgreich - Tokens: {tokens_used}")
-            
-            return {
-                'success': True,
-                'content': content,
-                'tokens_used': tokens_used,
-                'model': self.model,
-                'cost': self._calculate_cost(tokens_used)
-            }
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Gemini API Fehler: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'cost': 0.00
-            }
+    model = "google/gemini-2.5-flash"
+    service_name = 'Gemini'
+    default_max_tokens = 3000
+    timeout = 60
     
     def _calculate_cost(self, tokens: int) -> float:
         """
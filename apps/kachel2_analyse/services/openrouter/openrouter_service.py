@@ -4,23 +4,23 @@ OpenRouter API Service für beide Workflows
 Dieser Service wird sowohl für OFFENE als auch AKTIVE Aufträge verwendet.
 Unterschiedliche Modelle basierend auf Qualitätsstufe.
 """
-import requests
+import functools
 import logging
-from django.conf import settings
+import math
+from .base_service import BaseOpenRouterService, API_ERRORS
+from ..token_counter import count_tokens, get_model_profile
 
 logger = logging.getLogger(__name__)
 
-class OpenRouterService:
+class OpenRouterService(BaseOpenRouterService):
     """
     Service für OpenRouter API - für beide Workflows
     """
     
+    service_name = 'OpenRouter'
+    
     def __init__(self):
-        self.api_key = settings.OPENROUTER_API_KEY
-        self.base_url = "https://openrouter.ai/api/v1"
-        
-        if not self.api_key:
-            raise ValueError("OPENROUTER_API_KEY nicht konfiguriert!")
+        super().__init__()
         
         # Modell-Mapping basierend auf Qualitätsstufe
         self.models = {
@@ -41,7 +41,8 @@ class OpenRouterService:
             }
         }
     
-    def generate_content(self, prompt, model_quality='bronze', max_tokens=None):
+    def generate_content(self, prompt, model_quality='bronze', max_tokens=None, use_cache=False,
+                         deadline=None, coalesce=True, prompt_prefix=None):
         """
         Generiert Content über OpenRouter API
         
@@ -49,6 +50,10 @@ class OpenRouterService:
             prompt: Text-Prompt für die Generierung
             model_quality: bronze/silber/gold
             max_tokens: Maximale Token-Anzahl (optional)
+            use_cache: LLM-Cache nutzen (opt-in)
+            deadline: Optionale Deadline (begrenzt Timeout und Retries)
+            coalesce: Identische laufende Aufrufe teilen
+            prompt_prefix: Optionaler stabiler Prompt-Anfang (mit Cache-Hinweis)
         
         Returns:
             dict mit generiertem Content und Kosten
@@ -58,71 +63,60 @@ class OpenRouterService:
         
         model_config = self.models[model_quality]
         
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-            'HTTP-Referer': 'https://pw-script-studio.com',
-            'X-Title': 'PW Script Studio'
-        }
+        payload = self._build_payload(
+            prompt,
+            max_tokens=max_tokens or model_config['max_tokens'],
+            temperature=0.7,
+            model=model_config['model'],
+            prompt_prefix=prompt_prefix
+        )
         
-        payload = {
-            'model': model_config['model'],
-            'messages': [
-                {
-                    'role': 'user',
-                    'content': prompt
+        def _request(payload, deadline=None):
+            try:
+                logger.info(f"OpenRouter API Aufruf - Modell: {model_config['model']}")
+                
+                data = self._post_chat(payload, timeout=self.timeout, deadline=deadline)
+                
+                # Content extrahieren
+                content = data['choices'][0]['message']['content']
+                
+                # Kosten berechnen (geschätzt)
+                tokens_used = data.get('usage', {}).get('total_tokens', 1000)
+                cached_tokens = self._cached_tokens(data.get('usage'))
+                estimated_cost = tokens_used * model_config['cost_per_token']
+                
+                logger.info(f"OpenRouter erfolgreich - Tokens: {tokens_used}, Kosten: ${estimated_cost:.4f}")
+                
+                return {
+                    'success': True,
+                    'content': content,
+                    'cost': estimated_cost,
+                    'tokens_used': tokens_used,
+                    'cached_tokens': cached_tokens,
+                    'model': model_config['model'],
+                    'quality': model_quality
+                }
+                
+            except API_ERRORS as e:
+                logger.error(f"OpenRouter API Fehler: {e}")
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'cost': 0.00
+                }
+            except (KeyError, IndexError) as e:
+                logger.error(f"OpenRouter Response Format Fehler: {e}")
+                return {
+                    'success': False,
+                    'error': f"Unerwartetes Response Format: {e}",
+                    'cost': 0.00
                 }
-            ],
-            'max_tokens': max_tokens or model_config['max_tokens'],
-            'temperature': 0.7,
-            'top_p': 0.9
-        }
         
-        try:
-            logger.info(f"OpenRouter API Aufruf - Modell: {model_config['model']}")
-            
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Content extrahieren
-            content = data['choices'][0]['message']['content']
-            
-            # Kosten berechnen (geschätzt)
-            tokens_used = data.get('usage', {}).get('total_tokens', 1000)
-            estimated_cost = tokens_used * model_config['cost_per_token']
-            
-            logger.info(f"OpenRouter erfolgreich - Tokens: {tokens_used}, Kosten: ${estimated_cost:.4f}")
-            
-            return {
-                'success': True,
-                'content': content,
-                'cost': estimated_cost,
-                'tokens_used': tokens_used,
-                'model': model_config['model'],
-                'quality': model_quality
-            }
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"OpenRouter API Fehler: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'cost': 0.00
-            }
-        except KeyError as e:
-            logger.error(f"OpenRouter Response Format Fehler: {e}")
-            return {
-                'success': False,
-                'error': f"Unerwartetes Response Format: {e}",
-                'cost': 0.00
-            }
+        return self._execute(
+            payload, (prompt_prefix or '') + prompt,
+            functools.partial(_request, deadline=deadline),
+            use_cache, coalesce
+        )
     
     def get_model_info(self, quality_level):
         """
@@ -133,15 +127,26 @@ class OpenRouterService:
         
         return self.models[quality_level]
     
-    def estimate_cost(self, prompt_length, quality_level='bronze'):
+    def estimate_cost(self, prompt, quality_level='bronze', max_tokens=None):
         """
-        Schätzt die Kosten für einen Prompt
+        Schätzt die Kosten für einen Prompt (Obergrenze)
+        
+        Args:
+            prompt: Prompt-Text (oder Länge in Zeichen für ältere Aufrufer)
+            quality_level: bronze/silber/gold
+            max_tokens: Angefragte Ausgabe-Tokens (Default: Limit der Stufe)
         """
         if quality_level not in self.models:
             return 0.00
         
-        # Grobe Schätzung: 1 Zeichen ≈ 0.25 Token
-        estimated_tokens = prompt_length * 0.25 * 2  # Input + Output
-        cost_per_token = self.models[quality_level]['cost_per_token']
+        model_config = self.models[quality_level]
+        
+        if isinstance(prompt, str):
+            input_tokens = count_tokens(prompt, model_config['model'])
+        else:
+            # Nur Länge bekannt - Zeichen pro Token aus dem Modellprofil
+            input_tokens = math.ceil(int(prompt) / get_model_profile(model_config['model'])['CHARS_PER_TOKEN'])
+        
+        output_tokens = max_tokens or model_config['max_tokens']
         
-        return estimated_tokens * cost_per_token
+        return (input_tokens + output_tokens) * model_config['cost_per_token']
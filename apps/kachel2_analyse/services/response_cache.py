@@ -0,0 +1,237 @@
+"""
+Response Cache - Zweistufiger Cache für API-Antworten
+
+Stufe 1: In-Process LRU (OrderedDict) - schnellster Zugriff pro Worker
+Stufe 2: Datenbank (ApiCacheEntry) - überlebt Neustarts, geteilt zwischen Workern
+
+Beide Stufen haben eine TTL und eine Größenbegrenzung (LRU-Verdrängung).
+Die DB-Stufe prüft das Limit nur alle `db_evict_interval` Schreibvorgänge -
+bis dahin kann sie das Limit um höchstens so viele Einträge überschreiten.
+Der Cache ist generisch und wird über einen Namespace getrennt genutzt.
+"""
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from django.db import DatabaseError, connection, close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Erzeugt einen stabilen SHA-256 Schlüssel aus beliebigen JSON-fähigen Teilen
+    """
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+# Thread-Namen der eigenen Executoren (thread_name_prefix) - nur deren Threads
+# geben ihre DB-Verbindung nach einem Cache-Zugriff frei
+POOL_THREAD_PREFIXES = ('llm-async', 'script-section', 'job-ingestion', 'task-graph')
+
+
+def release_thread_connection():
+    """
+    Gibt die DB-Verbindung eines Pool-Threads frei, wie Django es am Ende
+    eines Requests tut (close_old_connections, abhängig von CONN_MAX_AGE)
+
+    Pool-Threads (Fan-Outs, Abschnitte, Import) laufen außerhalb des
+    Request-Zyklus - ohne diesen Aufruf bleibt pro Thread eine Verbindung
+    offen. Request-Threads des Servers (und der Haupt-Thread) behalten ihre
+    Verbindung für Keep-Alive, innerhalb von Transaktionen passiert nichts.
+    """
+    if not threading.current_thread().name.startswith(POOL_THREAD_PREFIXES) or connection.in_atomic_block:
+        return
+    close_old_connections()
+
+
+class MemoryLRUCache:
+    """
+    Thread-sicherer LRU-Cache mit TTL pro Eintrag
+
+    Speichert und liefert Kopien (deepcopy) - ändert ein Aufrufer das Ergebnis
+    (z.B. result['research_data'] = ...), sehen spätere Treffer davon nichts.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value, ttl_seconds: float):
+        if self.max_entries <= 0:
+            return
+
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResponseCache:
+    """
+    Zweistufiger Cache (Memory LRU + Datenbank) für einen Namespace
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int, memory_max_entries: int = 256,
+                 db_enabled: bool = True, db_max_entries: int = 5000, db_evict_interval: int = 100):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.db_enabled = db_enabled
+        self.db_max_entries = db_max_entries
+        self.db_evict_interval = max(1, db_evict_interval)
+        self.memory = MemoryLRUCache(memory_max_entries)
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def get(self, key: str):
+        """
+        Liefert den Wert zu einem Schlüssel oder None (Memory zuerst, dann DB)
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if not self.db_enabled:
+            return None
+
+        value, remaining = self._db_get(key)
+        if value is not None:
+            # In Memory übernehmen, aber nicht länger als in der DB gültig
+            self.memory.set(key, value, remaining)
+        return value
+
+    def set(self, key: str, value, ttl_seconds: int = None):
+        """
+        Speichert einen Wert in beiden Stufen
+        """
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        self.memory.set(key, value, ttl_seconds)
+
+        if self.db_enabled:
+            self._db_set(key, value, ttl_seconds)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+
+        if self.db_enabled:
+            try:
+                self._queryset().filter(key=key).delete()
+            except DatabaseError as e:
+                logger.warning(f"Cache '{self.namespace}' DB-Fehler beim Löschen: {e}")
+            finally:
+                release_thread_connection()
+
+    def purge_expired(self) -> int:
+        """
+        Löscht abgelaufene DB-Einträge dieses Namespaces
+
+        Returns:
+            Anzahl gelöschter Einträge
+        """
+        if not self.db_enabled:
+            return 0
+
+        deleted, _ = self._queryset().filter(expires_at__lte=timezone.now()).delete()
+        if deleted:
+            logger.info(f"Cache '{self.namespace}': {deleted} abgelaufene Einträge gelöscht")
+        return deleted
+
+    def _queryset(self):
+        from apps.kachel2_analyse.models import ApiCacheEntry
+        return ApiCacheEntry.objects.filter(namespace=self.namespace)
+
+    def _db_get(self, key: str):
+        now = timezone.now()
+        try:
+            entry = self._queryset().filter(key=key, expires_at__gt=now).first()
+            if entry is None:
+                return None, 0
+
+            self._queryset().filter(pk=entry.pk).update(
+                last_accessed=now,
+                hit_count=entry.hit_count + 1
+            )
+            return entry.value, (entry.expires_at - now).total_seconds()
+
+        except DatabaseError as e:
+            logger.warning(f"Cache '{self.namespace}' DB-Fehler beim Lesen: {e}")
+            return None, 0
+        finally:
+            release_thread_connection()
+
+    def _db_set(self, key: str, value, ttl_seconds: int):
+        from apps.kachel2_analyse.models import ApiCacheEntry
+
+        now = timezone.now()
+        try:
+            ApiCacheEntry.objects.update_or_create(
+                namespace=self.namespace,
+                key=key,
+                defaults={
+                    'value': value,
+                    'expires_at': now + timedelta(seconds=ttl_seconds),
+                    'last_accessed': now
+                }
+            )
+            if self._eviction_due():
+                self._evict_overflow()
+
+        except DatabaseError as e:
+            logger.warning(f"Cache '{self.namespace}' DB-Fehler beim Schreiben: {e}")
+        finally:
+            release_thread_connection()
+
+    def _eviction_due(self) -> bool:
+        """True bei jedem db_evict_interval-ten Schreibvorgang"""
+        with self._writes_lock:
+            self._writes += 1
+            return self._writes % self.db_evict_interval == 0
+
+    def _evict_overflow(self):
+        """
+        Verdrängt die am längsten nicht genutzten Einträge über dem Größenlimit
+        """
+        overflow = self._queryset().count() - self.db_max_entries
+        if overflow <= 0:
+            return
+
+        stale_ids = list(
+            self._queryset().order_by('last_accessed').values_list('pk', flat=True)[:overflow]
+        )
+        self._queryset().filter(pk__in=stale_ids).delete()
+        logger.info(f"Cache '{self.namespace}': {len(stale_ids)} Einträge verdrängt (LRU)")
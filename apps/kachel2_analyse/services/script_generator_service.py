@@ -4,15 +4,59 @@ Nutzt die spezialisierten OpenRouter Services (Opus, Gemini, Sonnet)
 Optimiert für PW-Script-Studio mit Django-Integration
 """
 
+import json
 import logging
-from typing import Dict, Optional
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from django.conf import settings
+from .async_runner import run_blocking, gather_bounded
+from .token_counter import (
+    count_tokens, output_token_budget, trim_to_tokens, get_token_budget, PromptBudgetExceeded
+)
 from .openrouter.opus_service import OpusService
 from .openrouter.gemini_service import GeminiService
 from .openrouter.sonnet_service import SonnetService
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_LONG_SCRIPT_SETTINGS = {
+    'THRESHOLD_WORDS': 2500,
+    'SECTION_WORDS': 800,
+    'MAX_SECTIONS': 8,
+    'MAX_CONCURRENCY': 4,
+    'SMOOTH_TRANSITIONS': True,
+}
+
+_section_pool = None
+_section_pool_lock = threading.Lock()
+
+
+def get_long_script_settings() -> dict:
+    """
+    Einstellungen für lange Scripts (settings.LONG_SCRIPT mit Defaults)
+    """
+    config = dict(DEFAULT_LONG_SCRIPT_SETTINGS)
+    config.update(getattr(settings, 'LONG_SCRIPT', {}) or {})
+    return config
+
+
+def _get_section_pool() -> ThreadPoolExecutor:
+    """
+    Eigener Thread-Pool für Abschnitte - unabhängig vom Async-Pool, damit
+    generate_long auch aus einem Async-Worker heraus nicht blockiert
+    """
+    global _section_pool
+    if _section_pool is None:
+        with _section_pool_lock:
+            if _section_pool is None:
+                _section_pool = ThreadPoolExecutor(
+                    max_workers=get_long_script_settings()['MAX_CONCURRENCY'],
+                    thread_name_prefix='script-section'
+                )
+    return _section_pool
+
 
 class OpusScriptGenerator:
     """
@@ -26,15 +70,26 @@ class OpusScriptGenerator:
         self.sonnet = SonnetService()  # Mittlere Qualität  
         self.gemini = GeminiService()  # Schnell und günstig
         
-        # Qualitätsstufen-Mapping
+        services = {
+            'gemini': self.gemini,
+            'sonnet': self.sonnet,
+            'opus': self.opus
+        }
+
+        # Qualitätsstufen -> geordnete Fallback-Kette (erster Eintrag = Standard-Modell)
+        self.fallback_chains = {
+            quality: [services[name] for name in names]
+            for quality, names in settings.MODEL_FALLBACKS.items()
+        }
+
+        # Qualitätsstufen-Mapping (primärer Service je Stufe)
         self.quality_services = {
-            'bronze': self.gemini,
-            'silber': self.sonnet,
-            'gold': self.opus
+            quality: chain[0] for quality, chain in self.fallback_chains.items()
         }
     
     def generate(self, title: str, description: str = "", keywords: str = "", 
-                 word_count: int = 1000, quality: str = 'bronze') -> dict:
+                 word_count: int = 1000, quality: str = 'bronze', deadline=None,
+                 research_context: str = "") -> dict:
         """
         Generiert Script-Content basierend auf Qualitätsstufe
         
@@ -44,31 +99,25 @@ class OpusScriptGenerator:
             keywords: Keywords für den Content
             word_count: Gewünschte Wortanzahl
             quality: bronze/silber/gold
+            deadline: Optionale Deadline des Workflows (Restzeit-Budget)
+            research_context: Ausgewählte Research-Snippets (SnippetSelector)
         
         Returns:
             dict mit generiertem Content und Metadaten
         """
         logger.info(f"Generiere Script: '{title}' (Qualität: {quality}, Wörter: {word_count})")
         
-        # Service basierend auf Qualität auswählen
-        service = self.quality_services.get(quality, self.gemini)
-        
-        # Prompt erstellen
-        prompt = self._create_prompt(title, description, keywords, word_count, quality)
-        
-        # Token-Limit basierend auf Qualität
-        max_tokens = {
-            'bronze': 2000,
-            'silber': 3000,
-            'gold': 4000
-        }.get(quality, 2000)
+        # Services der Qualitätsstufe in Fallback-Reihenfolge
+        chain = self._service_chain(quality)
         
         try:
-            # Content generieren
-            result = service.generate_content(
-                prompt=prompt,
-                max_tokens=max_tokens,
-                temperature=0.7
+            # Prompt erstellen (Briefing wird bei Bedarf aufs Token-Budget gekürzt)
+            prefix, prompt = self._fit_prompt(
+                title, description, keywords, word_count, quality, chain[0].model, research_context
+            )
+            
+            result, service = self._complete_with_fallback(
+                chain, prompt, word_count, deadline=deadline, prompt_prefix=prefix
             )
             
             if result['success']:
@@ -82,9 +131,12 @@ class OpusScriptGenerator:
                     'word_count_target': word_count,
                     'word_count_actual': len(result['content'].split()),
                     'tokens_used': result['tokens_used'],
+                    'cached_tokens': result.get('cached_tokens', 0),
                     'cost': result['cost'],
                     'model': result['model'],
-                    'service': service.__class__.__name__
+                    'service': service.__class__.__name__,
+                    'fallback_used': service is not chain[0],
+                    'requested_model': chain[0].model
                 }
             else:
                 logger.error(f"Script-Generierung fehlgeschlagen: {result['error']}")
@@ -94,6 +146,13 @@ class OpusScriptGenerator:
                     'cost': 0.00
                 }
                 
+        except PromptBudgetExceeded as e:
+            logger.error(f"Script-Prompt abgelehnt: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'cost': 0.00
+            }
         except Exception as e:
             logger.error(f"Unerwarteter Fehler bei Script-Generierung: {e}")
             return {
@@ -102,21 +161,538 @@ class OpusScriptGenerator:
                 'cost': 0.00
             }
 
-    def _create_prompt(self, title: str, description: str, keywords: str,
-                       word_count: int, quality: str) -> str:
+    def generate_stream(self, title: str, description: str = "", keywords: str = "",
+                        word_count: int = 1000, quality: str = 'bronze', research_context: str = ""):
         """
-        Erstellt optimierten Prompt basierend auf Qualitätsstufe
+        Generiert Script-Content als Stream (Text erscheint während der Generierung)
+
+        Fällt ein Modell vor dem ersten Text-Stück aus, wird das nächste
+        Modell der Fallback-Kette genutzt. Nach dem ersten Text-Stück ist
+        kein Wechsel mehr möglich.
+
+        Yields:
+            dicts mit 'type':
+            - 'meta':  Titel, Qualität, Modell und Service vor dem ersten Token
+            - 'delta': {'content': Text-Stück}
+            - 'done':  Metadaten wie bei generate() (ohne den kompletten Content)
+            - 'error': {'error', 'cost'}
         """
-        base_prompt = f"""
-Erstelle ein hochwertiges Script mit folgendem Titel: "{title}"
+        logger.info(f"Streame Script: '{title}' (Qualität: {quality}, Wörter: {word_count})")
+
+        chain = self._service_chain(quality)
+        try:
+            prefix, prompt = self._fit_prompt(
+                title, description, keywords, word_count, quality, chain[0].model, research_context
+            )
+        except PromptBudgetExceeded as e:
+            logger.error(f"Script-Prompt abgelehnt: {e}")
+            yield {'type': 'error', 'error': str(e), 'cost': 0.00}
+            return
+
+        def _meta(service):
+            return {
+                'type': 'meta',
+                'title': title,
+                'quality': quality,
+                'word_count_target': word_count,
+                'model': service.model,
+                'service': service.__class__.__name__,
+                'fallback_used': service is not chain[0]
+            }
+
+        for index, service in enumerate(chain):
+            started = False
+            is_last = index == len(chain) - 1
+
+            for event in service.stream_content(
+                prompt=prompt,
+                prompt_prefix=prefix,
+                max_tokens=output_token_budget(word_count, service.model),
+                temperature=0.7,
+            ):
+                if event['type'] == 'error' and not started and not is_last:
+                    logger.warning(
+                        f"{service.service_name} Stream fehlgeschlagen ({event['error']}) - "
+                        f"Fallback auf {chain[index + 1].service_name}"
+                    )
+                    break
+
+                if not started:
+                    # Meta erst senden, wenn feststeht welches Modell liefert
+                    started = True
+                    yield _meta(service)
+
+                if event['type'] == 'done':
+                    logger.info(f"Script-Stream abgeschlossen - {event['tokens_used']} Tokens")
+                    yield {
+                        'type': 'done',
+                        'title': title,
+                        'quality': quality,
+                        'word_count_target': word_count,
+                        'word_count_actual': len(event['content'].split()),
+                        'tokens_used': event['tokens_used'],
+                        'cached_tokens': event.get('cached_tokens', 0),
+                        'cost': event['cost'],
+                        'model': event['model'],
+                        'service': service.__class__.__name__,
+                        'fallback_used': service is not chain[0],
+                        'requested_model': chain[0].model
+                    }
+                else:
+                    if event['type'] == 'error':
+                        logger.error(f"Script-Stream fehlgeschlagen: {event['error']}")
+                    yield event
+
+            if started:
+                return
+
+    def generate_long(self, title: str, description: str = "", keywords: str = "",
+                      word_count: int = 5000, quality: str = 'gold', deadline=None,
+                      research_context: str = "") -> dict:
+        """
+        Generiert lange Scripts: Gliederung -> Abschnitte parallel -> Zusammenfügen
+
+        1. Gliederung mit N Abschnitten (N aus word_count / SECTION_WORDS)
+        2. Alle Abschnitte gleichzeitig generieren (jeweils mit Fallback-Kette)
+        3. Abschnitte zusammenfügen, Übergänge mit kurzen Überleitungen glätten
+
+        Scheitert die Gliederung, wird auf generate() zurückgefallen.
+
+        Returns:
+            dict wie generate() plus 'mode' und 'sections'
+        """
+        config = get_long_script_settings()
+        section_count = min(config['MAX_SECTIONS'], max(2, math.ceil(word_count / config['SECTION_WORDS'])))
+
+        logger.info(
+            f"Generiere langes Script: '{title}' (Qualität: {quality}, Wörter: {word_count}, "
+            f"Abschnitte: {section_count})"
+        )
+
+        chain = self._service_chain(quality)
+        description = trim_to_tokens(
+            description, get_token_budget()['MAX_PROMPT_TOKENS'] // 2, chain[0].model
+        )
+        total_cost = 0.00
+        total_tokens = 0
+
+        try:
+            # 1. Gliederung
+            outline_result, outline_service = self._complete_with_fallback(
+                chain,
+                self._create_outline_prompt(title, description, keywords, word_count, section_count, research_context),
+                word_count=60 * section_count,
+                temperature=0.5,
+                deadline=deadline
+            )
+            total_cost += outline_result['cost']
+            outline = self._parse_outline(outline_result.get('content', ''), word_count)
+
+            if not outline_result['success'] or not outline:
+                logger.warning("Gliederung nicht nutzbar - generiere Script in einem Aufruf")
+                result = self.generate(title, description, keywords, word_count, quality, deadline, research_context)
+                result['cost'] = result.get('cost', 0.00) + total_cost
+                return result
+
+            total_tokens += outline_result['tokens_used']
+
+            # 2. Abschnitte parallel (gemeinsamer, cachebarer Prefix)
+            pool = _get_section_pool()
+            futures = []
+            for index, section in enumerate(outline):
+                prefix, prompt = self._create_section_prompt_parts(
+                    title, description, keywords, outline, index, quality, research_context
+                )
+                futures.append(pool.submit(
+                    self._complete_with_fallback,
+                    chain, prompt, section['words'], 0.7, deadline, prefix
+                ))
+            section_results = [future.result() for future in futures]
+
+            total_cost += sum(result['cost'] for result, _ in section_results)
+            failed = [
+                f"Abschnitt {index + 1}: {result['error']}"
+                for index, (result, _) in enumerate(section_results) if not result['success']
+            ]
+            if failed:
+                logger.error(f"Langes Script fehlgeschlagen: {'; '.join(failed)}")
+                return {
+                    'success': False,
+                    'error': '; '.join(failed),
+                    'cost': total_cost
+                }
+
+            texts = [result['content'].strip() for result, _ in section_results]
+            total_tokens += sum(result['tokens_used'] for result, _ in section_results)
+
+            # 3. Übergänge glätten (optional, schnelles Modell)
+            if config['SMOOTH_TRANSITIONS']:
+                transitions, transition_cost, transition_tokens = self._create_transitions(outline, texts, deadline)
+                total_cost += transition_cost
+                total_tokens += transition_tokens
+                for index, transition in enumerate(transitions):
+                    if transition:
+                        texts[index] = f"{texts[index]}\n\n{transition}"
+
+            content = '\n\n'.join(
+                f"## {section['title']}\n\n{text}" for section, text in zip(outline, texts)
+            )
+            services = [service for _, service in section_results]
+
+            logger.info(
+                f"Langes Script erfolgreich generiert - {len(outline)} Abschnitte, {total_tokens} Tokens"
+            )
+
+            return {
+                'success': True,
+                'title': title,
+                'content': content,
+                'quality': quality,
+                'word_count_target': word_count,
+                'word_count_actual': len(content.split()),
+                'tokens_used': total_tokens,
+                'cached_tokens': sum(result.get('cached_tokens', 0) for result, _ in section_results),
+                'cost': total_cost,
+                'model': outline_result['model'],
+                'service': outline_service.__class__.__name__,
+                'fallback_used': any(service is not chain[0] for service in [outline_service] + services),
+                'requested_model': chain[0].model,
+                'mode': 'long',
+                'sections': [
+                    {
+                        'title': section['title'],
+                        'word_count_target': section['words'],
+                        'word_count_actual': len(text.split()),
+                        'model': result['model']
+                    }
+                    for section, text, (result, _) in zip(outline, texts, section_results)
+                ]
+            }
+
+        except Exception as e:
+            logger.error(f"Unerwarteter Fehler bei langem Script: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'cost': total_cost
+            }
+
+    def _create_transitions(self, outline: list, texts: List[str], deadline=None):
+        """
+        Erzeugt parallel kurze Überleitungen zwischen aufeinanderfolgenden Abschnitten
+
+        Returns:
+            (Liste Überleitung pro Abschnitt außer dem letzten - None bei Fehler, Kosten, Tokens)
+        """
+        chain = self._service_chain('bronze')
+        pool = _get_section_pool()
+        futures = [
+            pool.submit(
+                self._complete_with_fallback,
+                chain,
+                self._create_transition_prompt(texts[index], outline[index + 1]['title'], texts[index + 1]),
+                40,
+                0.5,
+                deadline
+            )
+            for index in range(len(texts) - 1)
+        ]
+
+        transitions = []
+        cost = 0.00
+        tokens = 0
+        for future in futures:
+            result, _ = future.result()
+            cost += result['cost']
+            if result['success']:
+                tokens += result['tokens_used']
+                transitions.append(result['content'].strip().strip('"'))
+            else:
+                logger.warning(f"Überleitung übersprungen: {result['error']}")
+                transitions.append(None)
+        return transitions, cost, tokens
+
+    def _parse_outline(self, content: str, word_count: int) -> list:
+        """
+        Liest die JSON-Gliederung und verteilt die Wortanzahl auf die Abschnitte
+
+        Returns:
+            Liste von {'title', 'points', 'words'} - leer wenn nicht lesbar
+        """
+        start, end = content.find('['), content.rfind(']')
+        if start == -1 or end <= start:
+            return []
+
+        try:
+            raw_sections = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            return []
+
+        sections = [
+            {
+                'title': str(section['titel']).strip(),
+                'points': [str(point) for point in section.get('kernpunkte', [])],
+                'words': section.get('woerter') if isinstance(section.get('woerter'), (int, float)) else 0
+            }
+            for section in raw_sections
+            if isinstance(section, dict) and section.get('titel')
+        ]
+        if len(sections) < 2:
+            return []
+
+        # Wortanzahl so skalieren, dass die Summe dem Ziel entspricht
+        planned = sum(section['words'] for section in sections)
+        for section in sections:
+            share = section['words'] / planned if planned > 0 else 1 / len(sections)
+            section['words'] = max(100, round(word_count * share))
+        return sections
+
+    async def agenerate(self, title: str, description: str = "", keywords: str = "",
+                        word_count: int = 1000, quality: str = 'bronze', research_context: str = "") -> dict:
+        """
+        Async-Variante von generate() - blockiert den Event-Loop nicht
+        """
+        return await run_blocking(
+            self.generate,
+            title=title,
+            description=description,
+            keywords=keywords,
+            word_count=word_count,
+            quality=quality,
+            research_context=research_context
+        )
+
+    async def agenerate_many(self, jobs: List[dict], max_concurrency: int = None) -> List[dict]:
+        """
+        Generiert mehrere Scripts gleichzeitig mit begrenzter Parallelität
+
+        Args:
+            jobs: Liste von dicts mit den Argumenten für generate()
+                  (title, description, keywords, word_count, quality)
+            max_concurrency: Maximale Anzahl gleichzeitiger LLM-Aufrufe
+
+        Returns:
+            Liste der Ergebnisse in Reihenfolge der Jobs
+        """
+        logger.info(f"Starte parallele Script-Generierung: {len(jobs)} Jobs")
+        return await gather_bounded(
+            (self.agenerate(**job) for job in jobs),
+            max_concurrency=max_concurrency
+        )
+
+    async def acomplete_many(self, prompts: List[str], quality: str = 'bronze',
+                             max_tokens: int = None, temperature: float = 0.7,
+                             max_concurrency: int = None) -> List[dict]:
+        """
+        Sendet mehrere fertige Prompts gleichzeitig an den Service der Qualitätsstufe
+
+        Returns:
+            Liste der Service-Ergebnisse in Reihenfolge der Prompts
+        """
+        service = self.quality_services.get(quality, self.gemini)
+        return await gather_bounded(
+            (
+                service.agenerate_content(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+                for prompt in prompts
+            ),
+            max_concurrency=max_concurrency
+        )
+
+    def _complete_with_fallback(self, chain: list, prompt: str, word_count: int,
+                                temperature: float = 0.7, deadline=None, prompt_prefix: str = None):
+        """
+        Sendet den Prompt (optional mit cachebarem Prefix) entlang der
+        Fallback-Kette bis ein Modell liefert
+
+        max_tokens wird pro Modell aus word_count bestimmt; offene
+        Circuits scheitern sofort und kosten keine Wartezeit.
+
+        Returns:
+            (Service-Ergebnis, Service der es geliefert bzw. zuletzt versucht hat)
+        """
+        errors = []
+        for index, service in enumerate(chain):
+            result = service.generate_content(
+                prompt=prompt,
+                prompt_prefix=prompt_prefix,
+                max_tokens=output_token_budget(word_count, service.model),
+                temperature=temperature,
+                deadline=deadline
+            )
+
+            if result['success']:
+                return result, service
+
+            errors.append(f"{service.model}: {result['error']}")
+            if index < len(chain) - 1:
+                logger.warning(
+                    f"{service.service_name} fehlgeschlagen ({result['error']}) - "
+                    f"Fallback auf {chain[index + 1].service_name}"
+                )
+
+        return {**result, 'error': '; '.join(errors)}, service
+
+    def _service_chain(self, quality: str) -> list:
+        """
+        Services einer Qualitätsstufe in Fallback-Reihenfolge
+        """
+        return self.fallback_chains.get(quality) or [self.gemini]
+
+    def _fit_prompt(self, title: str, description: str, keywords: str,
+                    word_count: int, quality: str, model: str, research_context: str = "") -> tuple:
+        """
+        Erstellt den Prompt (Prefix, Suffix) und hält TOKEN_BUDGET['MAX_PROMPT_TOKENS'] ein
+
+        Ist der Prompt zu groß, wird das Briefing gekürzt. Reicht das
+        nicht, wird der Prompt abgelehnt statt ihn zu senden.
+
+        Raises:
+            PromptBudgetExceeded
+        """
+        max_prompt_tokens = get_token_budget()['MAX_PROMPT_TOKENS']
+        parts = self._create_prompt_parts(title, description, keywords, word_count, quality, research_context)
+        prompt_tokens = count_tokens(''.join(parts), model)
+        if prompt_tokens <= max_prompt_tokens:
+            return parts
+
+        # Briefing um den Überhang kürzen (kleine Reserve für Wortgrenzen)
+        allowed = count_tokens(description, model) - (prompt_tokens - max_prompt_tokens) - 16
+        if allowed > 0:
+            parts = self._create_prompt_parts(
+                title, trim_to_tokens(description, allowed, model), keywords, word_count, quality,
+                research_context
+            )
+            trimmed_tokens = count_tokens(''.join(parts), model)
+            if trimmed_tokens <= max_prompt_tokens:
+                logger.warning(
+                    f"Briefing gekürzt - Prompt {prompt_tokens} -> {trimmed_tokens} Tokens "
+                    f"(Budget {max_prompt_tokens})"
+                )
+                return parts
+
+        raise PromptBudgetExceeded(
+            f"Script-Prompt mit {prompt_tokens} Tokens überschreitet das Budget von {max_prompt_tokens}"
+        )
+
+    def _create_outline_prompt(self, title: str, description: str, keywords: str,
+                               word_count: int, section_count: int, research_context: str = "") -> str:
+        """
+        Prompt für die Gliederung eines langen Scripts
+        """
+        return f"""
+Erstelle die Gliederung für ein Script mit folgendem Titel: "{title}"
 
 Beschreibung/Briefing: {description}
 
 Keywords: {keywords}
-
+{self._research_block(research_context)}
 Anforderungen:
-- Zielwortanzahl: {word_count} Wörter
+- Gesamtlänge: ca. {word_count} Wörter
+- Genau {section_count} Abschnitte mit logischem Aufbau (Einstieg bis Fazit)
+- Pro Abschnitt 2-4 Kernpunkte, keine Überschneidungen zwischen Abschnitten
+
+Antworte NUR mit JSON in diesem Format:
+[{{"titel": "Abschnitt-Überschrift", "kernpunkte": ["Punkt 1", "Punkt 2"], "woerter": 800}}]
+"""
+
+    def _create_section_prompt_parts(self, title: str, description: str, keywords: str,
+                                     outline: list, index: int, quality: str,
+                                     research_context: str = "") -> tuple:
+        """
+        Prompt für einen Abschnitt als (Prefix, Suffix) - kennt die ganze
+        Gliederung, schreibt nur seinen Teil
+
+        Titel, Briefing, Research und Gliederung sind für alle Abschnitte
+        eines Scripts gleich und bilden den cachebaren Prefix.
+        """
+        section = outline[index]
+        outline_text = '\n'.join(
+            f"{number}. {item['title']}" for number, item in enumerate(outline, start=1)
+        )
+        points = '\n'.join(f"- {point}" for point in section['points'])
+
+        if index == 0:
+            position = "- Beginne mit einem starken Einstieg (Hook), der zum Weiterschauen motiviert"
+        else:
+            position = "- Keine Begrüßung und keine Einleitung des gesamten Scripts"
+        if index == len(outline) - 1:
+            position += "\n- Ende mit einem Fazit und einem Call-to-Action"
+        else:
+            position += "\n- Kein Fazit und keine Verabschiedung - das Script geht danach weiter"
+
+        prefix = f"""
+Du schreibst einen Abschnitt eines Scripts mit dem Titel: "{title}"
+
+Beschreibung/Briefing: {description}
+
+Keywords: {keywords}
+{self._research_block(research_context)}
+Gliederung des gesamten Scripts:
+{outline_text}
+
+Allgemeine Anforderungen:
 - Qualitätsstufe: {quality}
+- Nur den angegebenen Abschnitt schreiben, keine Inhalte anderer Abschnitte vorwegnehmen
+- Beginne direkt mit dem Text, ohne Überschrift
+"""
+
+        suffix = f"""
+Dein Abschnitt: {index + 1} von {len(outline)} - "{section['title']}"
+Kernpunkte:
+{points}
+
+Anforderungen:
+- Zielwortanzahl: {section['words']} Wörter
+{position}
+
+Schreibe den Abschnitt jetzt:
+"""
+
+        return prefix, suffix
+
+    def _create_transition_prompt(self, previous_text: str, next_title: str, next_text: str) -> str:
+        """
+        Prompt für eine kurze Überleitung zwischen zwei Abschnitten
+        """
+        return f"""
+Schreibe eine Überleitung (1-2 Sätze) zwischen zwei Abschnitten eines Scripts.
+
+Ende des vorherigen Abschnitts:
+...{previous_text[-500:]}
+
+Nächster Abschnitt: "{next_title}"
+Anfang des nächsten Abschnitts:
+{next_text[:500]}...
+
+Die Überleitung wird direkt ans Ende des vorherigen Abschnitts gesetzt.
+Antworte nur mit der Überleitung, keine Erklärungen.
+"""
+
+    def _create_prompt(self, title: str, description: str, keywords: str,
+                       word_count: int, quality: str, research_context: str = "") -> str:
+        """
+        Erstellt optimierten Prompt basierend auf Qualitätsstufe
+        """
+        prefix, suffix = self._create_prompt_parts(title, description, keywords, word_count, quality, research_context)
+        return prefix + suffix
+
+    def _create_prompt_parts(self, title: str, description: str, keywords: str,
+                             word_count: int, quality: str, research_context: str = "") -> tuple:
+        """
+        Prompt als (stabiler Prefix, variabler Suffix)
+
+        Der Prefix enthält nur die Anweisungen der Qualitätsstufe und ist bei
+        jedem Aufruf identisch. Er liegt unter der Mindestgröße für Prompt-Caching
+        und geht ohne cache_control raus - cachebar sind nur die Abschnitts-Prefixe
+        von generate_long (Briefing + Gliederung).
+        Titel, Briefing, Keywords, Research und Wortanzahl stehen im Suffix.
+        """
+        prefix = """
+Du erstellst hochwertige Scripts. Allgemeine Anforderungen:
 - Professioneller, ansprechender Schreibstil
 - Gut strukturiert mit klaren Abschnitten
 - Zielgruppengerecht und informativ
@@ -124,20 +700,20 @@ Anforderungen:
 
         # Qualitätsspezifische Ergänzungen
         if quality == 'bronze':
-            base_prompt += """
+            prefix += """
 - Fokus auf Klarheit und Verständlichkeit
 - Direkte, einfache Sprache
 - Grundlegende Struktur
 """
         elif quality == 'silber':
-            base_prompt += """
+            prefix += """
 - Erweiterte Struktur mit Übergängen
 - Einbindung von Beispielen
 - Ausgewogener Ton zwischen informativ und unterhaltsam
 - Berücksichtigung aktueller Trends
 """
         elif quality == 'gold':
-            base_prompt += """
+            prefix += """
 - Höchste Qualität mit innovativen Ansätzen
 - Tiefgreifende Analyse und Insights
 - Perfekte Struktur mit fließenden Übergängen
@@ -146,12 +722,33 @@ Anforderungen:
 - Call-to-Actions und Engagement-Elemente
 """
 
-        base_prompt += f"""
+        suffix = f"""
+Erstelle ein hochwertiges Script mit folgendem Titel: "{title}"
+
+Beschreibung/Briefing: {description}
+
+Keywords: {keywords}
+{self._research_block(research_context)}
+Anforderungen:
+- Zielwortanzahl: {word_count} Wörter
+- Qualitätsstufe: {quality}
 
 Erstelle das Script jetzt mit ca. {word_count} Wörtern:
 """
 
-        return base_prompt
+        return prefix, suffix
+
+    @staticmethod
+    def _research_block(research_context: str) -> str:
+        """
+        Research-Snippets als Prompt-Abschnitt (leer ohne Research)
+        """
+        if not research_context:
+            return ""
+        return f"""
+Aktuelle Research-Quellen (als Faktenbasis nutzen, nicht wörtlich übernehmen):
+{research_context}
+"""
 
     def get_service_info(self) -> dict:
         """
@@ -165,5 +762,9 @@ Erstelle das Script jetzt mit ca. {word_count} Wörtern:
                 'silber': 'Claude Sonnet 3.5',
                 'gold': 'Claude Opus 4.1'
             },
+            'fallbacks': {
+                quality: [service.model for service in chain]
+                for quality, chain in self.fallback_chains.items()
+            },
             'supported_workflows': ['OFFEN', 'AKTIV']
         }
@@ -0,0 +1,81 @@
+"""
+Serper Cache - persistente Suchergebnisse für AKTIVE Aufträge
+
+Schlüssel: (Endpoint, normalisierte Query, gl, hl, num)
+Wöchentliche Kundenskripte aus derselben Nische suchen immer wieder fast
+identische Titel - ein Treffer spart den bezahlten Serper-Aufruf.
+
+Pro Endpoint ein eigener Namespace mit eigener TTL (News veralten schneller
+als die organische Suche). Abgelaufene Einträge entfernt der Befehl
+`python manage.py purge_api_cache`.
+"""
+import threading
+from django.conf import settings
+from .response_cache import ResponseCache, make_cache_key
+
+DEFAULT_SERPER_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'SEARCH_TTL_SECONDS': 7 * 24 * 3600,
+    'NEWS_TTL_SECONDS': 6 * 3600,
+    'MEMORY_MAX_ENTRIES': 256,
+    'DB_ENABLED': True,
+    'DB_MAX_ENTRIES': 5000,       # pro Endpoint
+    'DB_EVICT_INTERVAL': 100,     # LRU-Limit nur alle N Schreibvorgänge prüfen
+}
+
+# Endpoint -> Schlüssel der TTL in den Einstellungen
+SERPER_CACHE_ENDPOINTS = {
+    'search': 'SEARCH_TTL_SECONDS',
+    'news': 'NEWS_TTL_SECONDS',
+}
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_serper_cache_settings() -> dict:
+    """
+    Einstellungen des Serper-Caches (settings.SERPER_CACHE mit Defaults)
+    """
+    config = dict(DEFAULT_SERPER_CACHE_SETTINGS)
+    config.update(getattr(settings, 'SERPER_CACHE', {}) or {})
+    return config
+
+
+def get_serper_cache(endpoint: str):
+    """
+    Prozessweiter Cache für einen Serper-Endpoint ('search' oder 'news')
+
+    Returns:
+        ResponseCache oder None, wenn der Cache deaktiviert ist
+    """
+    config = get_serper_cache_settings()
+    if not config['ENABLED']:
+        return None
+
+    cache = _caches.get(endpoint)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(endpoint)
+            if cache is None:
+                cache = ResponseCache(
+                    namespace=f'serper_{endpoint}',
+                    ttl_seconds=config[SERPER_CACHE_ENDPOINTS[endpoint]],
+                    memory_max_entries=config['MEMORY_MAX_ENTRIES'],
+                    db_enabled=config['DB_ENABLED'],
+                    db_max_entries=config['DB_MAX_ENTRIES'],
+                    db_evict_interval=config['DB_EVICT_INTERVAL']
+                )
+                _caches[endpoint] = cache
+    return cache
+
+
+def serper_cache_key(endpoint: str, payload: dict) -> str:
+    """
+    Cache-Schlüssel für einen Serper-Aufruf
+
+    Die Query wird normalisiert (Groß-/Kleinschreibung, Leerzeichen), damit
+    "KI im Mittelstand " und "ki im  mittelstand" denselben Eintrag treffen.
+    """
+    query = ' '.join(str(payload.get('q') or '').lower().split())
+    return make_cache_key(endpoint, query, payload.get('gl'), payload.get('hl'), payload.get('num'))
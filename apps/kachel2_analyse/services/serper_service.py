@@ -4,12 +4,20 @@ Serper API Service - NUR für AKTIVE Aufträge!
 KRITISCH: Dieser Service darf NUR bei aktiven Kundenprojekten verwendet werden.
 Für offene Aufträge (Bewerbungen) ist die Serper API VERBOTEN!
 """
+import copy
 import requests
 import logging
 from django.conf import settings
+from core.single_flight import SingleFlight
+from core.rate_limiter import get_rate_limiter, parse_retry_after, RateLimitTimeout
+from .http_transport import get_serper_transport
+from .serper_cache import get_serper_cache, serper_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Prozessweit: identische Serper-Anfragen laufen nur einmal gleichzeitig
+_serper_requests = SingleFlight('Serper Single-Flight')
+
 class SerperService:
     """
     Service für Serper API - Research für AKTIVE Aufträge
@@ -17,10 +25,12 @@ class SerperService:
     
     def __init__(self):
         self.api_key = settings.SERPER_API_KEY
-        self.base_url = "https://google.serper.dev"
         
         if not self.api_key:
             raise ValueError("SERPER_API_KEY nicht konfiguriert!")
+
+        # Gepoolte Session mit Keep-Alive (wie bei OpenRouter)
+        self.transport = get_serper_transport()
     
     def search(self, query, workflow_type=None, auftrag_status=None):
         """
@@ -37,11 +47,6 @@ class SerperService:
         
         logger.info(f"Serper API Aufruf für AKTIVEN Auftrag: {query}")
         
-        headers = {
-            'X-API-KEY': self.api_key,
-            'Content-Type': 'application/json'
-        }
-        
         payload = {
             'q': query,
             'gl': 'de',  # Deutschland
@@ -49,32 +54,32 @@ class SerperService:
             'num': 10
         }
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/search",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"Serper API erfolgreich: {len(data.get('organic', []))} Ergebnisse")
-            
-            return {
-                'success': True,
-                'data': data,
-                'cost': 0.01,  # Geschätzte Kosten pro Aufruf
-                'query': query
-            }
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Serper API Fehler: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'cost': 0.00
-            }
+        def _request():
+            try:
+                with get_rate_limiter('serper').slot() as slot:
+                    response = self.transport.post('/search', json=payload, timeout=30)
+                    slot.record_status(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+                    response.raise_for_status()
+                
+                data = response.json()
+                logger.info(f"Serper API erfolgreich: {len(data.get('organic', []))} Ergebnisse")
+                
+                return {
+                    'success': True,
+                    'data': data,
+                    'cost': 0.01,  # Geschätzte Kosten pro Aufruf
+                    'query': query
+                }
+                
+            except (requests.exceptions.RequestException, RateLimitTimeout) as e:
+                logger.error(f"Serper API Fehler: {e}")
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'cost': 0.00
+                }
+        
+        return self._cached_request('search', payload, _request)
     
     def get_news(self, query, workflow_type=None, auftrag_status=None):
         """
@@ -89,36 +94,151 @@ class SerperService:
                 f"Workflow: {workflow_type}, Status: {auftrag_status}"
             )
         
-        headers = {
-            'X-API-KEY': self.api_key,
-            'Content-Type': 'application/json'
-        }
-        
         payload = {
             'q': query,
             'gl': 'de',
             'hl': 'de'
         }
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/news",
-                headers=headers,
-                json=payload,
-                timeout=30
+        def _request():
+            try:
+                with get_rate_limiter('serper').slot() as slot:
+                    response = self.transport.post('/news', json=payload, timeout=30)
+                    slot.record_status(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+                    response.raise_for_status()
+                
+                return {
+                    'success': True,
+                    'data': response.json(),
+                    'cost': 0.01
+                }
+                
+            except (requests.exceptions.RequestException, RateLimitTimeout) as e:
+                logger.error(f"Serper News API Fehler: {e}")
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'cost': 0.00
+                }
+        
+        return self._cached_request('news', payload, _request)
+
+    def search_many(self, queries, workflow_type=None, auftrag_status=None, endpoint='search'):
+        """
+        Mehrere Suchen in EINEM Serper-Request (Batch-Payload als Array)
+
+        Spart Verbindungsaufbau und Round-Trips, wenn ein Research mehrere
+        Suchen braucht. Cache-Treffer werden nicht mitgeschickt, doppelte
+        Queries nur einmal. Suchen, die gerade in einem anderen Aufruf laufen
+        (search() oder search_many()), werden über Single-Flight geteilt.
+
+        SICHERHEITSCHECK: Nur für AKTIVE Aufträge erlaubt!
+
+        Args:
+            queries: Liste von Suchbegriffen
+            endpoint: 'search' (organisch) oder 'news'
+
+        Returns:
+            Liste von Ergebnis-dicts wie bei search() - gleiche Reihenfolge wie queries
+        """
+        # KRITISCHER SICHERHEITSCHECK
+        if workflow_type != 'AKTIV' or auftrag_status != 'AKTIV':
+            raise Exception(
+                "FEHLER: Serper API ist NUR für AKTIVE Aufträge erlaubt! "
+                f"Workflow: {workflow_type}, Status: {auftrag_status}"
             )
-            response.raise_for_status()
-            
-            return {
+
+        payloads = [{'q': query, 'gl': 'de', 'hl': 'de'} for query in queries]
+        if endpoint == 'search':
+            for payload in payloads:
+                payload['num'] = 10
+
+        cache = get_serper_cache(endpoint)
+        keys = [serper_cache_key(endpoint, payload) for payload in payloads]
+        payload_by_key = {}
+        for key, payload in zip(keys, payloads):
+            payload_by_key.setdefault(key, payload)
+
+        def _cached(key):
+            cached = cache.get(key) if cache is not None else None
+            return None if cached is None else {**cached, 'cached': True, 'cost': 0.00}
+
+        def _batch(own_keys):
+            # Erst hier prüfen: ein gerade beendeter Einzelaufruf kann den Cache gefüllt haben
+            results = {key: _cached(key) for key in own_keys}
+            missing = [key for key in own_keys if results[key] is None]
+            if missing:
+                results.update(self._batch_request(endpoint, [payload_by_key[key] for key in missing], missing))
+            else:
+                logger.info(f"Serper Batch ({endpoint}): alle {len(own_keys)} Suchen aus dem Cache")
+            return results
+
+        # Suchen, die gerade als Einzel- oder Batch-Aufruf laufen, werden geteilt statt doppelt bezahlt
+        results = _serper_requests.do_many(keys, _batch)
+        return [copy.deepcopy(results[key]) if keys.count(key) > 1 else results[key] for key in keys]
+
+    def _batch_request(self, endpoint, payloads, keys) -> dict:
+        """
+        Ein Serper-Request mit mehreren Suchen - Ergebnisse pro Cache-Schlüssel
+
+        Nur erfolgreiche Antworten werden gespeichert; bei einem Fehler
+        erhält jede Suche das Fehler-Ergebnis.
+        """
+        logger.info(f"Serper Batch-Aufruf ({endpoint}) für AKTIVEN Auftrag: {len(payloads)} Suchen")
+        cache = get_serper_cache(endpoint)
+
+        try:
+            with get_rate_limiter('serper').slot() as slot:
+                response = self.transport.post(f'/{endpoint}', json=payloads, timeout=30)
+                slot.record_status(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+                response.raise_for_status()
+
+            data = response.json()
+            if not isinstance(data, list) or len(data) != len(payloads):
+                raise ValueError(f"Unerwartete Batch-Antwort: {len(payloads)} Suchen, Antwort {type(data).__name__}")
+
+        except (requests.exceptions.RequestException, RateLimitTimeout, ValueError) as e:
+            logger.error(f"Serper Batch API Fehler ({endpoint}): {e}")
+            return {key: {'success': False, 'error': str(e), 'cost': 0.00} for key in keys}
+
+        results = {}
+        for key, payload, item in zip(keys, payloads, data):
+            result = {
                 'success': True,
-                'data': response.json(),
-                'cost': 0.01
-            }
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Serper News API Fehler: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'cost': 0.00
+                'data': item,
+                'cost': 0.01,  # Serper berechnet pro Suche, auch im Batch
+                'query': payload['q']
             }
+            if cache is not None:
+                cache.set(key, result)
+            results[key] = result
+
+        logger.info(f"Serper Batch erfolgreich ({endpoint}): {len(payloads)} Suchen in einem Request")
+        return results
+
+    def _cached_request(self, endpoint, payload, request):
+        """
+        Führt einen Serper-Aufruf mit Cache und Single-Flight aus
+
+        Reihenfolge: Cache-Treffer -> laufender gleicher Aufruf -> neuer API Aufruf.
+        Nur erfolgreiche Antworten werden gespeichert.
+        """
+        key = serper_cache_key(endpoint, payload)
+        cache = get_serper_cache(endpoint)
+
+        def _run():
+            if cache is None:
+                return request()
+
+            cached = cache.get(key)
+            if cached is not None:
+                logger.info(f"Serper Cache-Treffer ({endpoint}): {payload['q']} - kein API Aufruf")
+                return {**cached, 'cached': True, 'cost': 0.00}
+
+            result = request()
+            if result['success']:
+                cache.set(key, result)
+            return result
+
+        # Gleiche Suche läuft bereits? Dann Ergebnis teilen statt erneut bezahlen
+        return _serper_requests.do(key, _run)
@@ -0,0 +1,162 @@
+"""
+Snippet Selector - relevante Research-Snippets für ein Token-Budget
+
+Statt alle Serper-Treffer in den Prompt zu kippen (großer Prompt, langsamer
+und teurer) werden die organischen und News-Snippets eines Research mit
+BM25 gegen Titel, Briefing und Keywords gerankt. Die besten Snippets kommen
+in den Prompt, bis das Token-Budget der Qualitätsstufe erreicht ist.
+
+Beispiel:
+    context = SnippetSelector().select_context(research, query=f"{title} {briefing}", quality='gold')
+    generator.generate(title, briefing, keywords, research_context=context, ...)
+"""
+import math
+from collections import Counter
+from urllib.parse import urlsplit
+from django.conf import settings
+from .keyword_extractor import tokenize
+from .token_counter import count_tokens
+
+DEFAULT_RESEARCH_CONTEXT_SETTINGS = {
+    'TOKENS': {'bronze': 300, 'silber': 600, 'gold': 900},   # Budget pro Qualitätsstufe
+    'MAX_SNIPPETS': 8,
+    'BM25_K1': 1.5,
+    'BM25_B': 0.75,
+}
+
+
+def get_research_context_settings() -> dict:
+    """
+    Einstellungen für den Research-Kontext (settings.RESEARCH_CONTEXT mit Defaults)
+    """
+    config = dict(DEFAULT_RESEARCH_CONTEXT_SETTINGS)
+    config.update(getattr(settings, 'RESEARCH_CONTEXT', {}) or {})
+    return config
+
+
+def research_snippets(research_data: dict) -> list:
+    """
+    Snippets eines Research (_conduct_research) als einheitliche dicts
+
+    Returns:
+        Liste von dicts mit title, text, link, source ('organic' | 'news')
+    """
+    snippets = []
+    for source in ('organic', 'news'):
+        for item in (research_data or {}).get(source, []):
+            text = (item.get('snippet') or '').strip()
+            title = (item.get('title') or '').strip()
+            if text or title:
+                snippets.append({'title': title, 'text': text, 'link': item.get('link', ''), 'source': source})
+    return snippets
+
+
+class BM25Index:
+    """
+    Okapi BM25 über eine feste Menge von Dokumenten (Token-Listen)
+    """
+
+    def __init__(self, documents, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.frequencies = [Counter(tokens) for tokens in documents]
+        self.lengths = [len(tokens) for tokens in documents]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+        document_frequency = Counter()
+        for counts in self.frequencies:
+            document_frequency.update(counts.keys())
+        total = len(self.frequencies)
+        self.idf = {
+            term: math.log(1 + (total - count + 0.5) / (count + 0.5))
+            for term, count in document_frequency.items()
+        }
+
+    def scores(self, query_tokens) -> list:
+        """
+        BM25-Score jedes Dokuments für die Query (gleiche Reihenfolge wie documents)
+        """
+        terms = [term for term in set(query_tokens) if term in self.idf]
+        results = []
+        for counts, length in zip(self.frequencies, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            results.append(score)
+        return results
+
+
+class SnippetSelector:
+    """
+    Wählt die relevantesten Research-Snippets innerhalb eines Token-Budgets
+    """
+
+    def __init__(self, config: dict = None):
+        self.config = config or get_research_context_settings()
+
+    def select(self, research_data: dict, query: str, token_budget: int, model: str = '') -> list:
+        """
+        Relevanteste Snippets, deren Summe ins Token-Budget passt
+
+        Snippets ohne Bezug zur Query (Score 0) werden nie gewählt. Passt ein
+        Snippet nicht mehr ins Budget, wird das nächstkleinere versucht.
+
+        Returns:
+            Liste von Snippet-dicts (plus 'score'), beste zuerst
+        """
+        snippets = research_snippets(research_data)
+        if not snippets or token_budget <= 0:
+            return []
+
+        index = BM25Index(
+            [tokenize(f"{snippet['title']} {snippet['text']}") for snippet in snippets],
+            k1=self.config['BM25_K1'],
+            b=self.config['BM25_B']
+        )
+        ranked = sorted(
+            zip(snippets, index.scores(tokenize(query))),
+            key=lambda item: -item[1]
+        )
+
+        selected = []
+        used = 0
+        for snippet, score in ranked:
+            if score <= 0 or len(selected) >= self.config['MAX_SNIPPETS']:
+                break
+            tokens = count_tokens(self.format_snippet(snippet), model)
+            if used + tokens > token_budget:
+                continue
+            selected.append({**snippet, 'score': round(score, 3)})
+            used += tokens
+        return selected
+
+    def select_context(self, research_data: dict, query: str, quality: str = 'bronze',
+                       token_budget: int = None, model: str = '') -> str:
+        """
+        Research-Kontext als Prompt-Text (leer ohne passende Snippets)
+
+        Args:
+            token_budget: Überschreibt das Budget der Qualitätsstufe
+        """
+        if token_budget is None:
+            token_budget = self.token_budget(quality)
+        return self.format_context(self.select(research_data, query, token_budget, model))
+
+    def token_budget(self, quality: str) -> int:
+        """Token-Budget der Qualitätsstufe (0 = kein Research-Kontext)"""
+        return self.config['TOKENS'].get(quality, 0)
+
+    def format_context(self, snippets: list) -> str:
+        """Gewählte Snippets als Prompt-Text"""
+        return '\n'.join(self.format_snippet(snippet) for snippet in snippets)
+
+    @staticmethod
+    def format_snippet(snippet: dict) -> str:
+        host = urlsplit(snippet.get('link') or '').netloc
+        if host.startswith('www.'):
+            host = host[4:]
+        text = f"- {snippet['title']}: {snippet['text']}" if snippet['text'] else f"- {snippet['title']}"
+        return f"{text} ({host})" if host else text
@@ -0,0 +1,179 @@
+"""
+Stream Guard - verbotene Phrasen schon während des Streamings erkennen
+
+Statt eine Antwort komplett abzuwarten und dann zu verwerfen (z.B. ein
+Bewerbungstext statt eines Briefings), wird der Stream beim ersten Treffer
+abgebrochen und sofort mit verschärftem Prompt neu gestartet.
+
+Beispiel:
+    result = generate_guarded(
+        OpusService(), prompt,
+        forbidden=['hi there', 'best regards'],
+        retry_prompt=prompt + "\\n\\nKEINE BEWERBUNG!"
+    )
+
+generate_abortable bricht einen Stream von außen ab (z.B. eine spekulative
+Anfrage, deren Ergebnis nicht mehr gebraucht wird).
+"""
+import logging
+import re
+from apps.kachel2_analyse.services.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class StreamGuard:
+    """
+    Prüft gestreamten Text fortlaufend auf verbotene Phrasen
+
+    Phrasen werden ohne Groß-/Kleinschreibung gesucht - auch wenn sie
+    über zwei Text-Stücke verteilt ankommen.
+    """
+
+    def __init__(self, phrases):
+        phrases = [phrase.lower() for phrase in phrases if phrase]
+        self._pattern = re.compile('|'.join(re.escape(phrase) for phrase in phrases)) if phrases else None
+        # Soviel Text vom Ende behalten, dass eine geteilte Phrase noch gefunden wird
+        self._overlap = max((len(phrase) for phrase in phrases), default=1) - 1
+        self._tail = ''
+        self.violation = None
+
+    def feed(self, delta: str):
+        """
+        Nimmt das nächste Text-Stück entgegen
+
+        Returns:
+            Die gefundene Phrase oder None
+        """
+        if self._pattern is None or self.violation:
+            return self.violation
+
+        window = self._tail + delta.lower()
+        match = self._pattern.search(window)
+        if match:
+            self.violation = match.group(0)
+        self._tail = window[-self._overlap:] if self._overlap else ''
+        return self.violation
+
+
+def generate_guarded(service, prompt: str, forbidden, retry_prompt: str = None,
+                     max_attempts: int = 2, **kwargs) -> dict:
+    """
+    Streamt eine Antwort und bricht bei verbotenen Phrasen sofort ab
+
+    Der letzte Versuch läuft ungeprüft durch - sein Ergebnis wird wie bisher
+    übernommen (kein endloses Wiederholen).
+
+    Args:
+        service: OpenRouter-Service mit stream_content
+        prompt: Prompt des ersten Versuchs
+        forbidden: Phrasen, die zum Abbruch führen
+        retry_prompt: Prompt für weitere Versuche (Default: prompt)
+        max_attempts: Anzahl Versuche insgesamt
+        **kwargs: Weitere Argumente für stream_content (max_tokens, deadline, prompt_prefix, ...)
+
+    Returns:
+        dict mit success, content, cost, attempts, aborted (Anzahl Abbrüche)
+    """
+    cost = 0.0
+    aborted = 0
+    current_prompt = prompt
+
+    for attempt in range(1, max_attempts + 1):
+        guard = StreamGuard(forbidden) if attempt < max_attempts else StreamGuard(())
+        parts = []
+        stream = service.stream_content(current_prompt, **kwargs)
+
+        try:
+            for event in stream:
+                if event['type'] == 'delta':
+                    parts.append(event['content'])
+                    if guard.feed(event['content']):
+                        break
+                elif event['type'] == 'done':
+                    return {
+                        'success': True,
+                        'content': event['content'],
+                        'cost': round(cost + event['cost'], 4),
+                        'attempts': attempt,
+                        'aborted': aborted
+                    }
+                else:
+                    return {
+                        'success': False,
+                        'error': event['error'],
+                        'cost': round(cost + event.get('cost', 0.0), 4),
+                        'attempts': attempt,
+                        'aborted': aborted
+                    }
+            else:
+                return {
+                    'success': False,
+                    'error': 'Stream ohne Ergebnis beendet',
+                    'cost': round(cost, 4),
+                    'attempts': attempt,
+                    'aborted': aborted
+                }
+        finally:
+            # Schließt die Verbindung - der Provider bricht die Generierung ab
+            stream.close()
+
+        aborted += 1
+        partial = ''.join(parts)
+        cost += _partial_cost(service, (kwargs.get('prompt_prefix') or '') + current_prompt, partial)
+        logger.warning(
+            f"{service.service_name} Stream abgebrochen nach {len(partial)} Zeichen - "
+            f"verbotene Phrase '{guard.violation}' (Versuch {attempt}/{max_attempts})"
+        )
+        current_prompt = retry_prompt or prompt
+
+    # Nur erreichbar ohne Versuche (max_attempts < 1)
+    return {'success': False, 'error': 'Keine Versuche', 'cost': round(cost, 4), 'attempts': 0, 'aborted': aborted}
+
+
+def generate_abortable(service, prompt: str, abort, **kwargs) -> dict:
+    """
+    Streamt eine Antwort, die über abort (threading.Event) abgebrochen werden kann
+
+    abort wird bei jedem Event geprüft - bis zum ersten Token wartet der
+    Aufruf auf den Provider. Nach einem Abbruch werden Prompt und bis dahin
+    erzeugte Tokens trotzdem berechnet ('cost' ist eine Schätzung).
+
+    Args:
+        service: OpenRouter-Service mit stream_content
+        prompt: Prompt
+        abort: Event - gesetzt bricht den Stream ab
+        **kwargs: Weitere Argumente für stream_content (max_tokens, prompt_prefix, ...)
+
+    Returns:
+        dict mit success, content, cost, aborted (True wenn abgebrochen)
+    """
+    parts = []
+    stream = service.stream_content(prompt, **kwargs)
+
+    try:
+        for event in stream:
+            if abort.is_set():
+                break
+            if event['type'] == 'delta':
+                parts.append(event['content'])
+            elif event['type'] == 'done':
+                return {'success': True, 'content': event['content'], 'cost': event['cost'], 'aborted': False}
+            else:
+                return {'success': False, 'error': event['error'], 'cost': event.get('cost', 0.0), 'aborted': False}
+        else:
+            return {'success': False, 'error': 'Stream ohne Ergebnis beendet', 'cost': 0.0, 'aborted': False}
+    finally:
+        stream.close()
+
+    partial = ''.join(parts)
+    cost = _partial_cost(service, (kwargs.get('prompt_prefix') or '') + prompt, partial)
+    logger.info(f"{service.service_name} Stream auf Anforderung abgebrochen nach {len(partial)} Zeichen")
+    return {'success': False, 'error': 'Abgebrochen', 'cost': round(cost, 4), 'aborted': True}
+
+
+def _partial_cost(service, prompt_text: str, partial: str) -> float:
+    """Geschätzte Kosten eines abgebrochenen Streams - Prompt plus bis dahin erzeugter Text"""
+    return service._calculate_cost(
+        count_tokens(prompt_text, service.model) + count_tokens(partial, service.model)
+    )
@@ -0,0 +1,227 @@
+"""
+Token Counter - Token-Zählung und Budgets für Prompts und Antworten
+
+Ist tiktoken installiert (optional), wird damit gezählt und pro
+Modell-Familie skaliert. Ohne tiktoken: Heuristik über Wortstücke
+(deutsche Komposita ergeben mehrere Tokens, Satzzeichen je ein Token).
+Beides sind Näherungen - die Tokenizer von Anthropic/Google sind nicht öffentlich.
+
+Genutzt für:
+- max_tokens passend zur gewünschten Wortanzahl
+- Prompt-Budget vor dem Senden prüfen bzw. kürzen
+- Kosten-Schätzung
+- Prompt-Caching nur für Prefixe über der Mindestgröße des Providers
+"""
+import logging
+import math
+import re
+from functools import lru_cache
+from django.conf import settings
+
+try:
+    import tiktoken
+except ImportError:  # Optional - ohne tiktoken greift die Heuristik
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Pro Modell-Präfix (längster Treffer gewinnt)
+# CHARS_PER_TOKEN: Zeichen pro Token innerhalb eines Wortes (Heuristik)
+# TIKTOKEN_FACTOR: Umrechnung cl100k-Tokens -> Modell-Tokens
+# TOKENS_PER_WORD: Tokens pro ausgegebenem (deutschen) Wort
+# MIN_CACHE_TOKENS: kürzere Prefixe cacht der Provider nicht (cache_control wirkungslos)
+MODEL_PROFILES = {
+    'default': {
+        'CHARS_PER_TOKEN': 3.5,
+        'TIKTOKEN_FACTOR': 1.0,
+        'TOKENS_PER_WORD': 1.6,
+        'CONTEXT_WINDOW': 32000,
+        'MAX_OUTPUT_TOKENS': 4096,
+        'MIN_CACHE_TOKENS': 1024,
+    },
+    'anthropic/': {
+        'CHARS_PER_TOKEN': 3.2,
+        'TIKTOKEN_FACTOR': 1.15,
+        'TOKENS_PER_WORD': 1.8,
+        'CONTEXT_WINDOW': 200000,
+        'MAX_OUTPUT_TOKENS': 8192,
+        'MIN_CACHE_TOKENS': 1024,
+    },
+    'anthropic/claude-opus-4.1': {
+        'CHARS_PER_TOKEN': 3.2,
+        'TIKTOKEN_FACTOR': 1.15,
+        'TOKENS_PER_WORD': 1.8,
+        'CONTEXT_WINDOW': 200000,
+        'MAX_OUTPUT_TOKENS': 32000,
+        'MIN_CACHE_TOKENS': 1024,
+    },
+    'anthropic/claude-3-haiku': {
+        'CHARS_PER_TOKEN': 3.2,
+        'TIKTOKEN_FACTOR': 1.15,
+        'TOKENS_PER_WORD': 1.8,
+        'CONTEXT_WINDOW': 200000,
+        'MAX_OUTPUT_TOKENS': 4096,
+        'MIN_CACHE_TOKENS': 2048,
+    },
+    'anthropic/claude-3.5-haiku': {
+        'CHARS_PER_TOKEN': 3.2,
+        'TIKTOKEN_FACTOR': 1.15,
+        'TOKENS_PER_WORD': 1.8,
+        'CONTEXT_WINDOW': 200000,
+        'MAX_OUTPUT_TOKENS': 8192,
+        'MIN_CACHE_TOKENS': 2048,
+    },
+    'google/gemini': {
+        'CHARS_PER_TOKEN': 3.8,
+        'TIKTOKEN_FACTOR': 0.95,
+        'TOKENS_PER_WORD': 1.5,
+        'CONTEXT_WINDOW': 1000000,
+        'MAX_OUTPUT_TOKENS': 65536,
+        'MIN_CACHE_TOKENS': 1024,
+    },
+    'meta-llama/': {
+        'CHARS_PER_TOKEN': 3.4,
+        'TIKTOKEN_FACTOR': 1.05,
+        'TOKENS_PER_WORD': 1.7,
+        'CONTEXT_WINDOW': 128000,
+        'MAX_OUTPUT_TOKENS': 4096,
+        'MIN_CACHE_TOKENS': 1024,
+    },
+}
+
+DEFAULT_TOKEN_BUDGET = {
+    'MAX_PROMPT_TOKENS': 12000,   # Obergrenze für Script-Prompts
+    'OUTPUT_HEADROOM': 0.2,       # Zuschlag auf die Wortanzahl (Überschriften, Struktur)
+    'MIN_OUTPUT_TOKENS': 256,
+}
+
+_WORD_PIECES = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+
+
+class PromptBudgetExceeded(ValueError):
+    """Prompt (plus angefragte Ausgabe) passt nicht ins Token-Budget"""
+
+
+def get_token_budget() -> dict:
+    """
+    Budget-Einstellungen (settings.TOKEN_BUDGET mit Defaults)
+    """
+    config = dict(DEFAULT_TOKEN_BUDGET)
+    config.update(getattr(settings, 'TOKEN_BUDGET', {}) or {})
+    return config
+
+
+@lru_cache(maxsize=64)
+def get_model_profile(model: str) -> dict:
+    """
+    Profil des Modells - längster passender Präfix aus MODEL_PROFILES
+    """
+    matches = [prefix for prefix in MODEL_PROFILES if prefix != 'default' and (model or '').startswith(prefix)]
+    if not matches:
+        return MODEL_PROFILES['default']
+    return MODEL_PROFILES[max(matches, key=len)]
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:  # z.B. Encoding-Datei nicht ladbar (offline)
+        logger.warning(f"tiktoken nicht nutzbar - verwende Heuristik: {e}")
+        return None
+
+
+@lru_cache(maxsize=1024)
+def count_tokens(text: str, model: str = '') -> int:
+    """
+    Geschätzte Token-Anzahl eines Textes für ein Modell (gecacht)
+    """
+    return _count_tokens(text, model)
+
+
+def _count_tokens(text: str, model: str) -> int:
+    if not text:
+        return 0
+
+    profile = get_model_profile(model)
+    encoding = _get_encoding()
+    if encoding is not None:
+        return math.ceil(len(encoding.encode(text)) * profile['TIKTOKEN_FACTOR'])
+
+    chars_per_token = profile['CHARS_PER_TOKEN']
+    return sum(
+        max(1, math.ceil(len(piece) / chars_per_token))
+        for piece in _WORD_PIECES.findall(text)
+    )
+
+
+def tokens_for_words(word_count: int, model: str = '') -> int:
+    """
+    Tokens, die ein Text mit word_count Wörtern voraussichtlich braucht
+    """
+    return math.ceil(max(0, word_count) * get_model_profile(model)['TOKENS_PER_WORD'])
+
+
+def output_token_budget(word_count: int, model: str = '') -> int:
+    """
+    max_tokens für eine Antwort mit word_count Wörtern
+
+    Mit Zuschlag für Überschriften und Struktur, begrenzt auf das
+    Ausgabe-Limit des Modells.
+    """
+    budget = get_token_budget()
+    tokens = math.ceil(tokens_for_words(word_count, model) * (1 + budget['OUTPUT_HEADROOM']))
+    tokens = max(budget['MIN_OUTPUT_TOKENS'], tokens)
+    return min(tokens, get_model_profile(model)['MAX_OUTPUT_TOKENS'])
+
+
+def trim_to_tokens(text: str, max_tokens: int, model: str = '') -> str:
+    """
+    Kürzt einen Text auf höchstens max_tokens (an Wortgrenzen, Anfang bleibt erhalten)
+    """
+    if max_tokens <= 0:
+        return ''
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    # Binäre Suche über die Wortgrenzen (ungecacht - Zwischenstände nicht im LRU)
+    boundaries = [match.end() for match in re.finditer(r'\S+', text)]
+    low, high = 0, len(boundaries)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _count_tokens(text[:boundaries[middle - 1]], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+
+    return text[:boundaries[low - 1]] if low else ''
+
+
+def is_cacheable_prefix(prefix: str, model: str = '') -> bool:
+    """
+    True wenn der Prefix die Mindestgröße für Prompt-Caching des Modells erreicht
+    """
+    return count_tokens(prefix, model) >= get_model_profile(model)['MIN_CACHE_TOKENS']
+
+
+def check_context_window(prompt: str, model: str, max_tokens: int) -> int:
+    """
+    Prüft, ob Prompt + angefragte Ausgabe ins Kontextfenster passen
+
+    Returns:
+        Token-Anzahl des Prompts
+
+    Raises:
+        PromptBudgetExceeded
+    """
+    prompt_tokens = count_tokens(prompt, model)
+    context_window = get_model_profile(model)['CONTEXT_WINDOW']
+
+    if prompt_tokens + max_tokens > context_window:
+        raise PromptBudgetExceeded(
+            f"Prompt zu groß für {model}: {prompt_tokens} + {max_tokens} Tokens "
+            f"> Kontextfenster {context_window}"
+        )
+    return prompt_tokens
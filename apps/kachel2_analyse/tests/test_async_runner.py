@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from apps.kachel2_analyse.services.async_runner import gather_bounded, run_blocking
+from apps.kachel2_analyse.services.script_generator_service import OpusScriptGenerator
+
+
+class GatherBoundedTest(SimpleTestCase):
+
+    def test_keeps_input_order_and_limits_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def _job(index):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (5 - index))
+            running -= 1
+            return index
+
+        results = asyncio.run(gather_bounded((_job(i) for i in range(5)), max_concurrency=2))
+
+        self.assertEqual(results, [0, 1, 2, 3, 4])
+        self.assertEqual(peak, 2)
+
+
+class RunBlockingTest(SimpleTestCase):
+
+    def test_runs_in_worker_thread_with_arguments(self):
+        def _work(a, b=0):
+            return a + b, threading.current_thread().name
+
+        value, thread_name = asyncio.run(run_blocking(_work, 2, b=3))
+
+        self.assertEqual(value, 5)
+        self.assertTrue(thread_name.startswith('llm-async'))
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class AsyncGenerationTest(SimpleTestCase):
+
+    def setUp(self):
+        self.generator = OpusScriptGenerator()
+
+    def test_agenerate_many_returns_results_in_job_order(self):
+        def _generate(title, **kwargs):
+            return {'success': True, 'script': title, 'cost': 0.0}
+
+        jobs = [{'title': 'A'}, {'title': 'B', 'quality': 'gold'}]
+        with mock.patch.object(self.generator, 'generate', side_effect=_generate) as generate:
+            results = asyncio.run(self.generator.agenerate_many(jobs, max_concurrency=1))
+
+        self.assertEqual([result['script'] for result in results], ['A', 'B'])
+        self.assertEqual(generate.call_count, 2)
+
+    def test_acomplete_many_uses_quality_service(self):
+        service = self.generator.quality_services['gold']
+        ok = {'success': True, 'content': 'x', 'cost': 0.0}
+        with mock.patch.object(service, 'generate_content', return_value=ok) as generate_content:
+            results = asyncio.run(self.generator.acomplete_many(['p1', 'p2'], quality='gold', max_tokens=10))
+
+        self.assertEqual(results, [ok, ok])
+        self.assertEqual(
+            sorted(call.kwargs['prompt'] for call in generate_content.call_args_list), ['p1', 'p2']
+        )
@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase
+from apps.kachel2_analyse.workflows_offen.category_detector import (
+    GENERAL_CATEGORY, CategoryDetector, KeywordAutomaton
+)
+
+
+class KeywordAutomatonTest(SimpleTestCase):
+
+    def test_matches_whole_words_only(self):
+        automaton = KeywordAutomaton(['ai', 'war', 'cold war'])
+
+        self.assertEqual(list(automaton.find_all('maintain the warranty')), [])
+        self.assertEqual(sorted(automaton.find_all('ai and the cold war')), ['ai', 'cold war', 'war'])
+
+    def test_counts_repeated_keywords(self):
+        automaton = KeywordAutomaton(['game'])
+        self.assertEqual(list(automaton.find_all('game, game. game')), ['game'] * 3)
+
+
+class CategoryDetectorTest(SimpleTestCase):
+
+    def setUp(self):
+        self.detector = CategoryDetector()
+
+    def test_detects_category_with_confidence(self):
+        result = self.detector.detect_category(
+            'We need a YouTube script about World War 2: the battle of Stalingrad and its military history.'
+        )
+
+        self.assertEqual(result.category, 'history')
+        self.assertGreaterEqual(result.confidence, 80)
+        self.assertIn('world war', result.keywords_found)
+
+    def test_no_keywords_is_general(self):
+        result = self.detector.detect_category('Bitte schreiben Sie etwas.')
+
+        self.assertEqual(result.category, GENERAL_CATEGORY)
+        self.assertEqual(result.confidence, 0)
+        self.assertEqual(result.to_dict()['scores'], {})
+
+    def test_single_weak_hit_has_low_confidence(self):
+        result = self.detector.detect_category('A video about a case.')
+
+        self.assertEqual(result.category, 'true_crime')
+        self.assertLess(result.confidence, 50)
+
+    def test_phrase_counts_double(self):
+        detector = CategoryDetector({'a': ['stock market'], 'b': ['stock', 'market']})
+        result = detector.detect_category('stock market')
+
+        self.assertEqual(result.scores, {'a': 2.0, 'b': 2.0})
+
+    def test_detect_many_keeps_order(self):
+        results = self.detector.detect_many(['minecraft gameplay lore', 'passive income investing'])
+        self.assertEqual([result.category for result in results], ['gaming', 'finance'])
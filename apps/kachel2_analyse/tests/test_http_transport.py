@@ -0,0 +1,66 @@
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from apps.kachel2_analyse.services import http_transport
+from apps.kachel2_analyse.services.http_transport import (
+    HttpTransport, close_transports, get_openrouter_transport, get_transport
+)
+from apps.kachel2_analyse.services.openrouter.gemini_service import GeminiService
+from apps.kachel2_analyse.services.openrouter.opus_service import OpusService
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class GetTransportTest(SimpleTestCase):
+
+    def setUp(self):
+        close_transports()
+        self.addCleanup(close_transports)
+
+    def test_same_name_returns_same_transport(self):
+        first = get_transport('test', 'https://example.com/')
+
+        self.assertIs(get_transport('test', 'https://other.example.com'), first)
+        self.assertEqual(first.base_url, 'https://example.com')
+
+    def test_services_share_the_openrouter_transport(self):
+        self.assertIs(GeminiService().transport, OpusService().transport)
+        self.assertEqual(
+            get_openrouter_transport().session.headers['Authorization'], 'Bearer test-key'
+        )
+
+    @override_settings(OPENROUTER_API_KEY='')
+    def test_missing_api_key_raises(self):
+        with self.assertRaises(ValueError):
+            get_openrouter_transport()
+
+    @override_settings(HTTP_TRANSPORT={'POOL_MAXSIZE': 3, 'CONNECT_TIMEOUT': 1.5})
+    def test_pool_settings_come_from_settings(self):
+        transport = get_transport('test', 'https://example.com')
+
+        self.assertEqual(transport.session.get_adapter('https://example.com')._pool_maxsize, 3)
+        self.assertEqual(transport.connect_timeout, 1.5)
+
+    def test_close_transports_resets_registry(self):
+        first = get_transport('test', 'https://example.com')
+        close_transports()
+
+        self.assertIsNot(get_transport('test', 'https://example.com'), first)
+
+
+class HttpTransportTest(SimpleTestCase):
+
+    def test_post_joins_path_and_splits_timeouts(self):
+        transport = HttpTransport('https://example.com/', connect_timeout=2.0)
+        self.addCleanup(transport.close)
+
+        with mock.patch.object(transport.session, 'post') as post:
+            transport.post('/chat', json={'a': 1}, timeout=30)
+
+        post.assert_called_once_with('https://example.com/chat', json={'a': 1}, timeout=(2.0, 30))
+
+    def test_warmup_reports_failure_without_raising(self):
+        transport = HttpTransport('https://example.com')
+        self.addCleanup(transport.close)
+
+        error = http_transport.requests.exceptions.ConnectionError('down')
+        with mock.patch.object(transport.session, 'head', side_effect=error):
+            self.assertFalse(transport.warmup())
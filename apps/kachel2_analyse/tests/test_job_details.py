@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+from apps.kachel2_analyse.workflows_offen.job_details import (
+    NOT_SPECIFIED, extract_job_details, extract_job_details_many
+)
+
+
+class ExtractJobDetailsTest(SimpleTestCase):
+
+    def test_hourly_label_marks_range_as_hourly(self):
+        details = extract_job_details("Hourly: $20.00-$40.00\n10-30 hrs/week\n3 to 6 months")
+
+        self.assertEqual(details['budget_type'], 'hourly')
+        self.assertEqual((details['budget_min'], details['budget_max']), (20.0, 40.0))
+        self.assertEqual((details['hours_min'], details['hours_max']), (10, 30))
+        self.assertEqual((details['duration_min'], details['duration_max']), (3, 6))
+        self.assertEqual(details['duration_unit'], 'months')
+
+    def test_hourly_suffix_marks_range_as_hourly(self):
+        details = extract_job_details("Pay: $20-$40/hr")
+        self.assertEqual(details['budget_type'], 'hourly')
+
+    def test_unlabeled_range_is_fixed(self):
+        details = extract_job_details("Budget range $1,500 to $3,000")
+
+        self.assertEqual(details['budget_type'], 'fixed')
+        self.assertEqual((details['budget_min'], details['budget_max']), (1500.0, 3000.0))
+
+    def test_labeled_single_amounts_are_fixed(self):
+        for text in ("Budget $500", "Fixed-price\n$250", "Est. budget: $1,200"):
+            with self.subTest(text=text):
+                details = extract_job_details(text)
+                self.assertEqual(details['budget_type'], 'fixed')
+                self.assertEqual(details['budget_min'], details['budget_max'])
+                self.assertIsNotNone(details['budget_min'])
+
+    def test_labeled_single_hourly_amount(self):
+        details = extract_job_details("Hourly rate: $35")
+
+        self.assertEqual(details['budget'], '$35/Stunde')
+        self.assertEqual(details['budget_type'], 'hourly')
+
+    def test_bare_amount_is_not_a_budget(self):
+        self.assertEqual(extract_job_details("Prize pool of $500 for viewers")['budget'], NOT_SPECIFIED)
+
+    def test_less_than_hours_is_an_upper_bound(self):
+        details = extract_job_details("Less than 30 hrs/week")
+
+        self.assertIsNone(details['hours_min'])
+        self.assertEqual(details['hours_max'], 30)
+
+    def test_more_than_hours_is_open(self):
+        details = extract_job_details("More than 30 hrs/week")
+
+        self.assertEqual(details['hours_min'], 30)
+        self.assertIsNone(details['hours_max'])
+
+    def test_empty_text(self):
+        details = extract_job_details(None)
+
+        self.assertEqual(details['budget'], NOT_SPECIFIED)
+        self.assertIsNone(details['budget_type'])
+
+    def test_many_keeps_order(self):
+        results = extract_job_details_many(["Budget $500", "2 weeks"])
+        self.assertEqual([results[0]['budget_min'], results[1]['duration_unit']], [500.0, 'weeks'])
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+from django.test import TestCase, override_settings
+from apps.kachel1_auftragsverwaltung.models import Auftrag
+from apps.kachel2_analyse.models import Arbeitsprobe
+from apps.kachel2_analyse.workflows_offen.job_ingestion import (
+    IngestionCheckpoint, JobIngestionService, job_key
+)
+
+
+class FakeAnalyzer:
+    """Liefert sofort eine Arbeitsprobe - merkt sich die verarbeiteten Texte"""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.texts = []
+        self._lock = threading.Lock()
+
+    def create_arbeitsprobe(self, upwork_text, word_count=500, quality='bronze'):
+        with self._lock:
+            self.texts.append(upwork_text)
+        if upwork_text in self.fail_on:
+            return {'success': False, 'error': 'Modell nicht erreichbar', 'cost': 0.0}
+        return {'success': True, 'content': 'Script', 'generated_title': 'Titel', 'cost': 0.01}
+
+
+class JobKeyTest(TestCase):
+
+    def test_short_ids_are_namespaced(self):
+        self.assertEqual(job_key({'id': '12345', 'text': 'x'}), 'UP-12345')
+
+    def test_long_or_unusual_ids_are_hashed(self):
+        long_key = job_key({'id': '~0123456789abcdef0123', 'text': 'x'})
+        self.assertTrue(long_key.startswith('UP-'))
+        self.assertLessEqual(len(long_key), 20)
+        self.assertEqual(long_key, job_key({'id': '~0123456789abcdef0123', 'text': 'y'}))
+        self.assertNotEqual(job_key({'id': 'a b', 'text': 'x'}), 'UP-a b')
+
+    def test_missing_id_hashes_text(self):
+        self.assertEqual(job_key({'text': 'Job A'}), job_key({'id': None, 'text': 'Job A'}))
+        self.assertNotEqual(job_key({'text': 'Job A'}), job_key({'text': 'Job B'}))
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class JobIngestionServiceTest(TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        self.checkpoint_path = f"{self.path}.checkpoint.json"
+        self.addCleanup(self._remove, self.path, self.checkpoint_path)
+
+    @staticmethod
+    def _remove(*paths):
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _write_jobs(self, jobs):
+        with open(self.path, 'w', encoding='utf-8') as handle:
+            for job in jobs:
+                handle.write(json.dumps(job) + '\n')
+
+    def _service(self, analyzer, **kwargs):
+        kwargs.setdefault('workers', 2)
+        kwargs.setdefault('prioritize', False)
+        return JobIngestionService(analyzer=analyzer, **kwargs)
+
+    def test_creates_auftrag_and_arbeitsprobe_per_job(self):
+        self._write_jobs([{'id': '1', 'text': 'Job eins'}, {'id': '2', 'text': 'Job zwei'}])
+
+        stats = self._service(FakeAnalyzer()).ingest(self.path)
+
+        self.assertEqual(stats['created'], 2)
+        self.assertEqual(set(Auftrag.objects.values_list('id', flat=True)), {'UP-1', 'UP-2'})
+        self.assertEqual(Arbeitsprobe.objects.count(), 2)
+        self.assertEqual(IngestionCheckpoint(self.checkpoint_path).done, {'UP-1', 'UP-2'})
+
+    def test_never_attaches_to_existing_active_auftrag(self):
+        Auftrag.objects.create(id='UP-1', titel='Kunde', beschreibung='Kundenauftrag', status='AKTIV')
+        self._write_jobs([{'id': '1', 'text': 'Job eins'}])
+        analyzer = FakeAnalyzer()
+
+        stats = self._service(analyzer).ingest(self.path)
+
+        self.assertEqual(analyzer.texts, [])
+        self.assertEqual(stats['skipped'], 1)
+        self.assertFalse(Arbeitsprobe.objects.exists())
+        self.assertIn('AKTIV', IngestionCheckpoint(self.checkpoint_path).failed['UP-1'])
+
+    def test_resumes_from_checkpoint_and_records_failures(self):
+        self._write_jobs([{'id': '1', 'text': 'Job eins'}, {'id': '2', 'text': 'Job zwei'}])
+        self._service(FakeAnalyzer(fail_on={'Job zwei'})).ingest(self.path)
+
+        analyzer = FakeAnalyzer()
+        stats = self._service(analyzer).ingest(self.path)
+        self.assertEqual(analyzer.texts, [])
+        self.assertEqual(stats['skipped'], 2)
+
+        stats = self._service(analyzer).ingest(self.path, retry_failed=True)
+        self.assertEqual(analyzer.texts, ['Job zwei'])
+        self.assertEqual(stats['created'], 1)
+
+    def test_batches_inserts_and_advances_checkpoint_only_after_flush(self):
+        self._write_jobs([{'id': str(index), 'text': f'Job {index}'} for index in range(5)])
+        saves = []
+        original_save = IngestionCheckpoint.save
+
+        def _save(checkpoint):
+            saves.append((len(checkpoint.done), Arbeitsprobe.objects.count()))
+            original_save(checkpoint)
+
+        with self.settings(JOB_INGESTION={}):
+            service = self._service(FakeAnalyzer())
+        with mock.patch.object(IngestionCheckpoint, 'save', _save):
+            service.ingest(self.path)
+
+        self.assertGreater(service.batch_size, 1)
+        self.assertEqual(saves, [(5, 5)])
+
+    def test_prefetches_foreign_status_per_chunk(self):
+        self._write_jobs([{'id': str(index), 'text': f'Job {index}'} for index in range(6)])
+
+        with mock.patch.object(JobIngestionService, '_foreign_status', return_value={}) as foreign_status:
+            self._service(FakeAnalyzer(), batch_size=3).ingest(self.path)
+
+        # Blöcke von workers * 2 = 4 Jobs, danach folgen die Prüfungen beim Speichern
+        chunks = [list(call.args[0]) for call in foreign_status.call_args_list]
+        self.assertEqual([len(keys) for keys in chunks[:2]], [4, 2])
+
+    def test_prioritizes_within_bounded_window(self):
+        cheap = 'Write a short text. Budget $5'
+        valuable = ('Experienced writer for an ongoing weekly YouTube series about World War 2 history, '
+                    'battles and military strategy. Fixed-price $5,000')
+        self._write_jobs([
+            {'id': '1', 'text': cheap}, {'id': '2', 'text': valuable},
+            {'id': '3', 'text': cheap + '!'}, {'id': '4', 'text': valuable + '!'},
+        ])
+        analyzer = FakeAnalyzer()
+
+        self._service(analyzer, workers=1, prioritize=True, priority_window=2).ingest(self.path)
+
+        # Sortiert je Fenster aus zwei Jobs - kein vollständiges Einlesen
+        self.assertEqual(analyzer.texts, [valuable, cheap, valuable + '!', cheap + '!'])
+
@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase
+from apps.kachel2_analyse.workflows_offen.job_details import extract_job_details
+from apps.kachel2_analyse.workflows_offen.job_scorer import (
+    DEFAULT_SCORING_SETTINGS, WEEKS_PER_MONTH, JobScorer
+)
+
+JOB_TEXT = (
+    "We are looking for an experienced scriptwriter for our YouTube channel about the history "
+    "of World War 2. Ongoing work, weekly videos about battles and military strategy.\n"
+)
+
+
+class JobScorerTest(SimpleTestCase):
+
+    def setUp(self):
+        self.scorer = JobScorer(dict(DEFAULT_SCORING_SETTINGS))
+
+    def test_hourly_value_is_rate_times_hours_times_duration(self):
+        details = extract_job_details("Hourly: $20.00-$40.00\n10-30 hrs/week\n3 to 6 months")
+
+        expected = 30 * 20 * 4.5 * WEEKS_PER_MONTH
+        self.assertAlmostEqual(self.scorer.expected_value(details), expected)
+
+        job_score = self.scorer.score(JOB_TEXT + "Hourly: $20.00-$40.00\n10-30 hrs/week\n3 to 6 months")
+        self.assertEqual(job_score.features['value'], 1.0)
+        self.assertNotEqual(job_score.quality, 'bronze')
+
+    def test_less_than_hours_uses_half_the_upper_bound(self):
+        details = extract_job_details("$30/hr, Less than 30 hrs/week, 2 weeks")
+        self.assertEqual(self.scorer.expected_value(details), 30 * 15 * 2)
+
+    def test_fixed_budget_is_taken_as_is(self):
+        self.assertEqual(self.scorer.expected_value(extract_job_details("Budget $500")), 500)
+        self.assertIsNone(self.scorer.expected_value(extract_job_details("no budget given")))
+
+    def test_missing_budget_ranks_below_real_low_budget(self):
+        without_budget = self.scorer.score(JOB_TEXT)
+        low_budget = self.scorer.score(JOB_TEXT + "Budget $50")
+
+        self.assertIsNone(without_budget.expected_value)
+        self.assertLess(without_budget.score, low_budget.score)
+
+    def test_negative_signals_lower_the_score(self):
+        self.assertLess(
+            self.scorer.score(JOB_TEXT + "Budget $500. Unpaid test script first.").score,
+            self.scorer.score(JOB_TEXT + "Budget $500.").score
+        )
+
+    def test_quality_and_review_follow_thresholds(self):
+        high = self.scorer.score(JOB_TEXT + "Fixed-price $5,000")
+
+        self.assertEqual(high.quality, 'gold')
+        self.assertTrue(high.review)
+        self.assertEqual(self.scorer.score("Write something. Budget $5").quality, 'bronze')
+
+    def test_rank_orders_by_score_and_keeps_ties_stable(self):
+        jobs = [{'id': 1, 'text': 'cheap'}, {'id': 2, 'text': JOB_TEXT + "Budget $2,000"}, {'id': 3, 'text': 'cheap'}]
+        ranked = self.scorer.rank(jobs, text=lambda job: job['text'])
+
+        self.assertEqual([job['id'] for job, _ in ranked], [2, 1, 3])
@@ -0,0 +1,76 @@
+from django.test import SimpleTestCase
+from apps.kachel2_analyse.services.keyword_extractor import (
+    KeywordExtractor, job_documents, research_documents, tokenize,
+)
+
+
+class TokenizeTest(SimpleTestCase):
+
+    def test_drops_stopwords_and_keeps_hyphenated_words(self):
+        self.assertEqual(tokenize('Wir wollen KI-Agenten für den Mittelstand'), ['ki-agenten', 'mittelstand'])
+
+
+class KeywordExtractorTest(SimpleTestCase):
+
+    def setUp(self):
+        self.extractor = KeywordExtractor()
+
+    def test_modal_verbs_are_not_keywords(self):
+        keywords = self.extractor.extract(['Wir wollen ein Video über KI-Agenten. Wir möchten, dass man es haben darf.'])
+        terms = [term for term, _ in keywords]
+
+        self.assertIn('ki-agenten', terms)
+        for modal in ('wollen', 'möchten', 'haben', 'darf'):
+            self.assertNotIn(modal, terms)
+
+    def test_frequent_and_weighted_terms_rank_first(self):
+        documents = [('Mittelstand setzt auf KI-Agenten', 2), 'KI-Agenten sparen Zeit', 'Zeit ist knapp']
+        keywords = self.extractor.extract(documents, top_n=3)
+
+        self.assertEqual(keywords[0][0], 'ki-agenten')
+
+    def test_phrases_need_two_occurrences_and_hide_their_parts(self):
+        keywords = dict(self.extractor.extract(['Digitale Zwillinge im Werk', 'Digitale Zwillinge sparen Geld']))
+
+        self.assertIn('digitale zwillinge', keywords)
+        self.assertNotIn('digitale', keywords)
+        self.assertNotIn('zwillinge sparen geld', keywords)
+
+    def test_idf_is_computed_over_documents_of_a_group(self):
+        # Beide Begriffe zweimal - "2026" steht aber in mehr Snippets
+        documents = ['Quantencomputer im Labor, Quantencomputer', 'Markt 2026', 'Studie 2026']
+        keywords = [term for term, _ in self.extractor.extract(documents, top_n=2)]
+
+        self.assertEqual(keywords, ['quantencomputer', '2026'])
+
+    def test_extract_many_downweights_terms_shared_by_all_groups(self):
+        groups = [['Quantencomputer News 2026'], ['Solarstrom News 2026']]
+        first, second = self.extractor.extract_many(groups, top_n=3)
+
+        self.assertEqual(first[0][0], 'quantencomputer')
+        self.assertEqual(second[0][0], 'solarstrom')
+
+    def test_ties_are_resolved_alphabetically(self):
+        keywords = self.extractor.extract(['Zebra, Apfel, Mango'])
+
+        self.assertEqual([term for term, _ in keywords], ['apfel', 'mango', 'zebra'])
+
+
+class ResearchDocumentsTest(SimpleTestCase):
+
+    def test_titles_and_briefing_are_weighted(self):
+        research = {'organic': [{'title': 'T1', 'snippet': 'S1'}, {'title': 'T2', 'snippet': ''}], 'news': [{'title': 'N1'}]}
+
+        self.assertEqual(
+            research_documents(research, briefing='Briefing', limit=2),
+            [('T1', 2), ('S1', 1), ('T2', 2), ('N1', 1), ('Briefing', 2)],
+        )
+
+
+class JobDocumentsTest(SimpleTestCase):
+
+    def test_splits_sentences_and_lines(self):
+        self.assertEqual(
+            job_documents('Finance channel wanted. Scripts weekly!\nBudget: $50\n\n'),
+            ['Finance channel wanted.', 'Scripts weekly!', 'Budget: $50'],
+        )
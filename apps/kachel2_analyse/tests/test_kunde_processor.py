@@ -0,0 +1,135 @@
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
+from apps.kachel2_analyse.services.http_transport import close_transports
+from apps.kachel2_analyse.workflows_aktiv.kunde_processor import (
+    KundeProcessor, canonical_url, merge_search_results
+)
+
+
+class CanonicalUrlTest(SimpleTestCase):
+
+    def test_ignores_www_scheme_fragment_tracking_and_trailing_slash(self):
+        self.assertEqual(
+            canonical_url('http://WWW.Example.com/ki/?utm_source=x&b=2&a=1&gclid=y#top'),
+            'https://example.com/ki?a=1&b=2'
+        )
+
+    def test_empty_url_stays_empty(self):
+        self.assertEqual(canonical_url(''), '')
+
+
+class MergeSearchResultsTest(SimpleTestCase):
+
+    def test_deduplicates_and_ranks_multi_hits_first(self):
+        merged = merge_search_results([
+            ('title', [{'link': 'https://a.de/x', 'title': 'A'}, {'link': 'https://b.de', 'title': 'B'}]),
+            ('title_year', [{'link': 'http://www.b.de/?utm_medium=y', 'title': 'B2'}]),
+        ])
+
+        self.assertEqual([entry['title'] for entry in merged], ['B', 'A'])
+        self.assertEqual(merged[0]['found_by'], ['title', 'title_year'])
+        self.assertEqual(merged[0]['best_position'], 0)
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', SERPER_API_KEY='test-key')
+class ConductResearchTest(TestCase):
+    """Suchvarianten gleichzeitig, Ergebnisse zusammengeführt"""
+
+    def setUp(self):
+        close_transports()
+        self.addCleanup(close_transports)
+        self.processor = KundeProcessor()
+
+    def _batch(self, endpoint, queries):
+        if endpoint == 'news':
+            return [{'success': False, 'error': 'HTTP 500', 'cost': 0.0}]
+        return [
+            {'success': True, 'data': {'organic': [{'link': 'https://a.de', 'title': query}]}, 'cost': 0.001}
+            for query in queries
+        ]
+
+    def test_variants_are_merged_and_failures_reported(self):
+        with mock.patch.object(self.processor, '_research_batch', side_effect=self._batch) as batch:
+            research = self.processor._conduct_research('KI im Alltag')
+
+        self.assertEqual(sorted(call.args[0] for call in batch.call_args_list), ['news', 'search'])
+        self.assertEqual(len(research['organic']), 1)
+        self.assertEqual(research['organic'][0]['found_by'], ['title', 'title_year'])
+        self.assertEqual(research['news'], [])
+        self.assertEqual([query['success'] for query in research['queries']], [True, True, False])
+        self.assertEqual(research['cost'], 0.002)
+
+        # Beide Suchen liefen im selben Request - gleiche Batch-Latenz
+        latencies = [query['batch_latency'] for query in research['queries']]
+        self.assertEqual(latencies[0], latencies[1])
+        self.assertTrue(all(isinstance(latency, float) for latency in latencies))
+
+    def test_failing_endpoint_keeps_other_results(self):
+        def _batch(endpoint, queries):
+            if endpoint == 'news':
+                raise RuntimeError('news kaputt')
+            return self._batch(endpoint, queries)
+
+        with mock.patch.object(self.processor, '_research_batch', side_effect=_batch):
+            research = self.processor._conduct_research('KI im Alltag')
+
+        self.assertEqual(len(research['organic']), 1)
+        self.assertEqual(research['queries'][-1]['success'], False)
+
+    def test_all_failed_returns_empty(self):
+        failed = lambda endpoint, queries: [{'success': False, 'error': 'x', 'cost': 0.0} for _ in queries]
+        with mock.patch.object(self.processor, '_research_batch', side_effect=failed):
+            self.assertEqual(self.processor._conduct_research('KI im Alltag'), {})
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', SERPER_API_KEY='test-key')
+class ResearchBatchTest(TestCase):
+    """Mehrere Suchen eines Endpoints als ein Serper-Request"""
+
+    def setUp(self):
+        close_transports()
+        self.addCleanup(close_transports)
+        self.processor = KundeProcessor()
+
+    def test_several_queries_use_search_many(self):
+        ok = [{'success': True, 'data': {}, 'cost': 0.001}] * 2
+        with mock.patch.object(self.processor.serper, 'search_many', return_value=ok) as search_many:
+            self.assertEqual(self.processor._research_batch('search', ['KI', 'KI 2026']), ok)
+
+        search_many.assert_called_once_with(
+            ['KI', 'KI 2026'], workflow_type='AKTIV', auftrag_status='AKTIV', endpoint='search'
+        )
+
+    def test_single_news_query_uses_get_news(self):
+        ok = {'success': True, 'data': {}, 'cost': 0.001}
+        with mock.patch.object(self.processor.serper, 'get_news', return_value=ok) as get_news:
+            self.assertEqual(self.processor._research_batch('news', ['KI']), [ok])
+
+        get_news.assert_called_once_with(query='KI', workflow_type='AKTIV', auftrag_status='AKTIV')
+
+    def test_exception_becomes_one_error_per_query(self):
+        with mock.patch.object(self.processor.serper, 'search_many', side_effect=ValueError('kaputt')):
+            results = self.processor._research_batch('search', ['KI', 'KI 2026'])
+
+        self.assertEqual([result['error'] for result in results], ['kaputt', 'kaputt'])
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', SERPER_API_KEY='test-key')
+class SelectResearchContextTest(TestCase):
+    """Research-Kontext für den Script-Prompt"""
+
+    def setUp(self):
+        close_transports()
+        self.addCleanup(close_transports)
+        self.processor = KundeProcessor()
+
+    def test_logs_number_of_selected_snippets(self):
+        research = {'organic': [
+            {'title': 'KI-Agenten', 'snippet': 'Zeile eins\nZeile zwei\nZeile drei', 'link': 'https://a.de'},
+        ]}
+
+        with self.assertLogs('apps.kachel2_analyse.workflows_aktiv.kunde_processor', 'INFO') as logs:
+            context = self.processor._select_research_context(research, 'KI-Agenten', 'Briefing', 'gold')
+
+        self.assertEqual(len(context.splitlines()), 3)
+        self.assertIn('1 Snippets', logs.output[-1])
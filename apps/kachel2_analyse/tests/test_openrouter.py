@@ -0,0 +1,119 @@
+import json
+from unittest import mock
+from django.test import TestCase, override_settings
+from apps.kachel2_analyse.services.openrouter.gemini_service import GeminiService
+from apps.kachel2_analyse.services.openrouter.openrouter_service import OpenRouterService
+from apps.kachel2_analyse.services.token_counter import is_cacheable_prefix
+from core.rate_limiter import get_rate_limiter
+
+
+class FakeStreamResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, events):
+        self._lines = [f"data: {json.dumps(event)}" for event in events] + ['data: [DONE]']
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self._lines)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class OpenRouterServiceTest(TestCase):
+
+    def test_empty_choices_is_reported_as_format_error(self):
+        service = OpenRouterService()
+        with mock.patch.object(service, '_post_chat', return_value={'choices': []}):
+            result = service.generate_content('Prompt')
+
+        self.assertFalse(result['success'])
+        self.assertIn('Unerwartetes Response Format', result['error'])
+        self.assertEqual(result['cost'], 0.00)
+
+    def test_cached_result_is_not_shared_with_callers(self):
+        service = OpenRouterService()
+        response = {'choices': [{'message': {'content': 'Hallo'}}], 'usage': {'total_tokens': 5}}
+        with mock.patch.object(service, '_post_chat', return_value=response) as post:
+            first = service.generate_content('Cache-Isolation Prompt', use_cache=True)
+            first['research_data'] = {'organic': []}
+            first['content'] = 'Geändert'
+            second = service.generate_content('Cache-Isolation Prompt', use_cache=True)
+
+        post.assert_called_once()
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['content'], 'Hallo')
+        self.assertNotIn('research_data', second)
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class StreamContentTest(TestCase):
+
+    def test_done_event_reports_payload_model(self):
+        service = GeminiService()
+        build_payload = service._build_payload
+
+        def _payload(*args, **kwargs):
+            payload = build_payload(*args, **kwargs)
+            payload['model'] = 'test/override-model'
+            return payload
+
+        response = FakeStreamResponse([
+            {'choices': [{'delta': {'content': 'Hallo '}}]},
+            {'choices': [{'delta': {'content': 'Welt'}}], 'usage': {'total_tokens': 12}},
+        ])
+        with mock.patch.object(service, '_build_payload', side_effect=_payload), \
+                mock.patch.object(service.transport, 'post', return_value=response):
+            events = list(service.stream_content('Prompt', max_tokens=50))
+
+        done = events[-1]
+        self.assertEqual(done['type'], 'done')
+        self.assertEqual(done['content'], 'Hallo Welt')
+        self.assertEqual(done['tokens_used'], 12)
+        self.assertEqual(done['model'], 'test/override-model')
+
+    def test_rate_limit_slot_is_released_before_stream_body(self):
+        service = GeminiService()
+        response = FakeStreamResponse([
+            {'choices': [{'delta': {'content': 'Hallo'}}]},
+        ])
+        limiter = get_rate_limiter(service.model)
+        with mock.patch.object(service.transport, 'post', return_value=response):
+            stream = service.stream_content('Prompt', max_tokens=50)
+            first = next(stream)
+            in_flight = limiter.get_state()['in_flight_local']
+            list(stream)
+
+        self.assertEqual(first['type'], 'delta')
+        self.assertEqual(in_flight, 0)
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', PROMPT_CACHE={'ENABLED': True})
+class PromptCachePayloadTest(TestCase):
+    """cache_control nur für Prefixe ab der Mindestgröße des Providers"""
+
+    def setUp(self):
+        self.service = GeminiService()
+
+    def test_short_prefix_is_sent_as_plain_text(self):
+        payload = self.service._build_payload('Job-Text', 100, 0.5, prompt_prefix='Kurze Anweisung. ')
+
+        self.assertEqual(payload['messages'][0]['content'], 'Kurze Anweisung. Job-Text')
+
+    def test_long_prefix_gets_cache_control(self):
+        prefix = 'Stilregel für jedes Script. ' * 150
+        payload = self.service._build_payload('Job-Text', 100, 0.5, prompt_prefix=prefix)
+
+        blocks = payload['messages'][0]['content']
+        self.assertEqual(blocks[0]['cache_control'], {'type': 'ephemeral'})
+        self.assertEqual(blocks[1]['text'], 'Job-Text')
+
+    def test_haiku_needs_larger_prefix(self):
+        prefix = 'Stilregel für jedes Script. ' * 150
+        self.assertTrue(is_cacheable_prefix(prefix, 'anthropic/claude-3.5-sonnet'))
+        self.assertFalse(is_cacheable_prefix(prefix, 'anthropic/claude-3.5-haiku'))
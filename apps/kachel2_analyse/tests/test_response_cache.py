@@ -0,0 +1,129 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from apps.kachel2_analyse.models import ApiCacheEntry
+from apps.kachel2_analyse.services import response_cache
+from apps.kachel2_analyse.services.response_cache import MemoryLRUCache, ResponseCache, make_cache_key
+
+
+class MakeCacheKeyTest(TestCase):
+
+    def test_key_is_stable_and_order_independent_for_dicts(self):
+        self.assertEqual(make_cache_key('a', {'x': 1, 'y': 2}), make_cache_key('a', {'y': 2, 'x': 1}))
+        self.assertNotEqual(make_cache_key('a', 1), make_cache_key('a', 2))
+        self.assertEqual(len(make_cache_key('a')), 64)
+
+
+class MemoryLRUCacheTest(TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryLRUCache(max_entries=2)
+        cache.set('a', 1, 60)
+        cache.set('b', 2, 60)
+        cache.get('a')
+        cache.set('c', 3, 60)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_expired_entries_are_dropped(self):
+        cache = MemoryLRUCache()
+        cache.set('a', 1, 60)
+        with mock.patch.object(response_cache.time, 'monotonic', return_value=time.monotonic() + 61):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+
+    def test_callers_cannot_mutate_cached_values(self):
+        cache = MemoryLRUCache(max_entries=2)
+        value = {'content': 'Script', 'usage': {'total_tokens': 10}}
+        cache.set('k', value, ttl_seconds=60)
+        value['research_data'] = {'organic': []}
+
+        hit = cache.get('k')
+        hit['usage']['total_tokens'] = 0
+
+        self.assertEqual(cache.get('k'), {'content': 'Script', 'usage': {'total_tokens': 10}})
+
+
+class ResponseCacheTest(TestCase):
+
+    def test_db_tier_survives_new_process_cache(self):
+        ResponseCache('test', ttl_seconds=60).set('k', {'content': 'x'})
+
+        fresh = ResponseCache('test', ttl_seconds=60)
+        self.assertEqual(fresh.get('k'), {'content': 'x'})
+        self.assertEqual(ApiCacheEntry.objects.get(namespace='test', key='k').hit_count, 1)
+
+    def test_expired_db_entries_are_ignored_and_purged(self):
+        ResponseCache('test', ttl_seconds=60, memory_max_entries=0).set('k', {'content': 'x'})
+        ApiCacheEntry.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        cache = ResponseCache('test', ttl_seconds=60, memory_max_entries=0)
+        self.assertIsNone(cache.get('k'))
+        self.assertEqual(cache.purge_expired(), 1)
+
+    def test_overflow_is_checked_only_every_interval(self):
+        cache = ResponseCache('test', ttl_seconds=60, memory_max_entries=0, db_max_entries=2, db_evict_interval=3)
+
+        with mock.patch.object(cache, '_evict_overflow', wraps=cache._evict_overflow) as evict:
+            for index in range(5):
+                cache.set(f'k{index}', index)
+            self.assertEqual(evict.call_count, 1)
+
+        # Nach der 3. Schreiboperation auf 2 gekürzt, danach 2 neue
+        self.assertEqual(ApiCacheEntry.objects.filter(namespace='test').count(), 4)
+        self.assertFalse(ApiCacheEntry.objects.filter(key='k0').exists())
+
+    def test_db_disabled_uses_memory_only(self):
+        cache = ResponseCache('test', ttl_seconds=60, db_enabled=False)
+        cache.set('k', 1)
+
+        self.assertEqual(cache.get('k'), 1)
+        self.assertFalse(ApiCacheEntry.objects.exists())
+
+
+class ReleaseThreadConnectionTest(TestCase):
+
+    def _run_in_thread(self, name):
+        worker = threading.Thread(target=response_cache.release_thread_connection, name=name)
+        worker.start()
+        worker.join()
+
+    def test_closes_old_connections_only_in_pool_threads(self):
+        with mock.patch.object(response_cache, 'close_old_connections') as close:
+            with mock.patch.object(response_cache, 'connection') as connection:
+                connection.in_atomic_block = False
+                response_cache.release_thread_connection()
+                self.assertEqual(close.call_count, 0)
+
+                self._run_in_thread('task-graph_0')
+                self.assertEqual(close.call_count, 1)
+
+    def test_keeps_connection_of_request_threads(self):
+        with mock.patch.object(response_cache, 'close_old_connections') as close:
+            with mock.patch.object(response_cache, 'connection') as connection:
+                connection.in_atomic_block = False
+                self._run_in_thread('Thread-3 (process_request_thread)')
+                self._run_in_thread('ThreadPoolExecutor-0_0')
+        close.assert_not_called()
+
+    def test_keeps_connection_inside_transaction(self):
+        with mock.patch.object(response_cache, 'close_old_connections') as close:
+            with mock.patch.object(response_cache, 'connection') as connection:
+                connection.in_atomic_block = True
+                self._run_in_thread('script-section_0')
+        close.assert_not_called()
+
+    def test_prefixes_match_executor_threads(self):
+        from apps.kachel2_analyse.services.async_runner import get_executor
+        from apps.kachel2_analyse.services.script_generator_service import _get_section_pool
+        from core.task_graph import _graph_executor
+
+        for pool in (get_executor(), _get_section_pool(), _graph_executor):
+            name = pool.submit(lambda: threading.current_thread().name).result()
+            self.assertTrue(name.startswith(response_cache.POOL_THREAD_PREFIXES), name)
@@ -0,0 +1,132 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from apps.kachel2_analyse.services.script_generator_service import OpusScriptGenerator
+from core.resilience import Deadline
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class FallbackChainTest(TestCase):
+    """Fallback-Kette pro Qualitätsstufe"""
+
+    def setUp(self):
+        self.generator = OpusScriptGenerator()
+        self.chain = self.generator._service_chain('gold')
+
+    def test_primary_gets_full_workflow_deadline(self):
+        deadline = Deadline(180)
+        ok = {'success': True, 'content': 'Script', 'cost': 0.1}
+        with mock.patch.object(self.chain[0], 'generate_content', return_value=ok) as primary:
+            result, service = self.generator._complete_with_fallback(self.chain, 'Prompt', 500, deadline=deadline)
+
+        self.assertIs(service, self.chain[0])
+        # Kein Abbruch beim Latenz-SLO - lange Opus-Scripts laufen zu Ende
+        self.assertIs(primary.call_args.kwargs['deadline'], deadline)
+
+    def test_falls_back_and_joins_errors(self):
+        failed = {'success': False, 'error': 'Timeout', 'cost': 0.0}
+        ok = {'success': True, 'content': 'Script', 'cost': 0.05}
+        with mock.patch.object(self.chain[0], 'generate_content', return_value=failed), \
+                mock.patch.object(self.chain[1], 'generate_content', return_value=ok):
+            result, service = self.generator._complete_with_fallback(self.chain, 'Prompt', 500)
+
+        self.assertIs(service, self.chain[1])
+        self.assertTrue(result['success'])
+
+        with mock.patch.object(self.chain[0], 'generate_content', return_value=failed), \
+                mock.patch.object(self.chain[1], 'generate_content', return_value=failed):
+            result, service = self.generator._complete_with_fallback(self.chain, 'Prompt', 500)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'].count('Timeout'), 2)
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', LONG_SCRIPT={'SMOOTH_TRANSITIONS': False})
+class LongScriptTest(TestCase):
+    """Gliederung -> Abschnitte parallel -> Zusammenfügen"""
+
+    OUTLINE = '[{"titel": "Einstieg", "woerter": 100}, {"titel": "Fazit", "woerter": 300}]'
+
+    def setUp(self):
+        self.generator = OpusScriptGenerator()
+
+    def _complete(self, outline):
+        def _fake(chain, prompt, word_count, temperature=0.7, deadline=None, prompt_prefix=None):
+            content = outline if 'Gliederung' in prompt else f'Text mit {word_count} Wörtern'
+            return {'success': True, 'content': content, 'cost': 0.01, 'tokens_used': 10,
+                    'model': chain[0].model}, chain[0]
+        return _fake
+
+    def test_parse_outline_scales_words_to_target(self):
+        sections = self.generator._parse_outline(f'Gliederung:\n{self.OUTLINE}', 2000)
+
+        self.assertEqual([section['title'] for section in sections], ['Einstieg', 'Fazit'])
+        self.assertEqual([section['words'] for section in sections], [500, 1500])
+
+    def test_parse_outline_rejects_unusable_content(self):
+        self.assertEqual(self.generator._parse_outline('kein JSON', 2000), [])
+        self.assertEqual(self.generator._parse_outline('[{"titel": "Nur einer"}]', 2000), [])
+
+    def test_sections_are_joined_under_headings(self):
+        with mock.patch.object(self.generator, '_complete_with_fallback', side_effect=self._complete(self.OUTLINE)):
+            result = self.generator.generate_long('KI im Alltag', word_count=2000)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['mode'], 'long')
+        self.assertEqual(result['content'], '## Einstieg\n\nText mit 500 Wörtern\n\n## Fazit\n\nText mit 1500 Wörtern')
+        self.assertAlmostEqual(result['cost'], 0.03)
+
+    def test_unusable_outline_falls_back_to_single_call(self):
+        single = {'success': True, 'script': 'Script', 'cost': 0.1}
+        with mock.patch.object(self.generator, '_complete_with_fallback', side_effect=self._complete('kein JSON')), \
+                mock.patch.object(self.generator, 'generate', return_value=single) as generate:
+            result = self.generator.generate_long('KI im Alltag', word_count=2000)
+
+        generate.assert_called_once()
+        self.assertAlmostEqual(result['cost'], 0.11)
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', PROMPT_CACHE={'ENABLED': True},
+                   LONG_SCRIPT={'SMOOTH_TRANSITIONS': False})
+class PromptCacheScopeTest(TestCase):
+    """cache_control nur für die Abschnitts-Prefixe von generate_long"""
+
+    BRIEFING = 'Das Video erklärt KI-Agenten im Mittelstand mit Beispielen aus Handwerk und Handel. ' * 80
+
+    def setUp(self):
+        self.generator = OpusScriptGenerator()
+        self.service = self.generator._service_chain('gold')[0]
+        self.payloads = []
+
+    def _post_chat(self, payload, timeout, deadline=None):
+        self.payloads.append(payload)
+        content = payload['messages'][0]['content']
+        text = content if isinstance(content, str) else ''.join(block['text'] for block in content)
+        answer = LongScriptTest.OUTLINE if 'Erstelle die Gliederung' in text else 'Abschnittstext'
+        return {'choices': [{'message': {'content': answer}}], 'usage': {'total_tokens': 10}}
+
+    @staticmethod
+    def _cached_prefix(payload):
+        content = payload['messages'][0]['content']
+        if isinstance(content, str):
+            return None
+        return next(block['text'] for block in content if 'cache_control' in block)
+
+    def test_generate_long_sends_shared_section_prefix_with_cache_control(self):
+        with mock.patch.object(self.service, '_post_chat', side_effect=self._post_chat):
+            result = self.generator.generate_long('KI im Alltag', description=self.BRIEFING, word_count=2000)
+
+        self.assertTrue(result['success'])
+        outline, *sections = self.payloads
+        self.assertIsNone(self._cached_prefix(outline))
+        prefixes = {self._cached_prefix(payload) for payload in sections}
+        self.assertEqual(len(sections), 2)
+        self.assertEqual(len(prefixes), 1)
+        self.assertIn('KI-Agenten im Mittelstand', prefixes.pop())
+
+    def test_generate_sends_short_instruction_prefix_as_plain_text(self):
+        # Der Anweisungs-Prefix liegt unter MIN_CACHE_TOKENS - cache_control wäre wirkungslos
+        with mock.patch.object(self.service, '_post_chat', side_effect=self._post_chat):
+            result = self.generator.generate('KI im Alltag', description=self.BRIEFING, quality='gold')
+
+        self.assertTrue(result['success'])
+        self.assertIsNone(self._cached_prefix(self.payloads[0]))
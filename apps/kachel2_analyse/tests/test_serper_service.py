@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest import mock
+from django.test import TestCase, override_settings
+from apps.kachel2_analyse.services import serper_cache, serper_service
+from apps.kachel2_analyse.services.http_transport import close_transports
+from apps.kachel2_analyse.services.serper_service import SerperService
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+def _organic(query):
+    return {'organic': [{'title': f'Treffer zu {query}', 'link': 'https://example.com'}]}
+
+
+@override_settings(SERPER_API_KEY='test-key', SERPER_CACHE={'DB_ENABLED': False})
+class SerperServiceTest(TestCase):
+
+    def setUp(self):
+        close_transports()
+        serper_cache._caches.clear()
+        self.addCleanup(serper_cache._caches.clear)
+        self.addCleanup(close_transports)
+        self.service = SerperService()
+
+    def test_only_active_orders_may_search(self):
+        with self.assertRaises(Exception):
+            self.service.search('KI', workflow_type='OFFEN', auftrag_status='OFFEN')
+        with self.assertRaises(Exception):
+            self.service.search_many(['KI'], workflow_type='AKTIV', auftrag_status='OFFEN')
+
+    def test_search_uses_pooled_transport_and_cache(self):
+        self.assertEqual(self.service.transport.session.headers['X-API-KEY'], 'test-key')
+
+        with mock.patch.object(self.service.transport, 'post', return_value=FakeResponse(_organic('ki'))) as post:
+            first = self.service.search('KI im Mittelstand', 'AKTIV', 'AKTIV')
+            second = self.service.search('ki im  mittelstand ', 'AKTIV', 'AKTIV')
+
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(post.call_args.args[0], '/search')
+        self.assertTrue(first['success'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['cost'], 0.00)
+
+    def test_search_many_sends_only_uncached_unique_queries(self):
+        with mock.patch.object(self.service.transport, 'post', return_value=FakeResponse(_organic('a'))):
+            self.service.search('Alpha', 'AKTIV', 'AKTIV')
+
+        batch = FakeResponse([_organic('beta')])
+        with mock.patch.object(self.service.transport, 'post', return_value=batch) as post:
+            results = self.service.search_many(['Alpha', 'Beta', 'beta'], 'AKTIV', 'AKTIV')
+
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual([payload['q'] for payload in post.call_args.kwargs['json']], ['Beta'])
+        self.assertTrue(results[0]['cached'])
+        self.assertEqual(results[1]['data'], results[2]['data'])
+        self.assertIsNot(results[1], results[2])
+
+    def test_batch_shares_a_running_single_search(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def _post(path, json=None, timeout=None):
+            calls.append((path, json))
+            if isinstance(json, dict):
+                started.set()
+                release.wait(1)
+                return FakeResponse(_organic(json['q']))
+            return FakeResponse([_organic(payload['q']) for payload in json])
+
+        with mock.patch.object(self.service.transport, 'post', side_effect=_post):
+            single = threading.Thread(target=self.service.search, args=('Alpha', 'AKTIV', 'AKTIV'))
+            single.start()
+            started.wait(1)
+
+            batch_results = []
+            batch = threading.Thread(
+                target=lambda: batch_results.extend(self.service.search_many(['Alpha', 'Beta'], 'AKTIV', 'AKTIV'))
+            )
+            batch.start()
+            deadline = time.monotonic() + 1
+            while serper_service._serper_requests.in_flight() < 2 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            release.set()
+            single.join(1)
+            batch.join(1)
+
+        # Alpha wurde nur einmal bezahlt - der Batch enthielt nur Beta
+        self.assertEqual(len(calls), 2)
+        self.assertEqual([payload['q'] for payload in calls[1][1]], ['Beta'])
+        self.assertTrue(all(result['success'] for result in batch_results))
+
+    def test_batch_error_is_reported_per_query(self):
+        failing = FakeResponse({'message': 'kein Array'})
+        with mock.patch.object(self.service.transport, 'post', return_value=failing):
+            results = self.service.search_many(['Alpha', 'Beta'], 'AKTIV', 'AKTIV')
+
+        self.assertEqual([result['success'] for result in results], [False, False])
+        self.assertIn('Unerwartete Batch-Antwort', results[0]['error'])
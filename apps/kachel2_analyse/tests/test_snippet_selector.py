@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase, override_settings
+from apps.kachel2_analyse.services.script_generator_service import OpusScriptGenerator
+from apps.kachel2_analyse.services.snippet_selector import (
+    DEFAULT_RESEARCH_CONTEXT_SETTINGS, BM25Index, SnippetSelector, research_snippets
+)
+from apps.kachel2_analyse.services.token_counter import count_tokens
+
+RESEARCH = {
+    'organic': [
+        {'title': 'Wetter morgen', 'snippet': 'Regen im Norden', 'link': 'https://wetter.de/x'},
+        {'title': 'KI-Agenten im Mittelstand', 'snippet': 'Wie KI-Agenten Prozesse automatisieren',
+         'link': 'https://www.heise.de/ki'},
+        {'title': 'Mittelstand digital', 'snippet': 'Förderprogramme', 'link': ''},
+    ],
+    'news': [{'title': 'Neue KI-Agenten vorgestellt', 'snippet': '', 'link': 'https://news.de/1'}],
+}
+
+
+class BM25IndexTest(SimpleTestCase):
+
+    def test_rarer_matching_terms_score_higher(self):
+        index = BM25Index([['ki', 'agenten'], ['ki', 'wetter'], ['ki', 'sport']])
+        scores = index.scores(['ki', 'agenten'])
+
+        self.assertGreater(scores[0], scores[1])
+        self.assertEqual(scores[1], scores[2])
+        self.assertEqual(index.scores(['unbekannt']), [0.0, 0.0, 0.0])
+
+
+class SnippetSelectorTest(SimpleTestCase):
+
+    def setUp(self):
+        self.selector = SnippetSelector(dict(DEFAULT_RESEARCH_CONTEXT_SETTINGS))
+
+    def test_research_snippets_cover_organic_and_news(self):
+        self.assertEqual([s['source'] for s in research_snippets(RESEARCH)], ['organic'] * 3 + ['news'])
+
+    def test_selects_relevant_snippets_best_first(self):
+        selected = self.selector.select(RESEARCH, 'KI-Agenten Mittelstand', token_budget=500)
+
+        self.assertEqual(selected[0]['title'], 'KI-Agenten im Mittelstand')
+        self.assertNotIn('Wetter morgen', [snippet['title'] for snippet in selected])
+
+    def test_budget_skips_large_snippets_for_smaller_ones(self):
+        best = self.selector.format_snippet(research_snippets(RESEARCH)[1])
+        budget = count_tokens(best) - 1
+        selected = self.selector.select(RESEARCH, 'KI-Agenten Mittelstand', token_budget=budget)
+
+        self.assertTrue(selected)
+        self.assertNotIn('KI-Agenten im Mittelstand', [snippet['title'] for snippet in selected])
+
+    def test_max_snippets_and_empty_budget(self):
+        self.selector.config['MAX_SNIPPETS'] = 1
+
+        self.assertEqual(len(self.selector.select(RESEARCH, 'KI-Agenten Mittelstand', 500)), 1)
+        self.assertEqual(self.selector.select(RESEARCH, 'KI-Agenten', 0), [])
+        self.assertEqual(self.selector.select_context({}, 'KI-Agenten'), '')
+
+    def test_context_lists_snippets_with_host(self):
+        context = self.selector.select_context(RESEARCH, 'Wie automatisieren KI-Agenten', quality='gold')
+
+        self.assertEqual(
+            context.splitlines()[0],
+            '- KI-Agenten im Mittelstand: Wie KI-Agenten Prozesse automatisieren (heise.de)'
+        )
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class ResearchPromptTest(SimpleTestCase):
+
+    def test_research_block_only_with_context(self):
+        generator = OpusScriptGenerator()
+        with_research = ''.join(generator._create_prompt_parts('T', 'B', 'K', 500, 'gold', '- Quelle'))
+        without = ''.join(generator._create_prompt_parts('T', 'B', 'K', 500, 'gold'))
+
+        self.assertIn('Aktuelle Research-Quellen', with_research)
+        self.assertIn('- Quelle', with_research)
+        self.assertNotIn('Research-Quellen', without)
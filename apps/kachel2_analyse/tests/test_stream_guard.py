@@ -0,0 +1,115 @@
+import threading
+import time
+from django.test import SimpleTestCase
+from apps.kachel2_analyse.services.stream_guard import StreamGuard, generate_abortable, generate_guarded
+
+
+class FakeStreamService:
+    """Streamt Text-Stücke - merkt sich, ob der Stream geschlossen wurde"""
+
+    service_name = 'Fake'
+    model = 'anthropic/claude-opus-4.1'
+
+    def __init__(self, deltas, delay=0.0):
+        self.deltas = deltas
+        self.delay = delay
+        self.closed = False
+        self.sent = 0
+
+    def stream_content(self, prompt, **kwargs):
+        try:
+            for delta in self.deltas:
+                time.sleep(self.delay)
+                self.sent += 1
+                yield {'type': 'delta', 'content': delta}
+            yield {'type': 'done', 'content': ''.join(self.deltas), 'cost': 0.5}
+        finally:
+            self.closed = True
+
+    def _calculate_cost(self, tokens):
+        return tokens * 0.001
+
+
+class PromptStreamService(FakeStreamService):
+    """Streamt je nach Prompt andere Text-Stücke"""
+
+    def __init__(self, responses):
+        super().__init__([])
+        self.responses = responses
+        self.prompts = []
+
+    def stream_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.deltas = self.responses[prompt]
+        return super().stream_content(prompt, **kwargs)
+
+
+class StreamGuardTest(SimpleTestCase):
+
+    def test_finds_phrase_split_across_deltas(self):
+        guard = StreamGuard(['Best Regards'])
+
+        self.assertIsNone(guard.feed('Danke und best re'))
+        self.assertEqual(guard.feed('gards, Max'), 'best regards')
+        self.assertEqual(guard.feed('weiter'), 'best regards')
+
+    def test_without_phrases_nothing_is_flagged(self):
+        self.assertIsNone(StreamGuard(['']).feed('hi there'))
+
+
+class GenerateGuardedTest(SimpleTestCase):
+
+    def test_violation_aborts_and_retries_with_retry_prompt(self):
+        service = PromptStreamService({
+            'Prompt': ['Hi the', 're, ich bin', ' Max'] + ['...'] * 100,
+            'Strenger': ['Briefing: ', 'Video über KI'],
+        })
+        result = generate_guarded(service, 'Prompt', ['hi there'], retry_prompt='Strenger')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['content'], 'Briefing: Video über KI')
+        self.assertEqual((result['attempts'], result['aborted']), (2, 1))
+        self.assertEqual(service.prompts, ['Prompt', 'Strenger'])
+        # Abgebrochener Versuch wird anteilig berechnet
+        self.assertGreater(result['cost'], 0.5)
+
+    def test_last_attempt_is_not_checked(self):
+        service = PromptStreamService({'Prompt': ['Hi there, ', 'Max']})
+        result = generate_guarded(service, 'Prompt', ['hi there'], max_attempts=2)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['content'], 'Hi there, Max')
+        self.assertEqual(result['attempts'], 2)
+        self.assertTrue(service.closed)
+
+    def test_stream_error_is_returned(self):
+        class ErrorService(FakeStreamService):
+            def stream_content(self, prompt, **kwargs):
+                yield {'type': 'error', 'error': 'HTTP 500', 'cost': 0.0}
+
+        result = generate_guarded(ErrorService([]), 'Prompt', ['hi there'])
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'HTTP 500')
+
+
+class GenerateAbortableTest(SimpleTestCase):
+
+    def test_returns_content_when_not_aborted(self):
+        service = FakeStreamService(['Title: ', 'Neu'])
+        result = generate_abortable(service, 'Prompt', threading.Event())
+
+        self.assertEqual(result, {'success': True, 'content': 'Title: Neu', 'cost': 0.5, 'aborted': False})
+
+    def test_abort_closes_stream_and_bills_partial_output(self):
+        service = FakeStreamService(['Wort '] * 1000, delay=0.001)
+        abort = threading.Event()
+        threading.Timer(0.02, abort.set).start()
+
+        result = generate_abortable(service, 'Prompt', abort)
+
+        self.assertTrue(result['aborted'])
+        self.assertFalse(result['success'])
+        self.assertTrue(service.closed)
+        self.assertLess(service.sent, 1000)
+        self.assertGreater(result['cost'], 0)
@@ -0,0 +1,264 @@
+import threading
+from unittest import mock
+import requests
+from django.test import TestCase, override_settings
+from apps.kachel2_analyse.services.http_transport import close_transports, get_serper_transport
+from apps.kachel2_analyse.workflows_offen import upwork_analyzer
+from apps.kachel2_analyse.workflows_offen.upwork_analyzer import UpworkAnalyzer
+from core.resilience import Deadline, get_latency_tracker
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class GenerateTitleTest(TestCase):
+    """Titel-Generierung mit Hedging"""
+
+    def setUp(self):
+        self.analyzer = UpworkAnalyzer()
+        self.gemini = self.analyzer.script_generator.gemini
+
+    def test_title_latency_is_tracked_separately_from_model(self):
+        title_tracker = get_latency_tracker(f"title:{self.gemini.model}")
+        model_tracker = get_latency_tracker(self.gemini.model)
+        before_title, before_model = len(title_tracker), len(model_tracker)
+
+        result = {'success': True, 'content': 'Titel', 'cost': 0.0}
+        with mock.patch.object(self.gemini, 'generate_content', return_value=result):
+            self.analyzer._generate_title('Job', Deadline(60))
+
+        self.assertEqual(len(title_tracker), before_title + 1)
+        self.assertEqual(len(model_tracker), before_model)
+
+    def test_cached_titles_are_not_recorded(self):
+        title_tracker = get_latency_tracker(f"title:{self.gemini.model}")
+        before = len(title_tracker)
+
+        result = {'success': True, 'content': 'Titel', 'cost': 0.0, 'cached': True}
+        with mock.patch.object(self.gemini, 'generate_content', return_value=result):
+            self.analyzer._generate_title('Job', Deadline(60))
+
+        self.assertEqual(len(title_tracker), before)
+
+    def test_hedges_run_on_shared_executor(self):
+        result = {'success': True, 'content': 'Titel', 'cost': 0.0}
+        with mock.patch.object(self.gemini, 'generate_content', return_value=result), \
+                mock.patch.object(upwork_analyzer, 'hedged_call', wraps=upwork_analyzer.hedged_call) as hedged:
+            self.analyzer._generate_title('Job', Deadline(60))
+
+        self.assertIs(hedged.call_args.kwargs['executor'], upwork_analyzer.get_executor())
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', SPECULATIVE_IMPROVE={'gold': True})
+class ReviewAndImproveTest(TestCase):
+    """Spekulative Opus-Verbesserung parallel zum Sonnet-Review"""
+
+    def _run(self, review, stream_seconds=2.0):
+        started = threading.Event()
+        aborted = threading.Event()
+
+        def _improve(prompt, abort, max_tokens=1000):
+            started.set()
+            self.prompts.append(prompt)
+            # Läuft wie ein langer Stream, bis abgebrochen wird
+            if abort.wait(stream_seconds):
+                aborted.set()
+                return None
+            return "Title: Die verborgene Wahrheit über KI\n"
+
+        self.prompts = []
+        with mock.patch.object(upwork_analyzer, 'call_sonnet_4', return_value=review), \
+                mock.patch.object(upwork_analyzer, 'call_opus_41_abortable', side_effect=_improve), \
+                mock.patch.object(upwork_analyzer, 'call_opus_41') as call_opus:
+            result = upwork_analyzer.review_and_improve('KI Titel', 'Briefing', 'ki', 'Job', quality='gold')
+        self.assertTrue(started.wait(1))
+        return result, aborted, call_opus
+
+    def test_good_review_aborts_speculative_stream(self):
+        (title, _, _, score), aborted, call_opus = self._run("SCORE: 9/10\nIMPROVEMENTS: keine")
+
+        self.assertEqual((title, score), ('KI Titel', 9))
+        self.assertTrue(aborted.wait(1))
+        call_opus.assert_not_called()
+
+    def test_low_review_uses_speculative_result(self):
+        (title, _, _, score), aborted, call_opus = self._run("SCORE: 5/10\nIMPROVEMENTS: mehr Spannung", stream_seconds=0.05)
+
+        self.assertEqual(title, 'Die verborgene Wahrheit über KI')
+        self.assertFalse(aborted.is_set())
+        call_opus.assert_not_called()
+        # Kein Feedback verfügbar - der Prompt nennt die Review-Kriterien
+        self.assertIn('clickbait-worthiness', self.prompts[0])
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class ArbeitsprobenBatchTest(TestCase):
+    """Ein Titel, alle Qualitätsstufen gleichzeitig"""
+
+    def setUp(self):
+        self.analyzer = UpworkAnalyzer()
+
+    def _generate(self, title, quality, **kwargs):
+        if quality == 'gold':
+            return {'success': False, 'error': 'Timeout', 'cost': 0.05}
+        return {'success': True, 'content': f'{quality}: {title}', 'cost': 0.1}
+
+    def test_title_is_generated_once_for_all_qualities(self):
+        title = {'success': True, 'title': 'KI im Alltag'}
+        with mock.patch.object(self.analyzer, 'analyze_job', return_value=title) as analyze_job, \
+                mock.patch.object(self.analyzer.script_generator, 'generate', side_effect=self._generate):
+            batch = self.analyzer.create_arbeitsproben_batch('Job', qualities=('bronze', 'silber', 'gold'))
+
+        analyze_job.assert_called_once()
+        self.assertTrue(batch['success'])
+        self.assertEqual(batch['results']['silber']['content'], 'silber: KI im Alltag')
+        self.assertEqual(batch['results']['bronze']['title_source'], 'GENERIERT')
+        self.assertFalse(batch['results']['gold']['success'])
+        self.assertAlmostEqual(batch['cost'], 0.25)
+
+    def test_fails_when_no_quality_succeeds(self):
+        title = {'success': True, 'title': 'KI im Alltag'}
+        with mock.patch.object(self.analyzer, 'analyze_job', return_value=title), \
+                mock.patch.object(self.analyzer.script_generator, 'generate', side_effect=self._generate):
+            batch = self.analyzer.create_arbeitsproben_batch('Job', qualities=('gold',))
+
+        self.assertFalse(batch['success'])
+
+
+class ParseStructuredAnalysisTest(TestCase):
+    """JSON-Antwort des strukturierten Modus"""
+
+    def test_reads_json_with_surrounding_text_and_keyword_list(self):
+        content = 'Hier: {"title": " KI im Alltag ", "briefing": "Video über KI", "keywords": ["ki", " alltag", ""]}'
+
+        self.assertEqual(
+            upwork_analyzer.parse_structured_analysis(content),
+            {'title': 'KI im Alltag', 'briefing': 'Video über KI', 'keywords': 'ki, alltag'}
+        )
+
+    def test_rejects_unusable_answers(self):
+        for content in (
+            None,
+            'kein JSON',
+            '{"title": "T", "briefing": "B"}',
+            '{"title": "' + 'x' * 101 + '", "briefing": "B", "keywords": "k"}',
+            '{"title": "T", "briefing": "Hi there, I\'m excited", "keywords": "k"}',
+        ):
+            self.assertIsNone(upwork_analyzer.parse_structured_analysis(content), content)
+
+
+@override_settings(UPWORK_ANALYSIS={'STRUCTURED_OUTPUT': True})
+class AnalyzeJobStructuredTest(TestCase):
+    """Ein strukturierter Aufruf statt Titel, Briefing und Keywords einzeln"""
+
+    JOB = 'We need a YouTube video script about AI agents for small businesses.'
+
+    def _run(self, opus_answers):
+        with mock.patch.object(upwork_analyzer, 'call_opus_41', side_effect=opus_answers) as opus, \
+                mock.patch.object(upwork_analyzer, 'call_opus_41_guarded', return_value='Briefing') as guarded, \
+                mock.patch.object(upwork_analyzer, 'needs_review', return_value=False), \
+                mock.patch.object(upwork_analyzer, 'SERPER_API_KEY', None):
+            return upwork_analyzer.analyze_job({'text': self.JOB}), opus, guarded
+
+    def test_valid_answer_needs_one_call(self):
+        answer = '{"title": "KI-Agenten", "briefing": "Video über KI-Agenten", "keywords": "ki, agenten"}'
+        result, opus, guarded = self._run([answer])
+
+        self.assertTrue(result['structured'])
+        self.assertEqual((result['title'], result['keywords']), ('KI-Agenten', 'ki, agenten'))
+        self.assertEqual(opus.call_count, 1)
+        guarded.assert_not_called()
+
+    def test_invalid_answer_falls_back_to_single_calls(self):
+        def _opus(prompt, use_cache=False, max_tokens=1000, deadline=None):
+            if prompt.startswith(upwork_analyzer.ANALYSIS_INSTRUCTIONS):
+                return 'kein JSON'
+            return 'Keywords' if use_cache else 'Titel'
+
+        result, opus, guarded = self._run(_opus)
+
+        self.assertFalse(result['structured'])
+        self.assertEqual((result['title'], result['description'], result['keywords']), ('Titel', 'Briefing', 'Keywords'))
+        self.assertEqual(opus.call_count, 3)
+
+    def test_keywords_fall_back_to_local_ranking_without_opus(self):
+        job = ('We need a scriptwriter for our YouTube finance channel. '
+               'The finance channel covers budgeting for beginners. '
+               'Scripts should be practical.')
+        with mock.patch.object(upwork_analyzer, 'call_opus_41', return_value=None), \
+                mock.patch.object(upwork_analyzer, 'call_opus_41_guarded', return_value='Briefing'), \
+                mock.patch.object(upwork_analyzer, 'needs_review', return_value=False), \
+                mock.patch.object(upwork_analyzer, 'SERPER_API_KEY', None):
+            result = upwork_analyzer.analyze_job({'text': job})
+
+        keywords = result['keywords'].split(', ')
+        # Wiederholtes Thema vor einmaligen Begriffen - alphabetisch käme "beginners" zuerst
+        self.assertEqual(keywords[0], 'finance channel')
+        self.assertLess(keywords.index('beginners'), keywords.index('budgeting'))
+        self.assertNotIn('finance', keywords)
+        self.assertLessEqual(len(keywords), upwork_analyzer.UPWORK_KEYWORDS)
+
+    def test_callers_deadline_reaches_graph_and_opus(self):
+        answer = '{"title": "KI-Agenten", "briefing": "Video über KI-Agenten", "keywords": "ki, agenten"}'
+        deadline = Deadline(60)
+        with mock.patch.object(upwork_analyzer, 'call_opus_41', return_value=answer) as opus, \
+                mock.patch.object(upwork_analyzer, 'needs_review', return_value=False), \
+                mock.patch.object(upwork_analyzer, 'SERPER_API_KEY', None), \
+                mock.patch.object(upwork_analyzer.TaskGraph, 'run', autospec=True,
+                                  side_effect=upwork_analyzer.TaskGraph.run) as run:
+            upwork_analyzer.analyze_job({'text': self.JOB}, deadline=deadline)
+
+        self.assertIs(run.call_args.kwargs['deadline'], deadline)
+        self.assertIs(opus.call_args.kwargs['deadline'], deadline)
+
+        # Fallback: Titel, Keywords und das gestreamte Briefing unter derselben Deadline
+        with mock.patch.object(upwork_analyzer, 'call_opus_41', return_value='kein JSON') as opus, \
+                mock.patch.object(upwork_analyzer, 'OpusService'), \
+                mock.patch.object(upwork_analyzer, 'generate_guarded',
+                                  return_value={'success': True, 'content': 'Briefing'}) as guarded, \
+                mock.patch.object(upwork_analyzer, 'needs_review', return_value=False), \
+                mock.patch.object(upwork_analyzer, 'SERPER_API_KEY', None):
+            result = upwork_analyzer.analyze_job({'text': self.JOB}, deadline=deadline)
+
+        self.assertFalse(result['structured'])
+        self.assertEqual(opus.call_count, 3)
+        for call in opus.call_args_list:
+            self.assertIs(call.kwargs['deadline'], deadline)
+        self.assertIs(guarded.call_args.kwargs['deadline'], deadline)
+
+
+@override_settings(SERPER_API_KEY='test-key')
+class LegacySerperSearchTest(TestCase):
+    """Legacy-Recherche über den gepoolten Serper-Transport"""
+
+    def setUp(self):
+        close_transports()
+        self.addCleanup(close_transports)
+        patcher = mock.patch.object(upwork_analyzer, 'SERPER_API_KEY', 'test-key')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_uses_pooled_transport_with_timeout(self):
+        response = mock.Mock(status_code=200, headers={})
+        response.json.return_value = {'organic': [{'title': 'Treffer'}]}
+        transport = get_serper_transport()
+
+        with mock.patch.object(transport, 'post', return_value=response) as post:
+            self.assertEqual(upwork_analyzer.serper_search('KI'), [{'title': 'Treffer'}])
+
+        self.assertEqual(post.call_args.args[0], '/search')
+        self.assertEqual(post.call_args.kwargs['timeout'], upwork_analyzer.SERPER_TIMEOUT)
+
+    def test_timeout_returns_no_results(self):
+        with mock.patch.object(get_serper_transport(), 'post', side_effect=requests.exceptions.ReadTimeout('hängt')):
+            self.assertEqual(upwork_analyzer.serper_search('KI'), [])
+
+
+class NeedsReviewTest(TestCase):
+    """needs_review bleibt mit (job_text, confidence) aufrufbar"""
+
+    def test_legacy_confidence_argument_is_accepted(self):
+        self.assertIsInstance(upwork_analyzer.needs_review('Write a short text. Budget $5', 50), bool)
+
+    def test_uses_given_job_score(self):
+        job_score = mock.Mock(review=True)
+
+        self.assertTrue(upwork_analyzer.needs_review('Write a short text.', job_score=job_score))
@@ -0,0 +1,120 @@
+import json
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from apps.kachel2_analyse.services.script_generator_service import OpusScriptGenerator
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class ScriptStreamViewTest(TestCase):
+    """SSE-Endpoint für Script-Streaming"""
+
+    def setUp(self):
+        self.url = reverse('kachel2_analyse:script_stream')
+        self.user = User.objects.create_user('redakteur', password='geheim')
+
+    def _events(self, response):
+        body = b''.join(response.streaming_content).decode('utf-8')
+        return [json.loads(line[5:]) for line in body.splitlines() if line.startswith('data:')]
+
+    def _stream_url(self, data):
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['stream_url']
+
+    def test_requires_login(self):
+        with mock.patch.object(OpusScriptGenerator, 'generate_stream') as generate_stream:
+            response = self.client.post(self.url, {'title': 'KI im Alltag'})
+
+        self.assertEqual(response.status_code, 401)
+        generate_stream.assert_not_called()
+
+    def test_streams_events_for_known_quality(self):
+        self.client.force_login(self.user)
+        events = [
+            {'type': 'meta', 'title': 'KI im Alltag', 'quality': 'gold'},
+            {'type': 'delta', 'content': 'Hallo'},
+            {'type': 'done', 'word_count_actual': 1, 'cost': 0.01},
+        ]
+        with mock.patch.object(OpusScriptGenerator, 'generate_stream', return_value=iter(events)) as generate_stream:
+            stream_url = self._stream_url({'title': 'KI im Alltag', 'quality': 'gold'})
+            generate_stream.assert_not_called()
+            response = self.client.get(stream_url)
+            received = self._events(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual([event['type'] for event in received], ['meta', 'delta', 'done'])
+        self.assertEqual(generate_stream.call_args.kwargs['quality'], 'gold')
+
+    def test_get_without_valid_token_starts_nothing(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(OpusScriptGenerator, 'generate_stream') as generate_stream:
+            plain = self.client.get(self.url, {'title': 'KI im Alltag', 'quality': 'gold'})
+            forged = self.client.get(self.url, {'token': 'gefaelscht'})
+
+        self.assertEqual(plain.status_code, 403)
+        self.assertEqual(forged.status_code, 403)
+        generate_stream.assert_not_called()
+
+    def test_token_is_bound_to_user_and_expires(self):
+        self.client.force_login(self.user)
+        stream_url = self._stream_url({'title': 'KI im Alltag'})
+
+        other = User.objects.create_user('fremd', password='geheim')
+        self.client.force_login(other)
+        with mock.patch.object(OpusScriptGenerator, 'generate_stream') as generate_stream:
+            self.assertEqual(self.client.get(stream_url).status_code, 403)
+
+            self.client.force_login(self.user)
+            with override_settings(SCRIPT_STREAM={'TOKEN_MAX_AGE': -1}):
+                self.assertEqual(self.client.get(stream_url).status_code, 403)
+        generate_stream.assert_not_called()
+
+    def test_token_request_requires_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+
+        self.assertEqual(client.post(self.url, {'title': 'KI im Alltag'}).status_code, 403)
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_client_flow_post_token_then_event_source(self):
+        # Wie streamScript (api-client.js): CSRF-Cookie, POST mit X-CSRFToken, dann GET stream_url
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        client.get(reverse('kachel2_analyse:analyse_dashboard'))
+        csrf_token = client.cookies['csrftoken'].value
+
+        events = [{'type': 'delta', 'content': 'Hallo'}, {'type': 'done', 'word_count_actual': 1}]
+        with mock.patch.object(OpusScriptGenerator, 'generate_stream', return_value=iter(events)) as generate_stream:
+            response = client.post('/kachel2/stream/', {'title': 'KI im Alltag', 'word_count': '500'},
+                                   HTTP_X_CSRFTOKEN=csrf_token)
+            self.assertEqual(response.status_code, 200)
+            stream = client.get(response.json()['stream_url'])
+            received = self._events(stream)
+
+        self.assertEqual(stream.status_code, 200)
+        self.assertEqual([event['type'] for event in received], ['delta', 'done'])
+        self.assertEqual(generate_stream.call_args.kwargs['title'], 'KI im Alltag')
+        self.assertEqual(generate_stream.call_args.kwargs['word_count'], 500)
+
+    def test_word_count_is_clamped(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(OpusScriptGenerator, 'generate_stream', return_value=iter([])) as generate_stream:
+            for requested, expected in (('1000000000', 18000), ('-5', 100)):
+                b''.join(self.client.get(self._stream_url({'title': 'X', 'word_count': requested})).streaming_content)
+                self.assertEqual(generate_stream.call_args.kwargs['word_count'], expected)
+
+    def test_rejects_unknown_quality(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, {'title': 'KI im Alltag', 'quality': 'platin'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('platin', response.json()['error'])
+
+    def test_rejects_missing_title_and_invalid_word_count(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.client.post(self.url).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {'title': 'X', 'word_count': 'viel'}).status_code, 400)
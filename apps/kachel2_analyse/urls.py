@@ -6,6 +6,9 @@ app_name = 'kachel2_analyse'
 urlpatterns = [
     path('', views.analyse_dashboard, name='analyse_dashboard'),
     
+    # Script-Streaming (Server-Sent Events) - für beide Workflows
+    path('stream/', views.script_stream, name='script_stream'),
+    
     # OFFENE Aufträge (Bewerbungen) - KEINE Serper API
     path('offen/', views.workflow_offen_list, name='workflow_offen_list'),
     path('offen/create/', views.arbeitsprobe_create, name='arbeitsprobe_create'),
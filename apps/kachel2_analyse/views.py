@@ -1,8 +1,20 @@
+import json
+import logging
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core import signing
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.urls import reverse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_http_methods
+from .services.script_generator_service import OpusScriptGenerator
 
+logger = logging.getLogger(__name__)
+
+@ensure_csrf_cookie
 def analyse_dashboard(request):
-    """Dashboard für Kachel 2 - Analyse"""
+    """Dashboard für Kachel 2 - Analyse (setzt das CSRF-Cookie für streamScript)"""
     return render(request, 'kachel2/index.html')
 
 def workflow_offen_list(request):
@@ -32,3 +44,104 @@ def script_detail(request, script_id):
 def script_research(request, script_id):
     """Research für Script (nur aktive Workflows)"""
     return render(request, 'kachel2/script_research.html')
+
+def _sse_event(event: dict) -> str:
+    """Formatiert ein Event als Server-Sent Event"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+STREAM_TOKEN_SALT = 'kachel2_analyse.script_stream'
+
+
+def _clamp_word_count(value) -> int:
+    """Begrenzt die Wortanzahl auf den erlaubten Bereich (ValueError bei Nicht-Zahl)"""
+    limits = settings.SCRIPT_WORD_COUNT
+    return min(limits['MAX'], max(limits['MIN'], int(value)))
+
+
+@require_http_methods(["GET", "POST"])
+def script_stream(request):
+    """
+    Streamt Script-Content per Server-Sent Events an den Browser
+
+    POST (mit CSRF-Token): title, description, keywords, word_count, quality
+    - prüft die Parameter und liefert ein kurzlebiges, signiertes Stream-Token
+    GET (EventSource): token
+    - startet die Generierung mit den signierten Parametern
+
+    Nur für angemeldete Benutzer - jeder Stream startet eine bezahlte Generierung.
+    Ein GET ohne gültiges Token löst nichts aus (kein CSRF über <img>/<script>).
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'error': 'Anmeldung erforderlich'}, status=401)
+
+    if request.method == 'POST':
+        return _issue_stream_token(request)
+
+    try:
+        params = signing.loads(
+            request.GET.get('token', ''),
+            salt=STREAM_TOKEN_SALT,
+            max_age=settings.SCRIPT_STREAM['TOKEN_MAX_AGE']
+        )
+    except signing.SignatureExpired:
+        return JsonResponse({'success': False, 'error': 'Stream-Token abgelaufen'}, status=403)
+    except signing.BadSignature:
+        return JsonResponse({'success': False, 'error': 'Ungültiges Stream-Token'}, status=403)
+
+    if params.get('user') != request.user.pk:
+        return JsonResponse({'success': False, 'error': 'Ungültiges Stream-Token'}, status=403)
+
+    try:
+        generator = OpusScriptGenerator()
+    except ValueError as e:
+        logger.error(f"Script-Stream nicht verfügbar: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=503)
+
+    events = generator.generate_stream(
+        title=params['title'],
+        description=params['description'],
+        keywords=params['keywords'],
+        word_count=params['word_count'],
+        quality=params['quality']
+    )
+
+    response = StreamingHttpResponse(
+        (_sse_event(event) for event in events),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Kein Buffering durch nginx
+    return response
+
+
+def _issue_stream_token(request):
+    """Prüft die Stream-Parameter und signiert sie für die folgende EventSource-Anfrage"""
+    title = request.POST.get('title', '').strip()
+
+    if not title:
+        return JsonResponse({'success': False, 'error': 'Titel ist erforderlich'}, status=400)
+
+    try:
+        word_count = _clamp_word_count(request.POST.get('word_count', 1000))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Ungültige Wortanzahl'}, status=400)
+
+    quality = request.POST.get('quality', 'bronze')
+    if quality not in settings.MODEL_FALLBACKS:
+        return JsonResponse({'success': False, 'error': f'Unbekannte Qualitätsstufe: {quality}'}, status=400)
+
+    token = signing.dumps({
+        'user': request.user.pk,
+        'title': title,
+        'description': request.POST.get('description', ''),
+        'keywords': request.POST.get('keywords', ''),
+        'word_count': word_count,
+        'quality': quality,
+    }, salt=STREAM_TOKEN_SALT)
+
+    return JsonResponse({
+        'success': True,
+        'token': token,
+        'stream_url': f"{reverse('kachel2_analyse:script_stream')}?{urlencode({'token': token})}",
+        'expires_in': settings.SCRIPT_STREAM['TOKEN_MAX_AGE'],
+    })
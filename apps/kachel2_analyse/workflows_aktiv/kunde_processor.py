@@ -8,12 +8,70 @@ WICHTIG:
 - Fokus auf wöchentliche Organisation
 """
 import logging
+from functools import partial
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from django.conf import settings
-from apps.kachel2_analyse.services.script_generator_service import OpusScriptGenerator
+from django.utils import timezone
+from apps.kachel2_analyse.services.script_generator_service import (
+    OpusScriptGenerator, get_long_script_settings
+)
+from apps.kachel2_analyse.services.keyword_extractor import KeywordExtractor, research_documents
 from apps.kachel2_analyse.services.serper_service import SerperService
+from apps.kachel2_analyse.services.snippet_selector import SnippetSelector
+from core.task_graph import TaskGraph
 
 logger = logging.getLogger(__name__)
 
+# Tracking-Parameter, die für die Deduplizierung ignoriert werden
+TRACKING_PARAMS = ('utm_', 'gclid', 'fbclid', 'mc_', 'ref')
+
+# Anzahl Keywords aus dem Research für den Script-Prompt
+RESEARCH_KEYWORDS = 5
+
+
+def canonical_url(url: str) -> str:
+    """
+    Kanonische Form einer URL für die Deduplizierung
+
+    Schema/Host klein, ohne 'www.', ohne Fragment, Tracking-Parameter und
+    abschließenden Slash.
+    """
+    parts = urlsplit((url or '').strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ))
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme,
+                       host, parts.path.rstrip('/'), query, ''))
+
+
+def merge_search_results(result_lists) -> list:
+    """
+    Führt Trefferlisten mehrerer Suchen zusammen (dedupliziert über canonical_url)
+
+    Args:
+        result_lists: Liste von (Name der Suche, Treffer)
+
+    Returns:
+        Treffer mit 'found_by' - zuerst die von mehreren Suchen gefundenen,
+        dann nach bester Position
+    """
+    merged = {}
+    for name, items in result_lists:
+        for position, item in enumerate(items):
+            key = canonical_url(item.get('link', '')) or item.get('title', '')
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = entry = dict(item, found_by=[], best_position=position)
+            if name not in entry['found_by']:
+                entry['found_by'].append(name)
+            entry['best_position'] = min(entry['best_position'], position)
+
+    return sorted(merged.values(), key=lambda entry: (-len(entry['found_by']), entry['best_position']))
+
 class KundeProcessor:
     """
     Verarbeitet AKTIVE Aufträge (Kundenprojekte)
@@ -27,6 +85,8 @@ class KundeProcessor:
     def __init__(self):
         self.script_generator = OpusScriptGenerator()
         self.serper = SerperService()  # NUR für aktive Aufträge!
+        self.keyword_extractor = KeywordExtractor()
+        self.snippet_selector = SnippetSelector()
     
     def process_kunde_auftrag(self, kunde_title: str, kunde_briefing: str, 
                                word_count: int = 1000, quality: str = 'gold') -> dict:
@@ -53,12 +113,21 @@ class KundeProcessor:
             research_data = self._conduct_research(kunde_title)
             
             # 2. Script generieren mit KUNDE-TITEL (nicht generiert!)
-            result = self.script_generator.generate(
+            # Lange Wochen-Scripts: Gliederung + parallele Abschnitte
+            if word_count >= get_long_script_settings()['THRESHOLD_WORDS']:
+                generate = self.script_generator.generate_long
+            else:
+                generate = self.script_generator.generate
+            
+            result = generate(
                 title=kunde_title,  # VOM KUNDEN!
                 description=kunde_briefing,
-                keywords=self._extract_keywords_from_research(research_data),
+                keywords=self._extract_keywords_from_research(research_data, kunde_briefing),
                 word_count=word_count,
-                quality=quality
+                quality=quality,
+                research_context=self._select_research_context(
+                    research_data, kunde_title, kunde_briefing, quality
+                )
             )
             
             # 3. Research-Daten hinzufügen
@@ -80,50 +149,139 @@ class KundeProcessor:
     def _conduct_research(self, kunde_title: str) -> dict:
         """
         Führt Research mit Serper API durch (NUR für aktive Aufträge!)
+
+        Mehrere Suchvarianten laufen gleichzeitig (Titel, Titel + Jahr, News).
+        Varianten desselben Endpoints gehen als EIN Batch-Request raus.
+        Die Ergebnisse werden zusammengeführt und über die kanonische URL
+        dedupliziert - Treffer mehrerer Varianten stehen vorne.
+
+        Returns:
+            dict mit 'organic', 'news' und 'queries' (pro Suche: Erfolg, Treffer und
+            batch_latency - Dauer des Endpoint-Requests, der die Suche enthielt)
         """
         logger.info("Starte Research mit Serper API für AKTIVEN Auftrag")
-        
+
+        year = timezone.now().year
+        variants = [
+            ('search', 'title', kunde_title),
+            ('search', 'title_year', f"{kunde_title} {year}"),
+            ('news', 'news', kunde_title),
+        ]
+
+        # Ein Schritt pro Endpoint - mehrere Suchen darin als Batch
+        batches = {}
+        for endpoint, name, query in variants:
+            batches.setdefault(endpoint, []).append(query)
+
+        # Jeder Schritt liefert Fehler als Ergebnis - ein fehlgeschlagener
+        # Endpoint verwirft nicht die Treffer der anderen
+        graph = TaskGraph('research')
+        for endpoint, endpoint_queries in batches.items():
+            graph.add(endpoint, partial(self._isolated_research_batch, endpoint, endpoint_queries))
+        batch_results = graph.run()
+
+        results = {}
+        for endpoint, name, _ in variants:
+            results[name] = batch_results[endpoint].pop(0)
+
+        organic = []
+        news = []
+        queries = []
+        for endpoint, name, query in variants:
+            result = results[name]
+            queries.append({
+                'name': name,
+                'query': query,
+                'success': result['success'],
+                'batch_latency': graph.timings.get(endpoint),
+                'results': 0,
+            })
+            if not result['success']:
+                logger.warning(f"Research '{name}' fehlgeschlagen: {result['error']}")
+                continue
+
+            items = result['data'].get('news' if endpoint == 'news' else 'organic', [])
+            queries[-1]['results'] = len(items)
+            (news if endpoint == 'news' else organic).append((name, items))
+
+        if not any(query['success'] for query in queries):
+            return {}
+
+        logger.info(
+            f"Research erfolgreich für: {kunde_title} - "
+            + ', '.join(
+                f"{endpoint} ({len(endpoint_queries)} Suchen) "
+                + (f"{graph.timings[endpoint]:.2f}s" if graph.timings.get(endpoint) is not None else 'ohne Zeit')
+                for endpoint, endpoint_queries in batches.items()
+            )
+        )
+        return {
+            'organic': merge_search_results(organic),
+            'news': merge_search_results(news),
+            'queries': queries,
+            'cost': round(sum(results[name].get('cost', 0.0) for _, name, _ in variants), 4),
+        }
+
+    def _isolated_research_batch(self, endpoint: str, queries: list) -> list:
+        """
+        _research_batch mit Fehler-Isolation - immer genau ein Ergebnis pro Suche
+        """
+        try:
+            results = self._research_batch(endpoint, queries)
+            if len(results) != len(queries):
+                raise ValueError(f"{len(results)} Ergebnisse für {len(queries)} Suchen")
+        except Exception as e:
+            logger.warning(f"Research-Endpoint '{endpoint}' fehlgeschlagen: {e}")
+            results = [{'success': False, 'error': str(e), 'cost': 0.00} for _ in queries]
+        return results
+
+    def _research_batch(self, endpoint: str, queries: list) -> list:
+        """
+        Serper-Suchen eines Endpoints - ab zwei Suchen als ein Batch-Request
+
+        Fehler werden als Ergebnis-dicts zurückgegeben (eins pro Suche).
+        """
         try:
             # KRITISCH: Serper API nur für AKTIVE Aufträge!
-            result = self.serper.search(
-                query=kunde_title,
-                workflow_type='AKTIV',
-                auftrag_status='AKTIV'
-            )
-            
-            if result['success']:
-                logger.info(f"Research erfolgreich für: {kunde_title}")
-                return result['data']
-            else:
-                logger.warning(f"Research fehlgeschlagen: {result['error']}")
-                return {}
-                
+            if len(queries) > 1:
+                return self.serper.search_many(
+                    queries, workflow_type='AKTIV', auftrag_status='AKTIV', endpoint=endpoint
+                )
+            search = self.serper.get_news if endpoint == 'news' else self.serper.search
+            return [search(query=queries[0], workflow_type='AKTIV', auftrag_status='AKTIV')]
         except Exception as e:
-            logger.error(f"Research-Fehler: {e}")
-            return {}
+            return [{'success': False, 'error': str(e), 'cost': 0.00} for _ in queries]
+
+    def _extract_keywords_from_research(self, research_data: dict, kunde_briefing: str = None) -> str:
+        """
+        Extrahiert die wichtigsten Keywords aus Research-Daten und Briefing
+
+        Gerankt per TF-IDF (KeywordExtractor) - gleiche Eingabe, gleiche Keywords.
+        """
+        documents = research_documents(research_data, briefing=kunde_briefing)
+        keywords = self.keyword_extractor.extract(documents, top_n=RESEARCH_KEYWORDS)
+        return ', '.join(keyword for keyword, _ in keywords)
     
-    def _extract_keywords_from_research(self, research_data: dict) -> str:
+    def _select_research_context(self, research_data: dict, kunde_title: str, kunde_briefing: str,
+                                 quality: str) -> str:
         """
-        Extrahiert Keywords aus Research-Daten
+        Relevanteste Research-Snippets für den Script-Prompt (BM25, Token-Budget je Qualitätsstufe)
+
+        Query sind Titel und Briefing des Kunden - nicht die Research-Keywords,
+        die stammen aus denselben Snippets.
         """
-        keywords = []
-        
-        if 'organic' in research_data:
-            for result in research_data['organic'][:3]:
-                title = result.get('title', '')
-                snippet = result.get('snippet', '')
-                
-                # Einfache Keyword-Extraktion
-                text = f"{title} {snippet}".lower()
-                words = text.split()
-                
-                # Häufige Wörter sammeln (vereinfacht)
-                for word in words:
-                    if len(word) > 4 and word.isalpha():
-                        keywords.append(word)
-        
-        # Top 5 Keywords zurückgeben
-        return ', '.join(list(set(keywords))[:5])
+        if not research_data:
+            return ''
+
+        service = self.script_generator.quality_services.get(quality)
+        snippets = self.snippet_selector.select(
+            research_data,
+            query=f"{kunde_title} {kunde_briefing}",
+            token_budget=self.snippet_selector.token_budget(quality),
+            model=service.model if service else ''
+        )
+        logger.info(f"Research-Kontext: {len(snippets)} Snippets für Qualität {quality}")
+        return self.snippet_selector.format_context(snippets)
     
     def validate_kunde_input(self, kunde_title: str, kunde_briefing: str) -> dict:
         """
@@ -3,5 +3,6 @@
 # - KEINE Serper API
 
 from .upwork_analyzer import UpworkAnalyzer
+from .job_ingestion import JobIngestionService
 
-__all__ = ['UpworkAnalyzer']
+__all__ = ['UpworkAnalyzer', 'JobIngestionService']
@@ -0,0 +1,239 @@
+"""
+Category Detector - lokale Kategorie-Erkennung für Upwork-Jobs
+
+Läuft komplett lokal (keine API-Kosten, Mikrosekunden pro Job):
+- Aho-Corasick-Automat über alle Keywords aller Kategorien:
+  EIN Durchlauf über den Text findet alle Treffer, unabhängig von der
+  Anzahl der Keywords
+- Scoring: jedes Keyword trägt vorberechnete (Kategorie, Gewicht)-Paare,
+  die pro Treffer aufsummiert werden. Bewusst eine einfache Python-Schleife
+  statt numpy: pro Job gibt es nur wenige Treffer bei zehn Kategorien, ein
+  Array-Aufbau wäre teurer als die Summe (und numpy keine Abhängigkeit)
+
+Die Confidence fließt als Passung in den JobScorer ein, der über
+Qualitätsstufe und Review (zwei weitere, bezahlte Aufrufe) entscheidet.
+"""
+import logging
+from collections import deque, defaultdict
+
+logger = logging.getLogger(__name__)
+
+GENERAL_CATEGORY = 'general'
+
+# Kategorie -> Keywords (klein geschrieben; Phrasen zählen doppelt)
+CATEGORY_KEYWORDS = {
+    'ai_tech': [
+        'ai', 'artificial intelligence', 'chatgpt', 'gpt', 'openai', 'machine learning',
+        'automation', 'software', 'saas', 'tech', 'technology', 'gadget', 'coding',
+        'programming', 'crypto', 'blockchain', 'app', 'startup', 'llm',
+    ],
+    'history': [
+        'history', 'historical', 'war', 'ww2', 'wwii', 'world war', 'military', 'battle',
+        'ancient', 'empire', 'medieval', 'civil war', 'cold war', 'dynasty',
+    ],
+    'true_crime': [
+        'true crime', 'crime', 'murder', 'serial killer', 'mystery', 'unsolved', 'case',
+        'detective', 'disappearance', 'investigation', 'heist', 'scam',
+    ],
+    'how_to': [
+        'how to', 'tutorial', 'guide', 'step by step', 'tips', 'explainer', 'beginner',
+        'course', 'lesson', 'diy', 'walkthrough', 'hacks',
+    ],
+    'finance': [
+        'finance', 'money', 'investing', 'stocks', 'stock market', 'personal finance',
+        'passive income', 'real estate', 'trading', 'wealth', 'budgeting', 'side hustle',
+    ],
+    'business_marketing': [
+        'marketing', 'business', 'entrepreneur', 'sales', 'brand', 'ecommerce',
+        'dropshipping', 'amazon fba', 'agency', 'social media', 'growth', 'b2b',
+    ],
+    'health_fitness': [
+        'health', 'fitness', 'workout', 'nutrition', 'diet', 'weight loss', 'wellness',
+        'mental health', 'meditation', 'gym', 'supplements', 'medical',
+    ],
+    'gaming': [
+        'gaming', 'game', 'video game', 'minecraft', 'fortnite', 'roblox', 'esports',
+        'gameplay', 'lore', 'twitch', 'playstation', 'nintendo', 'xbox',
+    ],
+    'documentary': [
+        'documentary', 'storytelling', 'story', 'biography', 'science', 'space',
+        'nature', 'psychology', 'facts', 'explained', 'top 10', 'countdown',
+    ],
+    'screenwriting': [
+        'screenplay', 'screenwriting', 'short film', 'film', 'fiction', 'episode',
+        'series', 'dialogue', 'drama', 'comedy', 'sketch', 'animation', 'narrative',
+    ],
+}
+
+PHRASE_WEIGHT = 2.0       # Mehrwort-Keywords sind eindeutiger
+WORD_WEIGHT = 1.0
+MIN_EVIDENCE = 3.0        # Score, ab dem die Treffermenge als ausreichend gilt
+
+
+class CategoryResult:
+    """Ergebnis der Kategorie-Erkennung"""
+
+    __slots__ = ('category', 'confidence', 'keywords_found', 'scores')
+
+    def __init__(self, category: str, confidence: int, keywords_found: list, scores: dict):
+        self.category = category
+        self.confidence = confidence          # 0-100
+        self.keywords_found = keywords_found  # nach Häufigkeit sortiert
+        self.scores = scores                  # Kategorie -> Score
+
+    def to_dict(self) -> dict:
+        return {
+            'category': self.category,
+            'confidence': self.confidence,
+            'keywords_found': self.keywords_found,
+            'scores': self.scores,
+        }
+
+    def __repr__(self):
+        return f"CategoryResult({self.category!r}, confidence={self.confidence})"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick-Automat: findet alle Keywords in einem Durchlauf
+
+    Treffer zählen nur an Wortgrenzen ('ai' matcht nicht in 'maintain').
+    """
+
+    def __init__(self, keywords):
+        self._goto = [{}]         # Zustand -> {Zeichen: Folgezustand}
+        self._fail = [0]
+        self._output = [()]       # Zustand -> Keywords, die hier enden
+
+        for keyword in keywords:
+            self._insert(keyword)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (keyword,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Ausgaben des Suffix-Zustands übernehmen (z.B. 'war' in 'cold war')
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str):
+        """
+        Liefert alle Keywords (mit Wiederholungen), die als ganze Wörter im Text stehen
+
+        Args:
+            text: bereits klein geschriebener Text
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        length = len(text)
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if output[state] and (index + 1 == length or not text[index + 1].isalnum()):
+                for keyword in output[state]:
+                    start = index - len(keyword) + 1
+                    if start == 0 or not text[start - 1].isalnum():
+                        yield keyword
+
+
+class CategoryDetector:
+    """
+    Lokale Kategorie-Erkennung für Job-Texte
+
+    Beispiel:
+        result = CategoryDetector().detect_category(job_text)
+        result.category, result.confidence, result.keywords_found
+    """
+
+    _default_model = None
+
+    def __init__(self, category_keywords: dict = None):
+        if category_keywords is None:
+            # Standard-Modell einmal pro Prozess kompilieren
+            if CategoryDetector._default_model is None:
+                CategoryDetector._default_model = self._compile(CATEGORY_KEYWORDS)
+            self._categories, self._weights, self._automaton = CategoryDetector._default_model
+        else:
+            self._categories, self._weights, self._automaton = self._compile(category_keywords)
+
+    @staticmethod
+    def _compile(category_keywords: dict):
+        """
+        Baut Automat und Gewichte (Keyword -> [(Kategorie-Index, Gewicht)])
+        """
+        categories = list(category_keywords)
+        weights = defaultdict(list)
+
+        for index, category in enumerate(categories):
+            for keyword in category_keywords[category]:
+                keyword = keyword.lower().strip()
+                if keyword:
+                    weight = PHRASE_WEIGHT if ' ' in keyword else WORD_WEIGHT
+                    weights[keyword].append((index, weight))
+
+        return categories, dict(weights), KeywordAutomaton(weights)
+
+    def detect_category(self, text: str) -> CategoryResult:
+        """
+        Erkennt die Kategorie eines Job-Textes
+
+        Returns:
+            CategoryResult - ohne Treffer: 'general' mit Confidence 0
+        """
+        scores = [0.0] * len(self._categories)
+        hits = defaultdict(int)
+
+        for keyword in self._automaton.find_all((text or '').lower()):
+            hits[keyword] += 1
+            for index, weight in self._weights[keyword]:
+                scores[index] += weight
+
+        total = sum(scores)
+        if not total:
+            return CategoryResult(GENERAL_CATEGORY, 0, [], {})
+
+        best = max(range(len(scores)), key=scores.__getitem__)
+        # Anteil der besten Kategorie, gedämpft solange wenig Treffer vorliegen
+        share = scores[best] / total
+        evidence = min(1.0, scores[best] / MIN_EVIDENCE)
+        confidence = round(100 * share * evidence)
+
+        keywords_found = sorted(hits, key=lambda keyword: (-hits[keyword], keyword))
+        return CategoryResult(
+            self._categories[best],
+            confidence,
+            keywords_found,
+            {self._categories[i]: score for i, score in enumerate(scores) if score}
+        )
+
+    def detect_many(self, texts) -> list:
+        """
+        Batch-API: Kategorien für viele Job-Texte (gleiche Reihenfolge)
+
+        Schleife über detect_category - der Automat wird nur einmal gebaut,
+        eine gemeinsame Verarbeitung mehrerer Texte bringt darüber hinaus nichts.
+        """
+        return [self.detect_category(text) for text in texts]
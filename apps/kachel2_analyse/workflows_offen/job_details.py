@@ -0,0 +1,157 @@
+"""
+Job Details - Budget, Stunden und Dauer aus Upwork-Jobtexten
+
+Alle Muster sind zu EINEM vorkompilierten Regex zusammengefasst; ein
+Durchlauf über den Text findet die Treffer aller Felder. Pro Feld gewinnt
+das Muster mit der höchsten Priorität (Reihenfolge in JOB_DETAIL_PATTERNS),
+bei gleicher Priorität der erste Treffer im Text.
+
+Upwork-Labels vor dem Betrag bestimmen die Budget-Art ("Hourly: $20-$40"
+ist stündlich, "Fixed-price $250" / "Budget $500" ein Festpreis).
+
+Neben den Anzeige-Texten ('budget', 'hours', 'duration') werden numerische
+Min/Max-Werte geliefert - für Preis-Auswertungen über das Job-Archiv.
+"""
+import re
+
+NOT_SPECIFIED = 'Nicht angegeben'
+
+_AMOUNT = r'\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?'
+_HOURLY_SUFFIX = r'(?P<HOURLY>\s*(?:/\s*(?:hr|hour)\b|hourly))?'
+# Upwork-Label vor dem Betrag: "Hourly: $20-$40", "Fixed-price $250", "Budget: $500"
+_BUDGET_LABEL = r'(?P<LABEL>hourly|fixed[- ]?price|budget)(?:\s*(?:rate|range|budget))?\s*:?\s*'
+_PER_WEEK = r'\s*(?:hrs?/week|hours?\s*per\s*week)'
+
+# (Feld, Muster, Art) - <MIN>/<MAX>/<HOURLY>/<LABEL> werden zu benannten Gruppen
+# Bereiche stehen vor Einzelwerten, damit "10-20 hrs/week" als Bereich erkannt wird
+JOB_DETAIL_PATTERNS = [
+    ('budget', r'(?:' + _BUDGET_LABEL + r')?\$(?P<MIN>' + _AMOUNT + r')\s*[-–]\s*\$(?P<MAX>' + _AMOUNT + r')'
+     + _HOURLY_SUFFIX, 'range'),
+    ('budget', r'(?:' + _BUDGET_LABEL + r')?\$(?P<MIN>' + _AMOUNT + r')\s*to\s*\$(?P<MAX>' + _AMOUNT + r')'
+     + _HOURLY_SUFFIX, 'range'),
+    ('budget', r'\$(?P<MIN>' + _AMOUNT + r')\s*/\s*hr\b', 'hourly'),
+    ('budget', r'\$(?P<MIN>' + _AMOUNT + r')\s*hourly', 'hourly'),
+    # Einzelbetrag nur mit Label - ein nacktes "$500" im Text ist kein Budget
+    ('budget', _BUDGET_LABEL + r'\$(?P<MIN>' + _AMOUNT + r')' + _HOURLY_SUFFIX, 'single'),
+    ('hours', r'(?P<MIN>\d+)\s*[-–]\s*(?P<MAX>\d+)\s*hrs?/week', 'range'),
+    ('hours', r'Less than\s*(?P<MAX>\d+)' + _PER_WEEK, 'max'),
+    ('hours', r'(?P<MIN>\d+)\+?\s*hrs?/week', 'open'),
+    ('hours', r'(?P<MIN>\d+)\+?\s*hours?\s*per\s*week', 'open'),
+    ('hours', r'More than\s*(?P<MIN>\d+)\s*hrs?/week', 'open'),
+    ('duration', r'(?P<MIN>\d+)\s*to\s*(?P<MAX>\d+)\s*months?', 'months'),
+    ('duration', r'(?P<MIN>\d+)\s*[-–]\s*(?P<MAX>\d+)\s*months?', 'months'),
+    ('duration', r'(?P<MIN>\d+)\s*months?', 'months'),
+    ('duration', r'(?P<MIN>\d+)\s*weeks?', 'weeks'),
+]
+
+def _compile_patterns():
+    parts = []
+    for index, (_, pattern, _) in enumerate(JOB_DETAIL_PATTERNS):
+        for token in ('MIN', 'MAX', 'HOURLY', 'LABEL'):
+            pattern = pattern.replace(f'(?P<{token}>', f'(?P<p{index}_{token}>')
+        parts.append(f'(?P<p{index}>{pattern})')
+    # Lookahead auf die möglichen Anfangszeichen: an allen anderen Stellen
+    # scheitert der Regex sofort, statt alle Alternativen zu probieren
+    return re.compile(r'(?=[$\dmhfbl])(?:' + '|'.join(parts) + ')', re.IGNORECASE)
+
+
+_JOB_DETAILS_RE = _compile_patterns()
+_GROUP_NAMES = frozenset(_JOB_DETAILS_RE.groupindex)
+
+
+def _group(match, index: int, token: str):
+    name = f'p{index}_{token}'
+    return match.group(name) if name in _GROUP_NAMES else None
+
+
+def _amount(value: str) -> float:
+    return float(value.replace(',', ''))
+
+
+def _empty_details() -> dict:
+    return {
+        'budget': NOT_SPECIFIED,
+        'hours': NOT_SPECIFIED,
+        'duration': NOT_SPECIFIED,
+        'budget_min': None,
+        'budget_max': None,
+        'budget_type': None,      # 'fixed' | 'hourly'
+        'hours_min': None,        # None bei "Less than 30 hrs/week"
+        'hours_max': None,        # None bei "20+ Stunden/Woche"
+        'duration_min': None,
+        'duration_max': None,
+        'duration_unit': None,    # 'months' | 'weeks'
+    }
+
+
+def _apply(details: dict, index: int, match):
+    field, _, kind = JOB_DETAIL_PATTERNS[index]
+    low = _group(match, index, 'MIN')
+    high = _group(match, index, 'MAX')
+
+    if field == 'budget':
+        label = (_group(match, index, 'LABEL') or '').lower()
+        hourly = kind == 'hourly' or label == 'hourly' or bool(_group(match, index, 'HOURLY'))
+        if kind == 'range':
+            details['budget'] = f"${low}-${high}"
+            details['budget_min'], details['budget_max'] = _amount(low), _amount(high)
+            details['budget_type'] = 'hourly' if hourly else 'fixed'
+        elif not hourly:
+            details['budget'] = f"${low}"
+            details['budget_min'] = details['budget_max'] = _amount(low)
+            details['budget_type'] = 'fixed'
+        else:
+            details['budget'] = f"${low}/Stunde"
+            details['budget_min'] = details['budget_max'] = _amount(low)
+            details['budget_type'] = 'hourly'
+
+    elif field == 'hours':
+        if kind == 'range':
+            details['hours'] = f"{low}-{high} Stunden/Woche"
+            details['hours_min'], details['hours_max'] = int(low), int(high)
+        elif kind == 'max':
+            details['hours'] = f"Unter {high} Stunden/Woche"
+            details['hours_min'], details['hours_max'] = None, int(high)
+        else:
+            details['hours'] = f"{low}+ Stunden/Woche"
+            details['hours_min'], details['hours_max'] = int(low), None
+
+    else:
+        if kind == 'weeks':
+            details['duration'] = f"{low} Wochen"
+            details['duration_min'] = details['duration_max'] = int(low)
+        elif high is not None:
+            details['duration'] = f"{low}-{high} Monate"
+            details['duration_min'], details['duration_max'] = int(low), int(high)
+        else:
+            details['duration'] = f"{low} Monate"
+            details['duration_min'] = details['duration_max'] = int(low)
+        details['duration_unit'] = kind
+
+
+def extract_job_details(job_text: str) -> dict:
+    """
+    Extract budget, hours, duration from job text
+
+    Returns:
+        dict mit Anzeige-Texten ('budget', 'hours', 'duration') und
+        numerischen Feldern (*_min, *_max, budget_type, duration_unit)
+    """
+    details = _empty_details()
+    best = {}                 # Feld -> Index des gewählten Musters
+
+    for match in _JOB_DETAILS_RE.finditer(job_text or ''):
+        index = int(match.lastgroup[1:])
+        field = JOB_DETAIL_PATTERNS[index][0]
+        if field not in best or index < best[field]:
+            best[field] = index
+            _apply(details, index, match)
+
+    return details
+
+
+def extract_job_details_many(job_texts) -> list:
+    """
+    Batch-API: Details für viele Job-Texte (gleiche Reihenfolge), z.B. für das Job-Archiv
+    """
+    return [extract_job_details(job_text) for job_text in job_texts]
@@ -0,0 +1,341 @@
+"""
+Job Ingestion - viele Upwork-Jobs aus einer Datei in Arbeitsproben verwandeln
+
+WORKFLOW: OFFEN (Bewerbungen)
+- Liest Jobs zeilenweise aus JSONL oder CSV (Spalten: id, title, text/description, url)
+- Optional: lokaler Score (JobScorer) bestimmt Reihenfolge, Qualitätsstufe
+  ('auto') und welche Jobs überhaupt verarbeitet werden (min_score).
+  Sortiert wird fensterweise (PRIORITY_WINDOW Jobs), die Datei wird nie
+  vollständig in den Speicher gelesen
+- Begrenzter Worker-Pool ruft UpworkAnalyzer.create_arbeitsprobe auf
+- Ergebnisse werden per bulk_create gespeichert (Auftrag + Arbeitsprobe)
+- Checkpoint-Datei: nach einem Abbruch geht es beim nächsten Lauf dort weiter
+
+Aufträge heißen 'UP-<id>' und kollidieren so nicht mit manuell angelegten
+IDs. Existiert ein Auftrag mit dem Schlüssel bereits und ist nicht OFFEN
+(z.B. ein AKTIVER Kundenauftrag), wird der Job nicht verarbeitet.
+
+Gespeichert wird nach jeweils BATCH_SIZE fertigen Jobs (Default 20) in einer
+Transaktion. Der Checkpoint rückt erst nach dem Speichern vor: bei einem harten
+Absturz (kill -9, OOM) werden beim nächsten Lauf höchstens die gepufferten Jobs
+erneut verarbeitet. Bei Exceptions und Strg+C wird der Puffer noch gespeichert.
+Bestehende Aufträge werden pro Block von Jobs mit einer Abfrage geprüft.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from django.conf import settings
+from django.db import transaction
+from apps.kachel1_auftragsverwaltung.models import Auftrag
+from apps.kachel2_analyse.models import Arbeitsprobe
+from apps.kachel2_analyse.workflows_offen.job_scorer import JobScorer
+from apps.kachel2_analyse.workflows_offen.upwork_analyzer import UpworkAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGESTION_SETTINGS = {
+    'WORKERS': 4,             # Gleichzeitige Jobs
+    'BATCH_SIZE': 20,         # Fertige Jobs pro Datenbank-Batch (siehe Modul-Docstring)
+    'WORD_COUNT': 500,
+    'QUALITY': 'bronze',      # oder 'auto' - Stufe aus dem Job-Score
+    'PRIORITIZE': True,       # Jobs mit hohem Score zuerst
+    'PRIORITY_WINDOW': 500,   # Sortiert wird jeweils innerhalb so vieler Jobs
+    'MIN_SCORE': 0,           # Jobs darunter werden nicht verarbeitet
+}
+
+AUTO_QUALITY = 'auto'
+KEY_PREFIX = 'UP-'
+_PLAIN_ID_RE = re.compile(r'[\w.-]+')
+
+
+def get_ingestion_settings() -> dict:
+    """
+    Einstellungen für den Massen-Import (settings.JOB_INGESTION mit Defaults)
+    """
+    config = dict(DEFAULT_INGESTION_SETTINGS)
+    config.update(getattr(settings, 'JOB_INGESTION', {}) or {})
+    return config
+
+
+def job_key(job: dict) -> str:
+    """
+    Stabiler Schlüssel eines Jobs - dient als Auftrag-ID und im Checkpoint
+
+    Immer mit Präfix 'UP-': kurze IDs werden übernommen ('UP-12345'),
+    sonst Hash über ID bzw. Text.
+    """
+    job_id = str(job.get('id') or '').strip()
+    max_length = Auftrag._meta.get_field('id').max_length
+    if job_id and len(KEY_PREFIX) + len(job_id) <= max_length and _PLAIN_ID_RE.fullmatch(job_id):
+        return f"{KEY_PREFIX}{job_id}"
+    digest = hashlib.sha1((job_id or job['text']).encode('utf-8')).hexdigest()
+    return f"{KEY_PREFIX}{digest[:16]}"
+
+
+def read_jobs(path: str):
+    """
+    Liest Jobs zeilenweise (Generator) - JSONL oder CSV, erkannt an der Endung
+
+    Yields:
+        dict mit id, title, text, url (Einträge ohne Text werden übersprungen)
+    """
+    with open(path, encoding='utf-8', newline='') as handle:
+        if path.lower().endswith('.csv'):
+            rows = csv.DictReader(handle)
+        else:
+            rows = (json.loads(line) for line in handle if line.strip())
+
+        for line_number, row in enumerate(rows, start=1):
+            text = (row.get('text') or row.get('description') or '').strip()
+            if not text:
+                logger.warning(f"Job-Import: Eintrag {line_number} ohne Text übersprungen")
+                continue
+            yield {
+                'id': row.get('id'),
+                'title': (row.get('title') or '').strip(),
+                'text': text,
+                'url': (row.get('url') or '').strip() or None,
+            }
+
+
+class IngestionCheckpoint:
+    """
+    Fortschritt eines Imports - erledigte und fehlgeschlagene Job-Schlüssel
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        self.failed = {}          # Schlüssel -> Fehlermeldung
+
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+            self.done = set(data.get('done', []))
+            self.failed = dict(data.get('failed', {}))
+            logger.info(
+                f"Job-Import: Checkpoint geladen - {len(self.done)} erledigt, "
+                f"{len(self.failed)} fehlgeschlagen"
+            )
+
+    def save(self):
+        """Schreibt den Checkpoint atomar (temporäre Datei + Umbenennen)"""
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump({'done': sorted(self.done), 'failed': self.failed}, handle)
+        os.replace(temp_path, self.path)
+
+
+class JobIngestionService:
+    """
+    Massen-Import von Upwork-Jobs mit begrenzter Parallelität und Checkpoint
+    """
+
+    def __init__(self, analyzer=None, workers: int = None, batch_size: int = None,
+                 word_count: int = None, quality: str = None, prioritize: bool = None,
+                 min_score: float = None, scorer: JobScorer = None, priority_window: int = None):
+        config = get_ingestion_settings()
+
+        self.analyzer = analyzer or UpworkAnalyzer()
+        self.workers = max(1, workers or config['WORKERS'])
+        self.batch_size = max(1, batch_size or config['BATCH_SIZE'])
+        self.word_count = word_count or config['WORD_COUNT']
+        self.quality = quality or config['QUALITY']
+        self.prioritize = config['PRIORITIZE'] if prioritize is None else prioritize
+        self.priority_window = max(1, priority_window or config['PRIORITY_WINDOW'])
+        self.min_score = config['MIN_SCORE'] if min_score is None else min_score
+        self.scorer = scorer or JobScorer()
+
+    def ingest(self, path: str, checkpoint_path: str = None, retry_failed: bool = False,
+               limit: int = None) -> dict:
+        """
+        Verarbeitet alle Jobs einer Datei
+
+        Args:
+            path: JSONL- oder CSV-Datei
+            checkpoint_path: Checkpoint-Datei (Default: <path>.checkpoint.json)
+            retry_failed: Fehlgeschlagene Jobs aus früheren Läufen erneut versuchen
+            limit: Höchstens so viele Jobs in diesem Lauf verarbeiten
+
+        Returns:
+            dict mit processed, created, failed, skipped, filtered, cost
+
+        Raises:
+            FileNotFoundError: wenn die Datei nicht existiert
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Job-Datei nicht gefunden: {path}")
+
+        checkpoint = IngestionCheckpoint(checkpoint_path or f"{path}.checkpoint.json")
+        stats = {'processed': 0, 'created': 0, 'failed': 0, 'skipped': 0, 'filtered': 0, 'cost': 0.0}
+        buffer = []
+        pending = {}              # Future -> (Schlüssel, Job)
+        seen = set()
+
+        jobs = self._scored(read_jobs(path), stats)
+        chunk_size = max(self.batch_size, self.workers * 2)
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job-ingestion')
+        try:
+            for chunk in iter(lambda: list(islice(jobs, chunk_size)), []):
+                candidates = []
+                for job in chunk:
+                    key = job_key(job)
+                    if key in seen or key in checkpoint.done or (key in checkpoint.failed and not retry_failed):
+                        stats['skipped'] += 1
+                        continue
+                    if limit is not None and len(seen) >= limit:
+                        break
+                    seen.add(key)
+                    candidates.append((key, job))
+
+                # Vor dem (bezahlten) Aufruf prüfen - nie an fremde Aufträge anhängen
+                foreign = self._foreign_status(key for key, _ in candidates) if candidates else {}
+                for key, job in candidates:
+                    if key in foreign:
+                        self._reject(key, foreign[key], checkpoint, stats)
+                        continue
+
+                    # Höchstens zwei Jobs pro Worker in der Warteschlange - die Datei wird gestreamt
+                    while len(pending) >= self.workers * 2:
+                        self._collect(pending, buffer, checkpoint, stats)
+                        if len(buffer) >= self.batch_size:
+                            self._flush(buffer, checkpoint, stats)
+                    pending[pool.submit(self._process, job)] = (key, job)
+
+                if limit is not None and len(seen) >= limit:
+                    break
+
+            while pending:
+                self._collect(pending, buffer, checkpoint, stats)
+                if len(buffer) >= self.batch_size:
+                    self._flush(buffer, checkpoint, stats)
+        finally:
+            # Auch bei Abbruch (Strg+C): Fertiges speichern, Wartendes verwerfen
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._flush(buffer, checkpoint, stats)
+
+        stats['cost'] = round(stats['cost'], 4)
+        logger.info(f"Job-Import abgeschlossen: {stats}")
+        return stats
+
+    def _scored(self, jobs, stats: dict):
+        """
+        Bewertet die Jobs lokal, wenn Reihenfolge, Stufe oder Mindest-Score
+        davon abhängen - sonst wird die Datei unverändert gestreamt
+        """
+        if not (self.prioritize or self.min_score or self.quality == AUTO_QUALITY):
+            yield from jobs
+            return
+
+        jobs = iter(jobs)
+        while True:
+            # Fensterweise: Speicher bleibt begrenzt, sortiert wird innerhalb des Fensters
+            window = list(islice(jobs, self.priority_window))
+            if not window:
+                return
+
+            if self.prioritize:
+                scored = self.scorer.rank(window, text=lambda job: job['text'])
+            else:
+                scored = zip(window, self.scorer.score_many(job['text'] for job in window))
+
+            for job, job_score in scored:
+                if job_score.score < self.min_score:
+                    stats['filtered'] += 1
+                    continue
+                job['score'] = job_score.score
+                job['quality'] = job_score.quality if self.quality == AUTO_QUALITY else self.quality
+                yield job
+
+    @staticmethod
+    def _foreign_status(keys) -> dict:
+        """Schlüssel, deren Auftrag schon existiert und nicht OFFEN ist -> Status"""
+        return dict(
+            Auftrag.objects.filter(id__in=list(keys)).exclude(status='OFFEN').values_list('id', 'status')
+        )
+
+    @staticmethod
+    def _reject(key: str, status: str, checkpoint: IngestionCheckpoint, stats: dict):
+        stats['skipped'] += 1
+        checkpoint.failed[key] = f"Auftrag {key} existiert bereits mit Status {status}"
+        logger.warning(f"Job-Import: {checkpoint.failed[key]} - übersprungen")
+
+    def _job_quality(self, job: dict) -> str:
+        return job.get('quality') or self.quality
+
+    def _process(self, job: dict) -> dict:
+        return self.analyzer.create_arbeitsprobe(job['text'], word_count=self.word_count, quality=self._job_quality(job))
+
+    def _collect(self, pending: dict, buffer: list, checkpoint: IngestionCheckpoint, stats: dict):
+        """Wartet auf mindestens einen fertigen Job und übernimmt die Ergebnisse"""
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            key, job = pending.pop(future)
+            stats['processed'] += 1
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+
+            stats['cost'] += result.get('cost', 0.0) or 0.0
+            if result.get('success'):
+                buffer.append((key, job, result))
+            else:
+                stats['failed'] += 1
+                checkpoint.failed[key] = result.get('error') or 'Unbekannter Fehler'
+                logger.warning(f"Job-Import: {key} fehlgeschlagen: {checkpoint.failed[key]}")
+
+    def _flush(self, buffer: list, checkpoint: IngestionCheckpoint, stats: dict):
+        """Speichert gesammelte Ergebnisse in einer Transaktion und aktualisiert den Checkpoint"""
+        # Auftrag kann während der Generierung angelegt oder aktiviert worden sein
+        foreign = self._foreign_status(key for key, _, _ in buffer) if buffer else {}
+        for key, status in foreign.items():
+            self._reject(key, status, checkpoint, stats)
+        buffer[:] = [entry for entry in buffer if entry[0] not in foreign]
+
+        if not buffer:
+            checkpoint.save()
+            return
+
+        auftraege = []
+        arbeitsproben = []
+        for key, job, result in buffer:
+            title = result.get('generated_title') or job['title'] or key
+            auftraege.append(Auftrag(
+                id=key,
+                titel=(job['title'] or title)[:200],
+                beschreibung=job['text'],
+                status='OFFEN'
+            ))
+            arbeitsprobe = Arbeitsprobe(
+                auftrag_id=key,
+                generated_title=title[:200],
+                content=result['content'],
+                quality=self._job_quality(job),
+                upwork_job_url=job['url'],
+                upwork_job_description=job['text']
+            )
+            arbeitsprobe.api_kosten = arbeitsprobe.get_api_cost()
+            arbeitsproben.append(arbeitsprobe)
+
+        with transaction.atomic():
+            # OFFENER Auftrag existiert evtl. schon (früherer Import desselben Jobs)
+            Auftrag.objects.bulk_create(auftraege, ignore_conflicts=True)
+            Arbeitsprobe.objects.bulk_create(arbeitsproben)
+
+        for key, _, _ in buffer:
+            checkpoint.done.add(key)
+            checkpoint.failed.pop(key, None)
+        checkpoint.save()
+
+        stats['created'] += len(arbeitsproben)
+        logger.info(f"Job-Import: {len(arbeitsproben)} Arbeitsproben gespeichert ({stats['created']} gesamt)")
+        buffer.clear()
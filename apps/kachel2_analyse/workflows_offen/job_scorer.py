@@ -0,0 +1,200 @@
+"""
+Job Scorer - lokale Vorauswahl von Upwork-Jobs nach erwartetem Wert
+
+Läuft komplett lokal (keine API-Kosten) und entscheidet, wer die teure
+Opus/Sonnet-Kapazität bekommt:
+- Review (Sonnet + Opus-Verbesserung) nur für hoch bewertete Jobs
+- Qualitätsstufe (bronze/silber/gold) aus dem Score
+- Verarbeitungsreihenfolge: beste Jobs zuerst (rank)
+
+Der Score (0-100) setzt sich zusammen aus
+- Wert: geschätztes Auftragsvolumen in $ - Festpreis bzw. bei Stundenjobs
+  Stundensatz x Stunden/Woche x Wochen
+- Passung: Confidence der Kategorie-Erkennung
+- Text: Ausführlichkeit der Beschreibung, positive Signale und Warnsignale
+"""
+import math
+import re
+from django.conf import settings
+from apps.kachel2_analyse.workflows_offen.category_detector import CategoryDetector, GENERAL_CATEGORY
+from apps.kachel2_analyse.workflows_offen.job_details import extract_job_details
+
+DEFAULT_SCORING_SETTINGS = {
+    'WEIGHT_VALUE': 0.5,
+    'WEIGHT_FIT': 0.2,
+    'WEIGHT_TEXT': 0.3,
+    'VALUE_CAP': 5000.0,          # $ - ab hier volle Wert-Punkte (logarithmisch)
+    'DEFAULT_HOURS': 10,          # Stunden/Woche wenn nicht angegeben
+    'DEFAULT_WEEKS': 4,           # Dauer wenn nicht angegeben
+    'UNKNOWN_VALUE': 5.0,         # $ - Jobs ohne Budget ranken wie ein Minimal-Auftrag
+    'REVIEW_MIN_SCORE': 60,       # ab hier Sonnet-Review + Opus-Verbesserung
+    'SILBER_MIN_SCORE': 45,
+    'GOLD_MIN_SCORE': 70,
+}
+
+WEEKS_PER_MONTH = 4.33
+DETAILED_WORDS = 150              # Ab dieser Länge gilt eine Beschreibung als ausführlich
+
+_POSITIVE_RE = re.compile(
+    r'\b(?:long[- ]term|ongoing|weekly|monthly|series|multiple videos|retainer|'
+    r'expert|senior|experienced|top[- ]tier|professional)\b',
+    re.IGNORECASE
+)
+_NEGATIVE_RE = re.compile(
+    r'\b(?:free|unpaid|cheap|low budget|exposure|test (?:article|script)|'
+    r'sample only|revenue share)\b',
+    re.IGNORECASE
+)
+
+
+def get_scoring_settings() -> dict:
+    """
+    Gewichte und Schwellen (settings.JOB_SCORING mit Defaults)
+    """
+    config = dict(DEFAULT_SCORING_SETTINGS)
+    config.update(getattr(settings, 'JOB_SCORING', {}) or {})
+    return config
+
+
+class JobScore:
+    """Ergebnis der Vorauswahl für einen Job"""
+
+    __slots__ = ('score', 'expected_value', 'quality', 'review', 'features')
+
+    def __init__(self, score: float, expected_value, quality: str, review: bool, features: dict):
+        self.score = score                      # 0-100
+        self.expected_value = expected_value    # $ oder None ohne Budget
+        self.quality = quality                  # bronze/silber/gold
+        self.review = review
+        self.features = features
+
+    def to_dict(self) -> dict:
+        return {
+            'score': self.score,
+            'expected_value': self.expected_value,
+            'quality': self.quality,
+            'review': self.review,
+            'features': self.features,
+        }
+
+    def __repr__(self):
+        return f"JobScore({self.score}, quality={self.quality!r}, review={self.review})"
+
+
+class JobScorer:
+    """
+    Bewertet Jobs lokal nach erwartetem Wert
+
+    Beispiel:
+        scorer = JobScorer()
+        scorer.score(job_text).review
+        for job, job_score in scorer.rank(jobs, text=lambda job: job['text']): ...
+    """
+
+    def __init__(self, config: dict = None):
+        self.config = config or get_scoring_settings()
+        self.detector = CategoryDetector()
+
+    def expected_value(self, details: dict):
+        """
+        Geschätztes Auftragsvolumen in $ - None wenn kein Budget angegeben ist
+        """
+        if details.get('budget_min') is None:
+            return None
+
+        budget = (details['budget_min'] + details['budget_max']) / 2
+        if details.get('budget_type') != 'hourly':
+            return budget
+
+        if details.get('hours_min') is None and details.get('hours_max') is None:
+            hours = self.config['DEFAULT_HOURS']
+        elif details.get('hours_min') is None:
+            hours = details['hours_max'] / 2      # "Less than 30 hrs/week"
+        elif details.get('hours_max') is None:
+            hours = details['hours_min']
+        else:
+            hours = (details['hours_min'] + details['hours_max']) / 2
+
+        if details.get('duration_min') is None:
+            weeks = self.config['DEFAULT_WEEKS']
+        else:
+            weeks = (details['duration_min'] + details['duration_max']) / 2
+            if details.get('duration_unit') == 'months':
+                weeks *= WEEKS_PER_MONTH
+
+        return budget * hours * weeks
+
+    def score(self, job_text: str, details: dict = None, category=None) -> JobScore:
+        """
+        Bewertet einen Job
+
+        Args:
+            job_text: Text der Upwork-Jobbeschreibung
+            details: Ergebnis von extract_job_details (wird sonst berechnet)
+            category: CategoryResult (wird sonst berechnet)
+        """
+        details = details or extract_job_details(job_text)
+        category = category or self.detector.detect_category(job_text)
+        config = self.config
+
+        value = self.expected_value(details)
+        # Ohne Budget über denselben Maßstab - liegt nie über einem echten Budget ab UNKNOWN_VALUE
+        scored_value = config['UNKNOWN_VALUE'] if value is None else value
+        value_score = min(1.0, math.log1p(max(0.0, scored_value)) / math.log1p(config['VALUE_CAP']))
+
+        fit_score = 0.0 if category.category == GENERAL_CATEGORY else category.confidence / 100
+
+        positives = len(_POSITIVE_RE.findall(job_text or ''))
+        negatives = len(_NEGATIVE_RE.findall(job_text or ''))
+        length_score = min(1.0, len((job_text or '').split()) / DETAILED_WORDS)
+        text_score = min(1.0, max(0.0, 0.25 + 0.5 * length_score + 0.1 * positives - 0.25 * negatives))
+
+        score = round(100 * (
+            config['WEIGHT_VALUE'] * value_score
+            + config['WEIGHT_FIT'] * fit_score
+            + config['WEIGHT_TEXT'] * text_score
+        ), 1)
+
+        if score >= config['GOLD_MIN_SCORE']:
+            quality = 'gold'
+        elif score >= config['SILBER_MIN_SCORE']:
+            quality = 'silber'
+        else:
+            quality = 'bronze'
+
+        return JobScore(
+            score=score,
+            expected_value=None if value is None else round(value, 2),
+            quality=quality,
+            review=score >= config['REVIEW_MIN_SCORE'],
+            features={
+                'value': round(value_score, 3),
+                'fit': round(fit_score, 3),
+                'text': round(text_score, 3),
+                'category': category.category,
+                'positive_signals': positives,
+                'negative_signals': negatives,
+            }
+        )
+
+    def score_many(self, job_texts) -> list:
+        """
+        Batch-API: Scores für viele Job-Texte (gleiche Reihenfolge)
+        """
+        return [self.score(job_text) for job_text in job_texts]
+
+    def rank(self, jobs, text=None) -> list:
+        """
+        Sortiert Jobs nach Score (beste zuerst)
+
+        Args:
+            jobs: Job-Texte oder beliebige Objekte
+            text: Liefert den Job-Text eines Objekts (Default: das Objekt selbst)
+
+        Returns:
+            Liste von (job, JobScore), absteigend nach Score - bei Gleichstand
+            bleibt die ursprüngliche Reihenfolge erhalten
+        """
+        text = text or (lambda job: job)
+        scored = [(job, self.score(text(job))) for job in jobs]
+        return sorted(scored, key=lambda item: -item[1].score)
@@ -8,14 +8,54 @@ WICHTIG:
 """
 import logging
 import requests
-import os
-import re
+import time
 import json
+import threading
 from django.conf import settings
 from apps.kachel2_analyse.services.script_generator_service import OpusScriptGenerator
+from apps.kachel2_analyse.services.async_runner import get_executor
+from apps.kachel2_analyse.services.http_transport import get_serper_transport
+from apps.kachel2_analyse.services.keyword_extractor import KeywordExtractor, job_documents
+from apps.kachel2_analyse.services.openrouter.opus_service import OpusService
+from apps.kachel2_analyse.services.openrouter.sonnet_service import SonnetService
+from apps.kachel2_analyse.services.stream_guard import generate_abortable, generate_guarded
+from apps.kachel2_analyse.workflows_offen.category_detector import CategoryDetector
+from apps.kachel2_analyse.workflows_offen.job_details import extract_job_details
+from apps.kachel2_analyse.workflows_offen.job_scorer import JobScorer
+from core.rate_limiter import get_rate_limiter, parse_retry_after, RateLimitTimeout
+from core.resilience import Deadline, hedged_call, get_latency_tracker
+from core.task_graph import TaskGraph
 
 logger = logging.getLogger(__name__)
 
+# Legacy-Pipeline: Serper-Recherche nur wenn ein Key konfiguriert ist
+SERPER_API_KEY = getattr(settings, 'SERPER_API_KEY', None)
+SERPER_TIMEOUT = 30  # Sekunden (Read-Timeout, Connect-Timeout aus HTTP_TRANSPORT)
+UPWORK_KEYWORDS = 8  # Keywords pro Job im lokalen Fallback (KeywordExtractor)
+
+# Strukturierter Modus: Titel, Briefing und Keywords in EINEM Aufruf
+# (Anweisungen vor den Job-Daten, siehe analyze_job)
+ANALYSIS_INSTRUCTIONS = """
+Analysiere den Upwork-Job unten und erstelle das Material für eine Script-Arbeitsprobe.
+WICHTIG: Arbeitsprobe, KEINE Bewerbung! Keine Ich-Form, kein "Hire me".
+
+1. "title": YOUTUBE SCRIPT TITLE (max. 60 Zeichen), clickbait-würdig, passend zur Job-Nische,
+   weckt Neugier (Zahlen, Versprechen, Geheimnisse).
+   Beispiele: "7 ChatGPT Tricks That Broke The Algorithm", "The 10 Minutes That Decided D-Day"
+
+2. "briefing": BRIEFING für den Script-Writer, basierend auf dem Titel, mit den Abschnitten
+   === TITEL-INTERPRETATION ===, === ZIELGRUPPE ===, === KERN-BOTSCHAFTEN FÜR SCRIPT ===,
+   === SCRIPT-ANFORDERUNGEN ===, === EMPFOHLENE TONALITÄT ===, === KONKRETE INHALTE FÜR SCRIPT ===
+
+3. "keywords": 8 relevante Keywords aus dem Job (Skills, Tools, Deliverables, Branchenbegriffe)
+
+Antworte NUR mit JSON in diesem Format:
+{"title": "...", "briefing": "...", "keywords": ["...", "..."]}
+"""
+
+# Hinweise auf Bewerbungstext statt Briefing
+APPLICATION_PHRASES = ['hi there', "i'm excited", 'best regards', 'let me help']
+
 
 class UpworkAnalyzer:
     """
@@ -32,7 +72,7 @@ class UpworkAnalyzer:
         # KEIN Serper für offene Aufträge!
 
     def create_arbeitsprobe(self, upwork_text: str, word_count: int = 500,
-                            quality: str = 'bronze') -> dict:
+                            quality: str = 'bronze', deadline_seconds: float = None) -> dict:
         """
         Erstellt Arbeitsprobe mit GENERIERTEM Titel
 
@@ -40,23 +80,30 @@ class UpworkAnalyzer:
             upwork_text: Text der Upwork-Jobbeschreibung
             word_count: Gewünschte Wortanzahl
             quality: bronze/silber/gold
+            deadline_seconds: Gesamtbudget des Workflows
+                (Default: settings.WORKFLOW_DEADLINES['create_arbeitsprobe'])
 
         Returns:
             dict mit generierter Arbeitsprobe
         """
         logger.info(f"Erstelle Arbeitsprobe für OFFENEN Auftrag (Qualität: {quality})")
 
+        deadline = Deadline(
+            deadline_seconds or settings.WORKFLOW_DEADLINES['create_arbeitsprobe']
+        )
+
         try:
             # 1. Titel generieren (aus Job-Beschreibung)
-            generated_title = self.analyze_job(upwork_text)['title']
+            generated_title = self.analyze_job(upwork_text, deadline=deadline)['title']
 
-            # 2. Arbeitsprobe erstellen
+            # 2. Arbeitsprobe erstellen - mit der verbleibenden Zeit
             result = self.script_generator.generate(
                 title=generated_title,  # GENERIERT!
                 description=f"Arbeitsprobe basierend auf: {upwork_text[:200]}...",
                 keywords='',
                 word_count=word_count,
-                quality=quality
+                quality=quality,
+                deadline=deadline
             )
 
             if result['success']:
@@ -74,9 +121,82 @@ class UpworkAnalyzer:
                 'workflow_type': 'OFFEN'
             }
 
-    def analyze_job(self, upwork_text: str) -> dict:
+    def create_arbeitsproben_batch(self, upwork_text: str, word_count: int = 500,
+                                   qualities=('bronze', 'silber', 'gold'),
+                                   deadline_seconds: float = None) -> dict:
+        """
+        Erstellt Arbeitsproben mehrerer Qualitätsstufen für denselben Job
+
+        Der Titel wird EINMAL generiert und von allen Stufen geteilt,
+        die Stufen selbst laufen gleichzeitig.
+
+        Args:
+            upwork_text: Text der Upwork-Jobbeschreibung
+            word_count: Gewünschte Wortanzahl (für alle Stufen)
+            qualities: Qualitätsstufen
+            deadline_seconds: Gesamtbudget
+                (Default: settings.WORKFLOW_DEADLINES['create_arbeitsproben_batch'])
+
+        Returns:
+            dict mit 'results' (Ergebnis pro Qualitätsstufe), 'generated_title' und 'cost'
+        """
+        logger.info(f"Erstelle Arbeitsproben-Batch für OFFENEN Auftrag (Qualitäten: {', '.join(qualities)})")
+
+        deadline = Deadline(
+            deadline_seconds or settings.WORKFLOW_DEADLINES['create_arbeitsproben_batch']
+        )
+
+        try:
+            # 1. Titel EINMAL generieren
+            generated_title = self.analyze_job(upwork_text, deadline=deadline)['title']
+
+            # 2. Alle Stufen gleichzeitig - gemeinsame Deadline
+            futures = {
+                quality: get_executor().submit(
+                    self.script_generator.generate,
+                    title=generated_title,  # GENERIERT!
+                    description=f"Arbeitsprobe basierend auf: {upwork_text[:200]}...",
+                    keywords='',
+                    word_count=word_count,
+                    quality=quality,
+                    deadline=deadline
+                )
+                for quality in qualities
+            }
+            results = {quality: future.result() for quality, future in futures.items()}
+
+            for result in results.values():
+                if result['success']:
+                    result['workflow_type'] = 'OFFEN'
+                    result['title_source'] = 'GENERIERT'
+                    result['generated_title'] = generated_title
+
+            succeeded = [quality for quality, result in results.items() if result['success']]
+            logger.info(f"Arbeitsproben-Batch fertig - erfolgreich: {', '.join(succeeded) or 'keine'}")
+
+            return {
+                'success': bool(succeeded),
+                'generated_title': generated_title,
+                'results': results,
+                'cost': sum(result.get('cost', 0.00) for result in results.values()),
+                'workflow_type': 'OFFEN'
+            }
+
+        except Exception as e:
+            logger.error(f"Fehler bei Arbeitsproben-Batch: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'workflow_type': 'OFFEN'
+            }
+
+    def analyze_job(self, upwork_text: str, deadline=None) -> dict:
         """
         Analysiert Upwork-Job und generiert passenden Titel
+
+        Args:
+            upwork_text: Text der Upwork-Jobbeschreibung
+            deadline: Optionale Deadline (Titel-Aufruf erhält nur die Restzeit)
         """
         # Vereinfachte Titel-Generierung
         title_prompt = f"""
@@ -91,11 +211,7 @@ class UpworkAnalyzer:
 
         try:
             # Nutze Gemini für schnelle Titel-Generierung
-            result = self.script_generator.gemini.generate_content(
-                prompt=title_prompt,
-                max_tokens=100,
-                temperature=0.5
-            )
+            result = self._generate_title(title_prompt, deadline)
 
             if result['success']:
                 generated_title = result['content'].strip().strip('"')
@@ -120,160 +236,262 @@ class UpworkAnalyzer:
                 'error': str(e)
             }
 
+    def _generate_title(self, title_prompt: str, deadline=None) -> dict:
+        """
+        Titel-Aufruf an Gemini - optional gehedged
+
+        Antwortet Gemini nicht innerhalb der p95-Latenz der Titel-Aufrufe,
+        wird ein Duplikat gestartet und die erste erfolgreiche Antwort genommen.
+        Die Latenz wird getrennt von Gemini-Scripts gemessen (eigener Tracker),
+        sonst würde die Schwelle auf Script-Dauer anwachsen.
+        """
+        gemini = self.script_generator.gemini
+        tracker = get_latency_tracker(f"title:{gemini.model}")
+
+        def _call(coalesce=True):
+            started = time.monotonic()
+            result = gemini.generate_content(
+                prompt=title_prompt,
+                max_tokens=100,
+                temperature=0.5,
+                use_cache=True,  # Identischer Job-Text -> identischer Titel-Prompt
+                deadline=deadline,
+                coalesce=coalesce
+            )
+            # Cache-Treffer würden die Perzentile nach unten ziehen
+            if result['success'] and not result.get('cached'):
+                tracker.record(time.monotonic() - started)
+            return result
+
+        hedging = settings.LLM_HEDGING
+        if not hedging['ENABLED']:
+            return _call()
+
+        p95 = tracker.percentile(hedging['PERCENTILE'])
+        hedge_after = max(hedging['MIN_DELAY'], p95 if p95 is not None else hedging['DEFAULT_DELAY'])
+
+        # Duplikat ohne Single-Flight, sonst würde es auf den Original-Aufruf warten
+        return hedged_call(
+            _call, hedge_after, hedge_func=lambda: _call(coalesce=False), executor=get_executor()
+        )
+
 
 # Legacy-Funktionen für Kompatibilität
-def call_opus_41(prompt):
-    """Call Claude Opus 4.1 via OpenRouter API"""
+def call_opus_41(prompt, use_cache=False, max_tokens=1000, deadline=None):
+    """Call Claude Opus 4.1 via OpenRouter API (deadline: optionale Restzeit des Workflows)"""
     try:
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "anthropic/claude-opus-4.1",
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 1000
-            }
+        result = OpusService().generate_content(
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=0.7,
+            use_cache=use_cache,
+            deadline=deadline
         )
         
-        if response.status_code == 200:
-            return response.json()['choices'][0]['message']['content']
+        if result['success']:
+            return result['content']
         else:
-            print(f"OpenRouter Error: {response.status_code}")
+            logger.error(f"OpenRouter Error: {result['error']}")
             return None
     except Exception as e:
-        print(f"API Error: {e}")
+        logger.error(f"API Error: {e}")
+        return None
+
+def call_opus_41_guarded(prompt, forbidden, retry_prompt=None, deadline=None):
+    """
+    Call Claude Opus 4.1 als Stream - bricht bei verbotenen Phrasen sofort ab
+    und startet direkt den zweiten Versuch mit retry_prompt
+    (deadline: optionale Restzeit des Workflows, gilt für jeden Versuch)
+    """
+    try:
+        result = generate_guarded(
+            OpusService(),
+            prompt,
+            forbidden=forbidden,
+            retry_prompt=retry_prompt,
+            max_tokens=1000,
+            temperature=0.7,
+            deadline=deadline
+        )
+        if result['success']:
+            return result['content']
+        logger.error(f"OpenRouter Error: {result['error']}")
+        return None
+    except Exception as e:
+        logger.error(f"API Error: {e}")
+        return None
+
+def call_opus_41_abortable(prompt, abort, max_tokens=1000):
+    """
+    Call Claude Opus 4.1 als Stream, den abort (threading.Event) abbrechen kann
+
+    Nach einem Abbruch werden Prompt und bereits erzeugte Tokens trotzdem berechnet.
+    """
+    try:
+        result = generate_abortable(OpusService(), prompt, abort, max_tokens=max_tokens, temperature=0.7)
+        if result['success']:
+            return result['content']
+        if not result['aborted']:
+            logger.error(f"OpenRouter Error: {result['error']}")
+        return None
+    except Exception as e:
+        logger.error(f"API Error: {e}")
         return None
 
 def call_sonnet_4(prompt):
     """Call Claude Sonnet 4 for reviews via OpenRouter"""
     try:
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "anthropic/claude-sonnet-4",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.3,
-                "max_tokens": 500
-            }
+        result = SonnetService(model="anthropic/claude-sonnet-4").generate_content(
+            prompt=prompt,
+            max_tokens=500,
+            temperature=0.3
         )
-        if response.status_code == 200:
-            return response.json()['choices'][0]['message']['content']
+        if result['success']:
+            return result['content']
         return None
     except Exception as e:
-        print(f"Sonnet API Error: {e}")
+        logger.error(f"Sonnet API Error: {e}")
         return None
 
 def serper_search(query):
-    """Search Google via Serper API"""
+    """
+    Search Google via Serper API
+
+    Über den gepoolten Serper-Transport mit Read-Timeout und Rate-Limit -
+    ein hängender Aufruf blockiert keinen Worker dauerhaft.
+    """
     if not SERPER_API_KEY:
         return []
     
     try:
-        response = requests.post(
-            url="https://google.serper.dev/search",
-            headers={
-                "X-API-KEY": SERPER_API_KEY,
-                "Content-Type": "application/json"
-            },
-            json={
-                "q": query,
-                "num": 5
-            }
-        )
-        
+        with get_rate_limiter('serper').slot() as slot:
+            response = get_serper_transport().post(
+                '/search', json={"q": query, "num": 5}, timeout=SERPER_TIMEOUT
+            )
+            slot.record_status(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+
         if response.status_code == 200:
             results = response.json()
             return results.get('organic', [])
         else:
-            print(f"Serper Error: {response.status_code}")
+            logger.warning(f"Serper Error: {response.status_code}")
             return []
-    except Exception as e:
-        print(f"Serper Error: {e}")
+    except (requests.exceptions.RequestException, RateLimitTimeout, ValueError) as e:
+        logger.warning(f"Serper Error: {e}")
         return []
 
-def extract_job_details(job_text):
-    """Extract budget, hours, duration from job text"""
-    details = {
-        'budget': 'Nicht angegeben',
-        'hours': 'Nicht angegeben', 
-        'duration': 'Nicht angegeben'
-    }
-    
-    # Budget extrahieren ($X-$Y oder $X.00 - $Y.00)
-    budget_patterns = [
-        r'\$(\d+(?:\.\d{2})?)\s*[-â€“]\s*\$(\d+(?:\.\d{2})?)',
-        r'\$(\d+)\s*to\s*\$(\d+)',
-        r'\$(\d+)/hr',
-        r'\$(\d+)\s*hourly'
-    ]
-    for pattern in budget_patterns:
-        if match := re.search(pattern, job_text, re.IGNORECASE):
-            if len(match.groups()) == 2:
-                details['budget'] = f"${match.group(1)}-${match.group(2)}"
-            else:
-                details['budget'] = f"${match.group(1)}/Stunde"
-            break
-    
-    # Stunden extrahieren
-    hours_patterns = [
-        r'(\d+)\+?\s*hrs?/week',
-        r'(\d+)\+?\s*hours?\s*per\s*week',
-        r'More than\s*(\d+)\s*hrs?/week',
-        r'(\d+)-(\d+)\s*hrs?/week'
-    ]
-    for pattern in hours_patterns:
-        if match := re.search(pattern, job_text, re.IGNORECASE):
-            if len(match.groups()) == 2:
-                details['hours'] = f"{match.group(1)}-{match.group(2)} Stunden/Woche"
-            else:
-                details['hours'] = f"{match.group(1)}+ Stunden/Woche"
-            break
-    
-    # Dauer extrahieren
-    duration_patterns = [
-        r'(\d+)\s*to\s*(\d+)\s*months?',
-        r'(\d+)-(\d+)\s*months?',
-        r'(\d+)\s*months?',
-        r'(\d+)\s*weeks?'
-    ]
-    for pattern in duration_patterns:
-        if match := re.search(pattern, job_text, re.IGNORECASE):
-            if len(match.groups()) == 2:
-                details['duration'] = f"{match.group(1)}-{match.group(2)} Monate"
-            elif 'week' in pattern:
-                details['duration'] = f"{match.group(1)} Wochen"
-            else:
-                details['duration'] = f"{match.group(1)} Monate"
-            break
-    
-    return details
-
-def needs_review(job_text, confidence):
-    """Determine if review is needed"""
-    # Review bei wichtigen Jobs oder unsicherer Kategorie
-    if "$100" in job_text or "$200" in job_text or "$300" in job_text:
-        return True
-    if confidence < 80:
-        return True
-    if "expert" in job_text.lower() or "top-tier" in job_text.lower():
-        return True
-    return False
-
-def review_and_improve(title, description, keywords, job_text):
+def parse_structured_analysis(content):
+    """
+    Liest Titel, Briefing und Keywords aus der JSON-Antwort des strukturierten Modus
+
+    Returns:
+        dict mit title/briefing/keywords oder None wenn die Antwort unbrauchbar ist
+    """
+    if not content:
+        return None
+
+    start, end = content.find('{'), content.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(content[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    title = data.get('title')
+    briefing = data.get('briefing')
+    keywords = data.get('keywords')
+    if isinstance(keywords, list):
+        keywords = ', '.join(str(keyword).strip() for keyword in keywords if str(keyword).strip())
+
+    if not all(isinstance(value, str) and value.strip() for value in (title, briefing, keywords)):
+        return None
+    if len(title.strip()) > 100:
+        return None
+    if any(phrase in briefing.lower() for phrase in APPLICATION_PHRASES):
+        return None
+
+    return {'title': title.strip(), 'briefing': briefing.strip(), 'keywords': keywords.strip()}
+
+def needs_review(job_text, confidence=None, *, job_score=None):
+    """
+    Determine if review is needed
+
+    Review (Sonnet + Opus) nur für Jobs mit hohem lokalem Score - siehe JobScorer
+
+    Args:
+        job_text: Text der Upwork-Jobbeschreibung
+        confidence: Nur noch für bestehende Aufrufer needs_review(text, confidence) -
+            die Kategorie-Konfidenz fließt bereits in den JobScore ein
+        job_score: Bereits berechneter JobScore (wird sonst berechnet)
+    """
+    job_score = job_score or JobScorer().score(job_text)
+    return job_score.review
+
+def create_improve_prompt(title, description, review=None):
+    """
+    Opus-Prompt zur Verbesserung des Script-Titels
+
+    Ohne review (spekulativer Modus) gibt es noch kein Feedback - verbessert
+    wird dann nach denselben Kriterien, die der Sonnet-Review bewertet.
+    """
+    if review:
+        intro = "Improve this YOUTUBE SCRIPT TITLE based on feedback:"
+        feedback = f"\n        REVIEW FEEDBACK: {review}\n"
+    else:
+        intro = "Improve this YOUTUBE SCRIPT TITLE:"
+        feedback = (
+            "\n        A reviewer will score: clickbait-worthiness for YouTube, expertise in the niche,"
+            "\n        and whether the briefing is clear for script creation (1-10 each).\n"
+        )
+
+    return f"""
+        {intro}
+
+        ORIGINAL SCRIPT TITLE: {title}
+        ORIGINAL BRIEFING: {description}
+        {feedback}
+        Generate an IMPROVED YOUTUBE SCRIPT TITLE that:
+        1. Is more clickbait-worthy
+        2. Shows expertise better
+        3. Fits the job niche
+        4. Maximum 60 characters
+
+        CRITICAL: Return a YOUTUBE VIDEO TITLE, not an application title!
+        No "Experienced", "Available", "Hire me" etc.
+
+        Examples of good script titles:
+        - "The Hidden Truth About [Topic]"
+        - "Why [Thing] Changes Everything"
+        - "[Number] Secrets That [Result]"
+
+        Return format:
+        Title: [YouTube script title]
+        Description: [Updated briefing if needed]
+        """
+
+def review_and_improve(title, description, keywords, job_text, quality=None):
     """
     Sonnet reviews SCRIPT TITLE and BRIEFING for work sample quality
     NICHT für Bewerbungen!
+
+    Spekulativer Modus (settings.SPECULATIVE_IMPROVE pro Qualitätsstufe, Default aus):
+    Die Opus-Verbesserung startet gleichzeitig mit dem Review - spart einen
+    Opus-Roundtrip. Ist der Score >= 8, wird ihr Stream abgebrochen; bezahlt
+    sind dann trotzdem der Prompt und die bis dahin erzeugten Tokens. Der
+    spekulative Vorschlag kennt das konkrete Review-Feedback nicht, nur die
+    Bewertungskriterien.
     """
+    speculative = bool(quality) and getattr(settings, 'SPECULATIVE_IMPROVE', {}).get(quality, False)
+    improve_future = None
+    abort_improve = threading.Event()
+    if speculative:
+        improve_future = get_executor().submit(
+            call_opus_41_abortable, create_improve_prompt(title, description), abort_improve
+        )
+
     review_prompt = f"""
     Review this YOUTUBE SCRIPT TITLE and BRIEFING for a work sample:
 
@@ -310,34 +528,10 @@ def review_and_improve(title, description, keywords, job_text):
 
     # If score < 8, improve with Opus - aber als SCRIPT TITEL!
     if score < 8 and review:
-        improve_prompt = f"""
-        Improve this YOUTUBE SCRIPT TITLE based on feedback:
-
-        ORIGINAL SCRIPT TITLE: {title}
-        ORIGINAL BRIEFING: {description}
-
-        REVIEW FEEDBACK: {review}
-
-        Generate an IMPROVED YOUTUBE SCRIPT TITLE that:
-        1. Is more clickbait-worthy
-        2. Shows expertise better
-        3. Fits the job niche
-        4. Maximum 60 characters
-
-        CRITICAL: Return a YOUTUBE VIDEO TITLE, not an application title!
-        No "Experienced", "Available", "Hire me" etc.
-
-        Examples of good script titles:
-        - "The Hidden Truth About [Topic]"
-        - "Why [Thing] Changes Everything"
-        - "[Number] Secrets That [Result]"
-
-        Return format:
-        Title: [YouTube script title]
-        Description: [Updated briefing if needed]
-        """
-
-        improved_response = call_opus_41(improve_prompt)
+        if improve_future is not None:
+            improved_response = improve_future.result()
+        else:
+            improved_response = call_opus_41(create_improve_prompt(title, description, review))
         if improved_response:
             # Extract improved parts - aber validiere dass es Script-Titel sind!
             if "Title:" in improved_response:
@@ -349,7 +543,7 @@ def review_and_improve(title, description, keywords, job_text):
                     title = new_title
                 else:
                     # Behalte Original wenn "Verbesserung" eine Bewerbung ist
-                    print(f"⚠️ Review tried to create application title, keeping original")
+                    logger.warning("Review wollte einen Bewerbungstitel erzeugen - Original bleibt erhalten")
 
             if "Description:" in improved_response:
                 new_description = improved_response.split("Description:")[1].strip()
@@ -357,27 +551,78 @@ def review_and_improve(title, description, keywords, job_text):
                 if not any(word in new_description.lower() for word in ["i'm", "i am", "my experience", "hire me"]):
                     description = new_description
 
+    elif improve_future is not None:
+        # Score gut genug - laufenden Opus-Stream abbrechen (bisherige Tokens sind bezahlt)
+        abort_improve.set()
+        logger.info(f"Spekulative Verbesserung abgebrochen (Review-Score {score}/10)")
+
     return title, description, keywords, score
 
-def analyze_job(data):
-    """Main function for job analysis workflow"""
+def analyze_job(data, deadline=None):
+    """
+    Main function for job analysis workflow
+
+    Die Schritte laufen als Abhängigkeitsgraph - unabhängige Schritte
+    (Keywords, Job-Details, Titel -> Briefing/Recherche) überlappen sich:
+
+        category ─ analysis ─┬─ title ─┬─ research
+                             │         └─ description ─┐
+                             ├─ keywords ──────────────┼─ review
+        category + details ─ score ────────────────────┘
+
+    Im strukturierten Modus (settings.UPWORK_ANALYSIS['STRUCTURED_OUTPUT'])
+    liefert EIN Aufruf Titel, Briefing und Keywords als JSON. Nur wenn die
+    Antwort nicht gültig ist, laufen die drei Einzelaufrufe. title, description
+    und keywords reichen dann nur das Ergebnis durch; parallel bleiben die
+    lokalen Schritte neben dem Opus-Aufruf und die Recherche neben dem Review.
+
+    Args:
+        data: dict mit 'text' (Upwork-Jobbeschreibung)
+        deadline: Deadline des Aufrufers
+            (Default: settings.WORKFLOW_DEADLINES['analyze_job'])
+
+    Raises:
+        DeadlineExceeded: wenn der Graph nicht innerhalb der Deadline fertig wird
+    """
     job_text = data.get('text', '')
-    
-    # SCHRITT 1: Category Detection (lokal)
-    detector = CategoryDetector()
-    category_result = detector.detect_category(job_text)
-    
-    # SCHRITT 2: Script-Titel fÃ¼r Arbeitsprobe generieren (GEÃ„NDERT!)
-    title_prompt = f"""
+    deadline = deadline or Deadline(settings.WORKFLOW_DEADLINES['analyze_job'])
+    structured = getattr(settings, 'UPWORK_ANALYSIS', {}).get('STRUCTURED_OUTPUT', False)
+
+    def _category():
+        # SCHRITT 1: Category Detection (lokal)
+        return CategoryDetector().detect_category(job_text)
+
+    def _analysis(category):
+        # SCHRITT 2 (strukturiert): Titel, Briefing und Keywords in einem Aufruf
+        if not structured:
+            return None
+        analysis_prompt = ANALYSIS_INSTRUCTIONS + f"""
+Job:
+{job_text[:1000]}
+
+Job-Kategorie: {category.category}
+Keywords gefunden: {', '.join(category.keywords_found[:5])}
+"""
+        analysis = parse_structured_analysis(call_opus_41(analysis_prompt, max_tokens=1500, deadline=deadline))
+        if analysis is None:
+            logger.warning("Strukturierte Analyse ungültig - verwende Einzelaufrufe")
+        return analysis
+
+    def _title(category, analysis):
+        if analysis:
+            return analysis['title']
+
+        # SCHRITT 2: Script-Titel für Arbeitsprobe generieren
+        title_prompt = f"""
     Create a YOUTUBE SCRIPT TITLE for a work sample that demonstrates expertise for this job:
     
     Job: {job_text[:500]}
-    Category: {category_result.category}
+    Category: {category.category}
     
-    WICHTIG: Dies ist ein SCRIPT-TITEL fÃ¼r eine Arbeitsprobe, KEINE Bewerbung!
+    WICHTIG: Dies ist ein SCRIPT-TITEL für eine Arbeitsprobe, KEINE Bewerbung!
     
     Der Titel soll:
-    1. Ein echter YouTube-Video-Titel sein (clickbait-wÃ¼rdig)
+    1. Ein echter YouTube-Video-Titel sein (clickbait-würdig)
     2. Zum Job-Thema passen und Kompetenz zeigen
     3. Neugier wecken (Zahlen, Versprechen, Geheimnisse)
     4. Maximum 60 Zeichen
@@ -394,72 +639,76 @@ def analyze_job(data):
     
     Return ONLY the script title, nothing else.
     """
-    
-    generated_title = call_opus_41(title_prompt)
-    if not generated_title:
-        generated_title = f"Expert {category_result.category.replace('_', ' ').title()} Specialist Available"
-    
-    # SCHRITT 3: Serper Recherche mit dem Titel
-    search_results = []
-    if SERPER_API_KEY:
-        search_query = f"{generated_title} freelance rates expertise"
-        search_results = serper_search(search_query)
-    
-    # Job Details extrahieren
-    job_details = extract_job_details(job_text)
+        generated_title = call_opus_41(title_prompt, deadline=deadline)
+        if not generated_title:
+            generated_title = f"Expert {category.category.replace('_', ' ').title()} Specialist Available"
+        return generated_title
+
+    def _research(title):
+        # SCHRITT 3: Serper Recherche mit dem Titel
+        if not SERPER_API_KEY:
+            return []
+        return serper_search(f"{title} freelance rates expertise")
+
+    def _description(title, category, analysis):
+        if analysis:
+            return analysis['briefing']
 
-    # SCHRITT 4: Titel-Analyse fÃ¼r Script-Briefing (GEÃ„NDERT!)
-    description_prompt = f"""
-    Analysiere diesen generierten Titel fÃ¼r Script-Erstellung:
-    "{generated_title.strip()}"
+        # SCHRITT 4: Titel-Analyse für Script-Briefing
+        description_prompt = f"""
+    Analysiere diesen generierten Titel für Script-Erstellung:
+    "{title.strip()}"
 
-    Job-Kategorie: {category_result.category}
-    Keywords gefunden: {', '.join(category_result.keywords_found[:5])}
+    Job-Kategorie: {category.category}
+    Keywords gefunden: {', '.join(category.keywords_found[:5])}
 
-    Erstelle ein BRIEFING fÃ¼r den Script-Writer in Spalte 3:
+    Erstelle ein BRIEFING für den Script-Writer in Spalte 3:
 
     === TITEL-INTERPRETATION ===
-    [Was verspricht dieser Titel konkret? Welches Problem lÃ¶st er?]
+    [Was verspricht dieser Titel konkret? Welches Problem löst er?]
 
     === ZIELGRUPPE ===
     [Wer ist der ideale Kunde basierend auf diesem Titel?]
 
-    === KERN-BOTSCHAFTEN FÃœR SCRIPT ===
-    â€¢ [Hauptversprechen 1 aus dem Titel]
-    â€¢ [Hauptversprechen 2 aus dem Titel]  
-    â€¢ [Hauptversprechen 3 aus dem Titel]
+    === KERN-BOTSCHAFTEN FÜR SCRIPT ===
+    • [Hauptversprechen 1 aus dem Titel]
+    • [Hauptversprechen 2 aus dem Titel]  
+    • [Hauptversprechen 3 aus dem Titel]
 
     === SCRIPT-ANFORDERUNGEN ===
-    â€¢ [Welche konkreten Elemente muss das Script haben?]
-    â€¢ [Welche Beweise/Beispiele sollten rein?]
-    â€¢ [Welche Resultate versprechen wir?]
+    • [Welche konkreten Elemente muss das Script haben?]
+    • [Welche Beweise/Beispiele sollten rein?]
+    • [Welche Resultate versprechen wir?]
 
-    === EMPFOHLENE TONALITÃ„T ===
+    === EMPFOHLENE TONALITÄT ===
     [Basierend auf Titel: Professionell/Casual/Technisch/Enthusiastisch?]
 
-    === KONKRETE INHALTE FÃœR SCRIPT ===
-    â€¢ [Tools/Methoden die zum Titel passen]
-    â€¢ [Zahlen/Metriken die Ã¼berzeugen]
-    â€¢ [Beispiele die den Titel unterstÃ¼tzen]
+    === KONKRETE INHALTE FÜR SCRIPT ===
+    • [Tools/Methoden die zum Titel passen]
+    • [Zahlen/Metriken die überzeugen]
+    • [Beispiele die den Titel unterstützen]
 
-    WICHTIG: Dies ist ein BRIEFING fÃ¼r Script-Erstellung basierend auf dem TITEL.
+    WICHTIG: Dies ist ein BRIEFING für Script-Erstellung basierend auf dem TITEL.
     KEINE Bewerbung! KEINE Job-Analyse! 
     Fokus: Was muss ins Script um den Titel-Versprechen gerecht zu werden?
     """
-    
-    generated_description = call_opus_41(description_prompt)
-    
-    # OPTIONAL: Validierung ob wirklich Briefing (nicht Bewerbung)
-    if generated_description and any(word in generated_description.lower() for word in ['hi there', "i'm excited", 'best regards', 'let me help']):
-        # Nochmal versuchen mit stÃ¤rkerem Prompt
-        retry_prompt = description_prompt + "\n\nKEINE BEWERBUNG! NUR TECHNISCHES BRIEFING! Keine Ich-Form!"
-        generated_description = call_opus_41(retry_prompt)
-    
-    if not generated_description:
-        generated_description = "Script-Briefing konnte nicht generiert werden."
-    
-    # SCHRITT 5: Keywords extrahieren
-    keywords_prompt = f"""
+        # Validierung ob wirklich Briefing (nicht Bewerbung) schon während des Streams:
+        # bei Bewerbungs-Phrasen Abbruch und sofort neuer Versuch mit stärkerem Prompt
+        generated_description = call_opus_41_guarded(
+            description_prompt,
+            forbidden=APPLICATION_PHRASES,
+            retry_prompt=description_prompt + "\n\nKEINE BEWERBUNG! NUR TECHNISCHES BRIEFING! Keine Ich-Form!",
+            deadline=deadline
+        )
+
+        return generated_description or "Script-Briefing konnte nicht generiert werden."
+
+    def _keywords(category, analysis):
+        if analysis:
+            return analysis['keywords']
+
+        # SCHRITT 5: Keywords extrahieren (unabhängig vom Titel)
+        keywords_prompt = f"""
     Extract 8 highly relevant keywords for an Upwork proposal from this job:
     {job_text[:300]}
 
@@ -473,26 +722,46 @@ def analyze_job(data):
     Format: keyword1, keyword2, keyword3...
     Return ONLY comma-separated keywords.
     """
-    
-    keywords = call_opus_41(keywords_prompt)
-    if not keywords:
-        keywords = ", ".join(category_result.keywords_found[:8])
-
-    # NEUE SECTION: Second Opinion Review
-    # TEMPORÄRER FIX - Review deaktivieren falls weiter Probleme
-    review_needed = needs_review(job_text, category_result.confidence)  # Normal
-    # review_needed = False  # Uncomment to disable review completely
-    review_score = 0
-    
-    if review_needed:
+        keywords = call_opus_41(keywords_prompt, use_cache=True, deadline=deadline)
+        if not keywords:
+            # Lokaler Fallback (TF-IDF) - jeder Satz des Jobs ist ein eigenes Dokument
+            ranked = KeywordExtractor().extract(job_documents(job_text), top_n=UPWORK_KEYWORDS)
+            keywords = ', '.join(keyword for keyword, _ in ranked)
+        return keywords or ", ".join(category.keywords_found[:8])
+
+    def _review(score, title, description, keywords):
+        # Second Opinion Review
+        # TEMPORÄRER FIX - Review deaktivieren falls weiter Probleme
+        review_needed = needs_review(job_text, job_score=score)  # Normal
+        # review_needed = False  # Uncomment to disable review completely
+        if not review_needed:
+            return title, description, keywords, 0, False
+
         # Sonnet 4 Review + Potential Improvement
-        generated_title, generated_description, keywords, review_score = review_and_improve(
-            generated_title.strip(),
-            generated_description.strip(),
+        return (*review_and_improve(
+            title.strip(),
+            description.strip(),
             keywords.strip(),
-            job_text[:1000]
-        )
-    
+            job_text[:1000],
+            quality=score.quality
+        ), True)
+
+    graph = TaskGraph('analyze_job')
+    graph.add('category', _category)
+    graph.add('details', lambda: extract_job_details(job_text))
+    graph.add('score', lambda category, details: JobScorer().score(job_text, details, category),
+              deps=['category', 'details'])
+    graph.add('analysis', _analysis, deps=['category'])
+    graph.add('title', _title, deps=['category', 'analysis'])
+    graph.add('research', _research, deps=['title'])
+    graph.add('description', _description, deps=['title', 'category', 'analysis'])
+    graph.add('keywords', _keywords, deps=['category', 'analysis'])
+    graph.add('review', _review, deps=['score', 'title', 'description', 'keywords'])
+    results = graph.run(deadline=deadline)
+
+    category_result = results['category']
+    generated_title, generated_description, keywords, review_score, review_needed = results['review']
+
     # Django-kompatibel: Return dict statt jsonify
     return {
         'category': category_result.category,
@@ -500,7 +769,12 @@ def analyze_job(data):
         'title': generated_title.strip(),
         'description': generated_description.strip(),
         'keywords': keywords.strip(),
-        'research_count': len(search_results),
+        'job_details': results['details'],
+        'job_score': results['score'].score,
+        'suggested_quality': results['score'].quality,
+        'research_count': len(results['research']),
         'review_score': review_score,
-        'reviewed': review_needed
-    }
\ No newline at end of file
+        'reviewed': review_needed,
+        'structured': results['analysis'] is not None,
+        'timings': graph.timings
+    }
@@ -153,6 +153,189 @@ SERPER_API_KEY = os.getenv('SERPER_API_KEY')          # NUR für AKTIVE Aufträg
 COPYSCAPE_API_KEY = os.getenv('COPYSCAPE_API_KEY')    # Für beide Workflows
 DOCRAPTOR_API_KEY = os.getenv('DOCRAPTOR_API_KEY')    # Für PDF-Export
 
+# HTTP Transport - Connection-Pooling für externe APIs (Keep-Alive pro Host)
+HTTP_TRANSPORT = {
+    'POOL_CONNECTIONS': int(os.getenv('HTTP_POOL_CONNECTIONS', '4')),
+    'POOL_MAXSIZE': int(os.getenv('HTTP_POOL_MAXSIZE', '20')),
+    'POOL_BLOCK': os.getenv('HTTP_POOL_BLOCK', 'False').lower() == 'true',
+    'CONNECT_TIMEOUT': float(os.getenv('HTTP_CONNECT_TIMEOUT', '5')),
+    'WARMUP_ON_START': os.getenv('HTTP_WARMUP_ON_START', 'False').lower() == 'true',
+}
+
+# Async LLM-Aufrufe - Thread-Pool und Parallelität für Fan-Outs
+LLM_ASYNC = {
+    'MAX_WORKERS': int(os.getenv('LLM_ASYNC_MAX_WORKERS', '32')),
+    'MAX_CONCURRENCY': int(os.getenv('LLM_ASYNC_MAX_CONCURRENCY', '8')),
+}
+
+# LLM Response Cache - Memory LRU + Datenbank (opt-in pro Aufruf)
+LLM_CACHE = {
+    'TTL_SECONDS': int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+    'MEMORY_MAX_ENTRIES': int(os.getenv('LLM_CACHE_MEMORY_MAX_ENTRIES', '256')),
+    'DB_ENABLED': os.getenv('LLM_CACHE_DB_ENABLED', 'True').lower() == 'true',
+    'DB_MAX_ENTRIES': int(os.getenv('LLM_CACHE_DB_MAX_ENTRIES', '5000')),
+    'DB_EVICT_INTERVAL': int(os.getenv('LLM_CACHE_DB_EVICT_INTERVAL', '100')),
+}
+
+# Serper Cache - Suchergebnisse für AKTIVE Aufträge (TTL pro Endpoint, LRU-Limit pro Endpoint)
+SERPER_CACHE = {
+    'ENABLED': os.getenv('SERPER_CACHE_ENABLED', 'True').lower() == 'true',
+    'SEARCH_TTL_SECONDS': int(os.getenv('SERPER_CACHE_SEARCH_TTL_SECONDS', str(7 * 24 * 3600))),
+    'NEWS_TTL_SECONDS': int(os.getenv('SERPER_CACHE_NEWS_TTL_SECONDS', str(6 * 3600))),
+    'MEMORY_MAX_ENTRIES': int(os.getenv('SERPER_CACHE_MEMORY_MAX_ENTRIES', '256')),
+    'DB_ENABLED': os.getenv('SERPER_CACHE_DB_ENABLED', 'True').lower() == 'true',
+    'DB_MAX_ENTRIES': int(os.getenv('SERPER_CACHE_DB_MAX_ENTRIES', '5000')),
+    'DB_EVICT_INTERVAL': int(os.getenv('SERPER_CACHE_DB_EVICT_INTERVAL', '100')),
+}
+
+# Client-seitige Rate Limits pro Modell/API (Token Bucket + AIMD-Concurrency)
+# Schlüssel: OpenRouter-Modell oder 'serper'; 'default' gilt für alle anderen
+RATE_LIMITS = {
+    'default': {
+        'RATE': 2.0,
+        'BURST': 5,
+        'INITIAL_CONCURRENCY': 4,
+        'MIN_CONCURRENCY': 1,
+        'MAX_CONCURRENCY': 16,
+        'MAX_WAIT': 30.0,
+    },
+    'google/gemini-2.5-flash': {'RATE': 5.0, 'BURST': 10},
+    'anthropic/claude-3.5-sonnet': {'RATE': 2.0, 'BURST': 5},
+    'anthropic/claude-opus-4.1': {'RATE': 1.0, 'BURST': 3, 'MAX_WAIT': 60.0},
+    'serper': {'RATE': 5.0, 'BURST': 10, 'INITIAL_CONCURRENCY': 8},
+}
+
+# Optional: Rate-Limit-Zustand zwischen Workern teilen (Datei mit File-Lock)
+RATE_LIMIT_STATE_FILE = os.getenv('RATE_LIMIT_STATE_FILE', '')
+
+# Retry für transiente LLM-Fehler (Verbindung, Timeout, 429, 5xx) - Backoff mit Jitter
+LLM_RETRY = {
+    'MAX_ATTEMPTS': int(os.getenv('LLM_RETRY_MAX_ATTEMPTS', '3')),
+    'BASE_DELAY': float(os.getenv('LLM_RETRY_BASE_DELAY', '1.0')),
+    'MAX_DELAY': float(os.getenv('LLM_RETRY_MAX_DELAY', '10.0')),
+    'RETRY_STATUS_CODES': [429, 500, 502, 503, 504],
+}
+
+# Hedging für den Gemini-Titel-Aufruf - Duplikat nach p95-Latenz
+LLM_HEDGING = {
+    'ENABLED': os.getenv('LLM_HEDGING_ENABLED', 'True').lower() == 'true',
+    'PERCENTILE': float(os.getenv('LLM_HEDGING_PERCENTILE', '95')),
+    'DEFAULT_DELAY': float(os.getenv('LLM_HEDGING_DEFAULT_DELAY', '5.0')),  # solange zu wenig Messwerte
+    'MIN_DELAY': float(os.getenv('LLM_HEDGING_MIN_DELAY', '1.0')),
+}
+
+# Gesamtbudget (Sekunden) pro Workflow - jeder Schritt erhält die Restzeit
+WORKFLOW_DEADLINES = {
+    'create_arbeitsprobe': float(os.getenv('DEADLINE_CREATE_ARBEITSPROBE', '180')),
+    'create_arbeitsproben_batch': float(os.getenv('DEADLINE_CREATE_ARBEITSPROBEN_BATCH', '240')),
+    'analyze_job': float(os.getenv('DEADLINE_ANALYZE_JOB', '240')),
+}
+
+# Fallback-Kette pro Qualitätsstufe (Reihenfolge = Priorität)
+MODEL_FALLBACKS = {
+    'bronze': ['gemini', 'sonnet'],
+    'silber': ['sonnet', 'gemini'],
+    'gold': ['opus', 'sonnet'],
+}
+
+# Circuit Breaker pro Modell - öffnet bei Fehlerquote oder Verletzung des Latenz-SLO
+# LATENCY_SLO zählt nur für Breaker und Metriken - lange Opus-Scripts werden nicht abgebrochen
+# und gilt je SLO_OUTPUT_TOKENS Ausgabe-Tokens (4000-Token-Script: vierfaches SLO)
+CIRCUIT_BREAKERS = {
+    'default': {
+        'WINDOW': int(os.getenv('CIRCUIT_BREAKER_WINDOW', '20')),
+        'MIN_CALLS': int(os.getenv('CIRCUIT_BREAKER_MIN_CALLS', '5')),
+        'FAILURE_RATE': float(os.getenv('CIRCUIT_BREAKER_FAILURE_RATE', '0.5')),
+        'SLOW_CALL_RATE': float(os.getenv('CIRCUIT_BREAKER_SLOW_CALL_RATE', '0.5')),
+        'OPEN_SECONDS': float(os.getenv('CIRCUIT_BREAKER_OPEN_SECONDS', '60')),
+        'LATENCY_SLO': 60.0,
+        'SLO_OUTPUT_TOKENS': int(os.getenv('CIRCUIT_BREAKER_SLO_OUTPUT_TOKENS', '1000')),
+    },
+    'google/gemini-2.5-flash': {'LATENCY_SLO': float(os.getenv('SLO_GEMINI', '30'))},
+    'anthropic/claude-3.5-sonnet': {'LATENCY_SLO': float(os.getenv('SLO_SONNET', '60'))},
+    'anthropic/claude-opus-4.1': {'LATENCY_SLO': float(os.getenv('SLO_OPUS', '90'))},
+}
+
+# Token-Budgets - max_tokens aus der Wortanzahl, Prompts über dem Limit werden gekürzt/abgelehnt
+TOKEN_BUDGET = {
+    'MAX_PROMPT_TOKENS': int(os.getenv('TOKEN_BUDGET_MAX_PROMPT_TOKENS', '12000')),
+    'OUTPUT_HEADROOM': float(os.getenv('TOKEN_BUDGET_OUTPUT_HEADROOM', '0.2')),
+    'MIN_OUTPUT_TOKENS': int(os.getenv('TOKEN_BUDGET_MIN_OUTPUT_TOKENS', '256')),
+}
+
+# Erlaubte Wortanzahl für Scripts und Arbeitsproben (Formular, Stream und API)
+SCRIPT_WORD_COUNT = {
+    'MIN': 100,
+    'MAX': 18000,
+}
+
+# Script-Streaming - POST (mit CSRF) stellt ein signiertes Token aus, die EventSource-GET-Anfrage
+# muss es innerhalb von TOKEN_MAX_AGE Sekunden vorlegen
+SCRIPT_STREAM = {
+    'TOKEN_MAX_AGE': int(os.getenv('SCRIPT_STREAM_TOKEN_MAX_AGE', '60')),
+}
+
+# Lange Scripts - Gliederung, dann Abschnitte parallel (ab THRESHOLD_WORDS Wörtern)
+LONG_SCRIPT = {
+    'THRESHOLD_WORDS': int(os.getenv('LONG_SCRIPT_THRESHOLD_WORDS', '2500')),
+    'SECTION_WORDS': int(os.getenv('LONG_SCRIPT_SECTION_WORDS', '800')),
+    'MAX_SECTIONS': int(os.getenv('LONG_SCRIPT_MAX_SECTIONS', '8')),
+    'MAX_CONCURRENCY': int(os.getenv('LONG_SCRIPT_MAX_CONCURRENCY', '4')),
+    'SMOOTH_TRANSITIONS': os.getenv('LONG_SCRIPT_SMOOTH_TRANSITIONS', 'True').lower() == 'true',
+}
+
+# Prompt-Caching beim Provider - stabile Prompt-Prefixe mit cache_control senden
+# (nur ab der Mindestgröße des Modells, MIN_CACHE_TOKENS in token_counter.py)
+PROMPT_CACHE = {
+    'ENABLED': os.getenv('PROMPT_CACHE_ENABLED', 'True').lower() == 'true',
+}
+
+# Upwork-Analyse (Legacy-Pipeline) - Titel, Briefing und Keywords als EIN JSON-Aufruf
+UPWORK_ANALYSIS = {
+    'STRUCTURED_OUTPUT': os.getenv('UPWORK_STRUCTURED_OUTPUT', 'True').lower() == 'true',
+}
+
+# Massen-Import von Upwork-Jobs (manage.py ingest_upwork_jobs)
+JOB_INGESTION = {
+    'WORKERS': int(os.getenv('JOB_INGESTION_WORKERS', '4')),
+    'BATCH_SIZE': int(os.getenv('JOB_INGESTION_BATCH_SIZE', '20')),  # Checkpoint erst nach dem Speichern
+    'WORD_COUNT': int(os.getenv('JOB_INGESTION_WORD_COUNT', '500')),
+    'QUALITY': os.getenv('JOB_INGESTION_QUALITY', 'bronze'),  # 'auto' = Stufe aus dem Job-Score
+    'PRIORITIZE': os.getenv('JOB_INGESTION_PRIORITIZE', 'True').lower() == 'true',
+    'PRIORITY_WINDOW': int(os.getenv('JOB_INGESTION_PRIORITY_WINDOW', '500')),
+    'MIN_SCORE': float(os.getenv('JOB_INGESTION_MIN_SCORE', '0')),
+}
+
+# Lokale Vorauswahl (JobScorer) - Review, Qualitätsstufe und Reihenfolge nach Score (0-100)
+JOB_SCORING = {
+    'REVIEW_MIN_SCORE': float(os.getenv('JOB_SCORING_REVIEW_MIN_SCORE', '60')),
+    'SILBER_MIN_SCORE': float(os.getenv('JOB_SCORING_SILBER_MIN_SCORE', '45')),
+    'GOLD_MIN_SCORE': float(os.getenv('JOB_SCORING_GOLD_MIN_SCORE', '70')),
+    'VALUE_CAP': float(os.getenv('JOB_SCORING_VALUE_CAP', '5000')),
+}
+
+# Spekulative Opus-Verbesserung parallel zum Sonnet-Review (pro Qualitätsstufe, opt-in)
+# Spart einen Roundtrip, kostet aber bei JEDEM Job einen Opus-Prompt plus Tokens - auch bei
+# Review-Score >= 8 (Abbruch greift erst nach dem ersten Token). Der Vorschlag kennt das
+# Review-Feedback nicht und ist daher schwächer als die sequenzielle Verbesserung.
+SPECULATIVE_IMPROVE = {
+    'bronze': os.getenv('SPECULATIVE_IMPROVE_BRONZE', 'False').lower() == 'true',
+    'silber': os.getenv('SPECULATIVE_IMPROVE_SILBER', 'False').lower() == 'true',
+    'gold': os.getenv('SPECULATIVE_IMPROVE_GOLD', 'False').lower() == 'true',
+}
+
+# Research-Kontext für AKTIVE Aufträge - BM25-Auswahl der Serper-Snippets im Token-Budget
+RESEARCH_CONTEXT = {
+    'TOKENS': {
+        'bronze': int(os.getenv('RESEARCH_CONTEXT_TOKENS_BRONZE', '300')),
+        'silber': int(os.getenv('RESEARCH_CONTEXT_TOKENS_SILBER', '600')),
+        'gold': int(os.getenv('RESEARCH_CONTEXT_TOKENS_GOLD', '900')),
+    },
+    'MAX_SNIPPETS': int(os.getenv('RESEARCH_CONTEXT_MAX_SNIPPETS', '8')),
+    'BM25_K1': float(os.getenv('RESEARCH_CONTEXT_BM25_K1', '1.5')),
+    'BM25_B': float(os.getenv('RESEARCH_CONTEXT_BM25_B', '0.75')),
+}
+
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -0,0 +1,207 @@
+"""
+Circuit Breaker - schnelles Aufgeben bei gestörten Modellen/APIs
+
+Pro Schlüssel (z.B. OpenRouter-Modell) wird ein gleitendes Fenster der
+letzten Aufrufe geführt. Der Breaker öffnet, wenn
+- die Fehlerquote FAILURE_RATE erreicht oder
+- der Anteil zu langsamer Aufrufe (über LATENCY_SLO) SLOW_CALL_RATE erreicht.
+
+LATENCY_SLO gilt je SLO_OUTPUT_TOKENS erzeugter Tokens: ein gesunder Aufruf
+mit 4000 Ausgabe-Tokens darf viermal so lange dauern wie einer mit 1000.
+Lange Scripts öffnen den Breaker so nicht allein durch ihre Länge.
+
+Offen: Aufrufe werden sofort abgelehnt (kein 120s-Timeout mehr).
+Nach OPEN_SECONDS: halboffen - einzelne Test-Aufrufe entscheiden,
+ob der Breaker wieder schließt oder erneut öffnet.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BREAKER_SETTINGS = {
+    'WINDOW': 20,               # Anzahl betrachteter Aufrufe
+    'MIN_CALLS': 5,             # Mindestanzahl Aufrufe vor einer Bewertung
+    'FAILURE_RATE': 0.5,        # Fehlerquote, ab der geöffnet wird
+    'LATENCY_SLO': 60.0,        # Sekunden - langsamere Aufrufe zählen als "slow"
+    'SLO_OUTPUT_TOKENS': 1000,  # LATENCY_SLO gilt je so vieler Ausgabe-Tokens
+    'SLOW_CALL_RATE': 0.5,      # Anteil langsamer Aufrufe, ab dem geöffnet wird
+    'OPEN_SECONDS': 60.0,       # Dauer des offenen Zustands
+    'HALF_OPEN_CALLS': 1,       # Gleichzeitige Test-Aufrufe im halboffenen Zustand
+}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Der Circuit Breaker ist offen - Aufruf wurde nicht ausgeführt"""
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker mit Fehlerquote und Latenz-SLO für einen Schlüssel
+    """
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self.min_calls = int(config['MIN_CALLS'])
+        self.failure_rate = float(config['FAILURE_RATE'])
+        self.latency_slo = float(config['LATENCY_SLO'])
+        self.slo_output_tokens = max(1, int(config['SLO_OUTPUT_TOKENS']))
+        self.slow_call_rate = float(config['SLOW_CALL_RATE'])
+        self.open_seconds = float(config['OPEN_SECONDS'])
+        self.half_open_calls = int(config['HALF_OPEN_CALLS'])
+
+        self._calls = deque(maxlen=int(config['WINDOW']))  # (success, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit '{self.name}': halboffen - lasse Test-Aufruf zu")
+        return self._state
+
+    def is_open(self) -> bool:
+        """
+        True wenn Aufrufe aktuell abgelehnt würden (reserviert keinen Test-Aufruf)
+        """
+        with self._lock:
+            state = self._current_state()
+            return state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_calls)
+
+    def allow_request(self) -> bool:
+        """
+        Prüft, ob ein Aufruf erlaubt ist - im halboffenen Zustand
+        wird dabei ein Test-Aufruf reserviert
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def check(self):
+        """
+        Raises:
+            CircuitOpenError: wenn der Breaker den Aufruf ablehnt
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' ist offen - Aufruf übersprungen")
+
+    def record_success(self, latency: float, output_tokens: int = None):
+        """
+        Args:
+            latency: Dauer des Aufrufs in Sekunden
+            output_tokens: Erzeugte Tokens - verlängert das SLO für lange Antworten
+        """
+        self._record(True, self.is_slow(latency, output_tokens))
+
+    def record_failure(self, latency: float = 0.0, output_tokens: int = None):
+        self._record(False, self.is_slow(latency, output_tokens))
+
+    def is_slow(self, latency: float, output_tokens: int = None) -> bool:
+        """True wenn der Aufruf das auf seine Ausgabelänge skalierte SLO verletzt"""
+        allowed = self.latency_slo * max(1.0, (output_tokens or 0) / self.slo_output_tokens)
+        return latency > allowed
+
+    def record_neutral(self):
+        """
+        Aufruf ohne Aussage über das Modell (z.B. 400, lokales Rate-Limit,
+        Abbruch durch den Client) - gibt nur einen reservierten Test-Aufruf frei
+        """
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _record(self, success: bool, slow: bool):
+        with self._lock:
+            state = self._current_state()
+
+            if state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if success and not slow:
+                    self._close()
+                else:
+                    self._open(f"Test-Aufruf {'zu langsam' if success else 'fehlgeschlagen'}")
+                return
+
+            if state == OPEN:
+                # Nachzügler aus der Zeit vor dem Öffnen
+                return
+
+            self._calls.append((success, slow))
+            if len(self._calls) < self.min_calls:
+                return
+
+            total = len(self._calls)
+            failures = sum(1 for ok, _ in self._calls if not ok)
+            slow_calls = sum(1 for ok, is_slow in self._calls if ok and is_slow)
+
+            if failures / total >= self.failure_rate:
+                self._open(f"Fehlerquote {failures}/{total}")
+            elif slow_calls / total >= self.slow_call_rate:
+                self._open(f"{slow_calls}/{total} Aufrufe über SLO von {self.latency_slo:.0f}s")
+
+    def _open(self, reason: str):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self._calls.clear()
+        logger.warning(f"Circuit '{self.name}' geöffnet ({reason}) - Pause {self.open_seconds:.0f}s")
+
+    def _close(self):
+        self._state = CLOSED
+        self._calls.clear()
+        logger.info(f"Circuit '{self.name}' wieder geschlossen")
+
+    def get_state(self) -> dict:
+        """
+        Aktueller Zustand (für Monitoring)
+        """
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'calls': len(self._calls),
+                'failures': sum(1 for ok, _ in self._calls if not ok),
+                'slow_calls': sum(1 for ok, slow in self._calls if ok and slow),
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Prozessweiter Breaker für einen Schlüssel (Konfiguration aus settings.CIRCUIT_BREAKERS)
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breakers = getattr(settings, 'CIRCUIT_BREAKERS', {}) or {}
+                config = dict(DEFAULT_BREAKER_SETTINGS)
+                config.update(breakers.get('default', {}))
+                config.update(breakers.get(name, {}))
+
+                breaker = CircuitBreaker(name, config)
+                _breakers[name] = breaker
+    return breaker
@@ -0,0 +1,337 @@
+"""
+Adaptive Rate Limiter - Client-seitige Drosselung pro Modell/API
+
+Pro Schlüssel (z.B. OpenRouter-Modell oder 'serper'):
+- Token Bucket: begrenzt die Request-Rate (RATE pro Sekunde, BURST)
+- AIMD-Concurrency: erlaubte parallele Requests steigen additiv bei
+  Erfolg und halbieren sich bei Überlast-Antworten (429 oder 5xx).
+  Die Latenz zählt bewusst NICHT: lange Opus-Scripts dauern Minuten und
+  sind trotzdem gesund - dafür gibt es Latenz-SLOs im Circuit Breaker.
+- Retry-After aus 429-Antworten pausiert den Bucket
+
+Der Zustand ist thread-sicher und kann optional über eine Datei mit
+File-Lock zwischen Prozessen (Gunicorn-Workern) geteilt werden. Dann
+gelten Bucket, Concurrency-Limit UND laufende Requests (pro Prozess-ID
+gezählt) für alle Worker gemeinsam; Einträge beendeter Prozesse werden
+verworfen.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows - kein prozessübergreifender Zustand
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT_SETTINGS = {
+    'RATE': 2.0,                # Requests pro Sekunde (Token Bucket)
+    'BURST': 5,                 # Bucket-Größe
+    'INITIAL_CONCURRENCY': 4,
+    'MIN_CONCURRENCY': 1,
+    'MAX_CONCURRENCY': 16,
+    'INCREASE': 1.0,            # Additive Erhöhung (pro "Runde")
+    'DECREASE_FACTOR': 0.5,     # Multiplikative Verringerung
+    'MAX_WAIT': 30.0,           # Max. Wartezeit auf einen Slot
+}
+
+# Wartezeit zwischen zwei Prüfungen, wenn alle Slots belegt sind - Slots
+# anderer Prozesse werden nicht per Condition gemeldet
+CONCURRENCY_POLL_INTERVAL = 0.25
+
+
+class RateLimitTimeout(TimeoutError):
+    """Kein Slot innerhalb der maximalen Wartezeit frei"""
+
+
+class _LocalStateStore:
+    """Zustand nur innerhalb dieses Prozesses"""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, name: str, func):
+        with self._lock:
+            state = self._states.setdefault(name, {})
+            return func(state)
+
+
+class _FileStateStore:
+    """Zustand in einer JSON-Datei, geschützt durch einen exklusiven File-Lock"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def update(self, name: str, func):
+        with self._lock, open(self.path, 'a+') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                try:
+                    states = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    states = {}
+
+                state = states.setdefault(name, {})
+                result = func(state)
+
+                handle.seek(0)
+                handle.truncate()
+                json.dump(states, handle)
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class _Slot:
+    """Rückmeldung eines Requests an den Limiter"""
+
+    def __init__(self):
+        self.throttled = False
+        self.retry_after = None
+
+    def mark_throttled(self, retry_after: float = None):
+        self.throttled = True
+        self.retry_after = retry_after
+
+    def record_status(self, status_code: int, retry_after: float = None):
+        """
+        Wertet den HTTP-Status aus: 429 und 5xx gelten als Überlast
+        """
+        if status_code == 429 or status_code >= 500:
+            self.mark_throttled(retry_after if status_code == 429 else None)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token Bucket + AIMD-Concurrency für einen Schlüssel
+    """
+
+    def __init__(self, name: str, config: dict, store=None):
+        self.name = name
+        self.rate = float(config['RATE'])
+        self.burst = float(config['BURST'])
+        self.min_concurrency = float(config['MIN_CONCURRENCY'])
+        self.max_concurrency = float(config['MAX_CONCURRENCY'])
+        self.initial_concurrency = float(config['INITIAL_CONCURRENCY'])
+        self.increase = float(config['INCREASE'])
+        self.decrease_factor = float(config['DECREASE_FACTOR'])
+        self.max_wait = float(config['MAX_WAIT'])
+
+        self.store = store or _LocalStateStore()
+        self._cond = threading.Condition()
+
+    def _init_state(self, state: dict, now: float):
+        state.setdefault('tokens', self.burst)
+        state.setdefault('updated', now)
+        state.setdefault('paused_until', 0.0)
+        state.setdefault('limit', self.initial_concurrency)
+        state.setdefault('in_flight', {})       # Prozess-ID -> laufende Requests
+
+    def _total_in_flight(self, state: dict) -> int:
+        """Laufende Requests aller Prozesse (beendete Prozesse werden entfernt)"""
+        in_flight = state['in_flight']
+        for pid in [pid for pid in in_flight if pid != str(os.getpid()) and not _pid_alive(int(pid))]:
+            logger.warning(f"Rate-Limit '{self.name}': {in_flight.pop(pid)} Slots von beendetem Prozess {pid} freigegeben")
+        return sum(in_flight.values())
+
+    def _change_in_flight(self, state: dict, delta: int):
+        pid = str(os.getpid())
+        count = max(0, state['in_flight'].get(pid, 0) + delta)
+        if count:
+            state['in_flight'][pid] = count
+        else:
+            state['in_flight'].pop(pid, None)
+
+    def _take_token(self, state: dict) -> float:
+        """
+        Versucht ein Token zu nehmen
+
+        Returns:
+            0 wenn erfolgreich, sonst Sekunden bis zum nächsten Versuch
+        """
+        now = time.time()
+        self._init_state(state, now)
+
+        if self._total_in_flight(state) >= int(state['limit']):
+            # Concurrency ausgeschöpft - auf release() warten
+            return CONCURRENCY_POLL_INTERVAL
+
+        if now < state['paused_until']:
+            return state['paused_until'] - now
+
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(self.burst, state['tokens'] + elapsed * self.rate)
+        state['updated'] = now
+
+        if state['tokens'] >= 1:
+            state['tokens'] -= 1
+            # Im selben (gesperrten) Update zählen - sonst könnten zwei Prozesse
+            # gleichzeitig den letzten freien Slot belegen
+            self._change_in_flight(state, 1)
+            return 0.0
+
+        return (1 - state['tokens']) / self.rate
+
+    def acquire(self, timeout: float = None):
+        """
+        Wartet auf einen freien Slot (Token + Concurrency)
+
+        Raises:
+            RateLimitTimeout: wenn innerhalb der Wartezeit kein Slot frei wird
+        """
+        deadline = time.monotonic() + (self.max_wait if timeout is None else timeout)
+
+        with self._cond:
+            while True:
+                wait = self.store.update(self.name, self._take_token)
+                if wait == 0:
+                    return
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RateLimitTimeout(
+                        f"Rate-Limit '{self.name}': kein freier Slot innerhalb von "
+                        f"{self.max_wait if timeout is None else timeout:.1f}s"
+                    )
+                self._cond.wait(min(wait, remaining))
+
+    def release(self, latency: float, throttled: bool = False, retry_after: float = None,
+                succeeded: bool = True):
+        """
+        Gibt einen Slot frei und passt die Concurrency an (AIMD)
+
+        Args:
+            latency: Dauer des Requests (nur fürs Logging)
+            throttled: Überlast-Antwort (429/5xx) - Concurrency halbieren
+            succeeded: False bei Exceptions (Timeout, Verbindung) - keine Anpassung
+        """
+        def _adjust(state):
+            now = time.time()
+            self._init_state(state, now)
+            self._change_in_flight(state, -1)
+            limit = state['limit']
+
+            if throttled:
+                limit = max(self.min_concurrency, limit * self.decrease_factor)
+                pause = retry_after if retry_after is not None else 1.0 / self.rate
+                state['paused_until'] = max(state['paused_until'], now + pause)
+                state['tokens'] = 0.0
+                logger.warning(
+                    f"Rate-Limit '{self.name}': Überlast nach {latency:.1f}s - Concurrency {limit:.1f}, "
+                    f"Pause {pause:.1f}s"
+                )
+            elif succeeded:
+                limit = min(self.max_concurrency, limit + self.increase / max(limit, 1.0))
+
+            state['limit'] = limit
+
+        with self._cond:
+            self.store.update(self.name, _adjust)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, timeout: float = None):
+        """
+        Context Manager: Slot belegen, Request ausführen, Latenz zurückmelden
+
+        Beispiel:
+            with limiter.slot() as slot:
+                response = session.post(...)
+                slot.record_status(response.status_code, retry_after)
+        """
+        self.acquire(timeout)
+        slot = _Slot()
+        started = time.monotonic()
+        succeeded = False
+        try:
+            yield slot
+            succeeded = True
+        finally:
+            self.release(time.monotonic() - started, slot.throttled, slot.retry_after, succeeded)
+
+    def get_state(self) -> dict:
+        """
+        Aktueller Zustand (für Monitoring)
+        """
+        def _read(state):
+            self._init_state(state, time.time())
+            result = dict(state)
+            result['in_flight'] = self._total_in_flight(state)
+            result['in_flight_local'] = state['in_flight'].get(str(os.getpid()), 0)
+            return result
+
+        return self.store.update(self.name, _read)
+
+
+def parse_retry_after(value) -> float:
+    """
+    Liest den Retry-After Header (Sekunden) - None wenn nicht auswertbar
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_shared_store = None
+
+
+def _get_store():
+    global _shared_store
+    state_file = getattr(settings, 'RATE_LIMIT_STATE_FILE', '')
+
+    if not state_file:
+        return None
+
+    if fcntl is None:
+        logger.warning("RATE_LIMIT_STATE_FILE gesetzt, aber File-Locks sind auf diesem System nicht verfügbar")
+        return None
+
+    if _shared_store is None:
+        directory = os.path.dirname(state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _shared_store = _FileStateStore(state_file)
+    return _shared_store
+
+
+def get_rate_limiter(name: str) -> AdaptiveRateLimiter:
+    """
+    Prozessweiter Limiter für einen Schlüssel (Konfiguration aus settings.RATE_LIMITS)
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                limits = getattr(settings, 'RATE_LIMITS', {}) or {}
+                config = dict(DEFAULT_LIMIT_SETTINGS)
+                config.update(limits.get('default', {}))
+                config.update(limits.get(name, {}))
+
+                limiter = AdaptiveRateLimiter(name, config, store=_get_store())
+                _limiters[name] = limiter
+    return limiter
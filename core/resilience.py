@@ -0,0 +1,212 @@
+"""
+Resilience - Retry, Hedging und Deadlines für externe API-Aufrufe
+
+- RetryPolicy: exponentielles Backoff mit Jitter für transiente Fehler
+- Deadline: Gesamtbudget eines Workflows, jeder Schritt erhält die Restzeit
+- LatencyTracker: gleitende Latenz-Perzentile pro Schlüssel - pro Modell
+  oder pro Aufruf-Art (z.B. 'title:<modell>'), damit kurze Titel-Aufrufe
+  nicht mit minutenlangen Script-Generierungen vermischt werden
+- hedged_call: startet nach der Hedge-Schwelle einen Duplikat-Aufruf und
+  nimmt das erste erfolgreiche Ergebnis
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_SETTINGS = {
+    'MAX_ATTEMPTS': 3,
+    'BASE_DELAY': 1.0,
+    'MAX_DELAY': 10.0,
+    'RETRY_STATUS_CODES': [429, 500, 502, 503, 504],
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """Das Zeitbudget des Workflows ist aufgebraucht"""
+
+
+class Deadline:
+    """
+    Gesamtbudget für einen Workflow - Schritte fragen die Restzeit ab
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Restzeit in Sekunden (nie negativ)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, cap: float) -> float:
+        """
+        Timeout für einen Schritt: Minimum aus eigenem Limit und Restzeit
+
+        Raises:
+            DeadlineExceeded: wenn keine Zeit mehr übrig ist
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline von {self.seconds:.0f}s überschritten")
+        return min(cap, remaining)
+
+    def limited(self, seconds: float) -> 'Deadline':
+        """
+        Teil-Deadline für einen Schritt: endet nach seconds, spätestens mit dieser Deadline
+        """
+        child = Deadline(min(seconds, self.remaining()))
+        child.seconds = seconds
+        return child
+
+    def __repr__(self):
+        return f"Deadline({self.remaining():.1f}s von {self.seconds:.0f}s übrig)"
+
+
+def budget_for(timeout: float, deadline: Deadline = None) -> float:
+    """
+    Timeout für einen Aufruf unter Berücksichtigung einer optionalen Deadline
+    """
+    return deadline.budget(timeout) if deadline else timeout
+
+
+class RetryPolicy:
+    """
+    Exponentielles Backoff mit "Full Jitter"
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 10.0,
+                 retry_status_codes=(429, 500, 502, 503, 504)):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_status_codes = set(retry_status_codes)
+
+    @classmethod
+    def from_settings(cls, name: str = 'LLM_RETRY') -> 'RetryPolicy':
+        config = dict(DEFAULT_RETRY_SETTINGS)
+        config.update(getattr(settings, name, {}) or {})
+        return cls(
+            max_attempts=config['MAX_ATTEMPTS'],
+            base_delay=config['BASE_DELAY'],
+            max_delay=config['MAX_DELAY'],
+            retry_status_codes=config['RETRY_STATUS_CODES']
+        )
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_status_codes
+
+    def delay(self, attempt: int, retry_after: float = None) -> float:
+        """
+        Wartezeit vor dem nächsten Versuch (attempt beginnt bei 1)
+        """
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class LatencyTracker:
+    """
+    Gleitendes Fenster erfolgreicher Latenzen für Perzentil-Abfragen
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float):
+        """
+        Perzentil der Latenz in Sekunden - None solange zu wenig Messwerte
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        return len(self._samples)
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """
+    Prozessweiter Latenz-Tracker pro Modell/API oder Aufruf-Art
+    """
+    tracker = _trackers.get(name)
+    if tracker is None:
+        with _trackers_lock:
+            tracker = _trackers.setdefault(name, LatencyTracker())
+    return tracker
+
+
+def hedged_call(func, hedge_after: float, hedge_func=None, is_success=None, max_hedges: int = 1,
+                *, executor):
+    """
+    Führt func aus und startet nach hedge_after Sekunden ein Duplikat
+
+    Das erste erfolgreiche Ergebnis gewinnt; die übrigen Aufrufe laufen
+    im Hintergrund zu Ende, ihr Ergebnis wird verworfen.
+
+    Der Aufrufer wartet blockierend - er darf daher nicht selbst in
+    executor laufen (sonst kann der Pool sich gegenseitig blockieren).
+
+    Args:
+        func: Aufruf ohne Argumente, liefert ein Ergebnis-dict
+        hedge_after: Sekunden bis zum Start des Duplikats (z.B. p95-Latenz)
+        hedge_func: Aufruf für das Duplikat (Default: func)
+        is_success: Prüft ein Ergebnis (Default: result['success'])
+        max_hedges: Anzahl zusätzlicher Aufrufe
+        executor: Thread-Pool für Original und Duplikate (z.B. der geteilte API-Pool)
+
+    Returns:
+        Das erste erfolgreiche Ergebnis oder - wenn alle fehlschlagen - das letzte
+    """
+    is_success = is_success or (lambda result: bool(result and result.get('success')))
+
+    pending = {executor.submit(func)}
+    hedges_started = 0
+    last_result = None
+
+    while pending:
+        timeout = hedge_after if hedges_started < max_hedges else None
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            try:
+                last_result = future.result()
+            except Exception as e:
+                logger.warning(f"Hedged Call: Aufruf fehlgeschlagen: {e}")
+                continue
+
+            if is_success(last_result):
+                if hedges_started:
+                    last_result['hedged'] = True
+                return last_result
+
+        if not done and hedges_started < max_hedges:
+            # Hedge-Schwelle ohne Antwort überschritten -> Duplikat starten
+            hedges_started += 1
+            logger.info(f"Hedged Call: starte Duplikat #{hedges_started} nach {hedge_after:.1f}s")
+            pending.add(executor.submit(hedge_func or func))
+
+    return last_result
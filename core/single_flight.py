@@ -0,0 +1,137 @@
+"""
+Single-Flight - Zusammenführen identischer, gleichzeitiger Aufrufe
+
+Laufen zwei Requests mit demselben Schlüssel gleichzeitig (z.B. Doppelklick
+oder Client-Retry mit identischem Prompt), geht nur EIN Upstream-Aufruf raus.
+Alle Wartenden erhalten dasselbe Ergebnis (als tiefe Kopie).
+
+Zusammengeführt wird nur innerhalb EINES Prozesses: mehrere Gunicorn-Worker
+oder Management-Commands senden denselben Aufruf jeweils selbst. Über
+Prozesse hinweg hilft nur der persistente Cache (ApiCacheEntry).
+"""
+import copy
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """Ein laufender Aufruf mit seinem (späteren) Ergebnis"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.shared = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Führt pro Schlüssel höchstens einen Aufruf gleichzeitig aus (pro Prozess)
+    """
+
+    def __init__(self, name: str = 'single-flight'):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func, *args, **kwargs):
+        """
+        Führt func aus oder wartet auf den bereits laufenden Aufruf mit gleichem Schlüssel
+
+        Returns:
+            Ergebnis von func - Wartende erhalten eine tiefe Kopie, damit
+            Änderungen auch an verschachtelten Werten (z.B. 'usage')
+            nicht zwischen Aufrufern geteilt werden
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            logger.info(f"{self.name}: identischer Aufruf läuft bereits - warte auf Ergebnis")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.shared)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            self._finish({key: call})
+
+    def do_many(self, keys, func):
+        """
+        Wie do() für mehrere Schlüssel auf einmal (z.B. ein Batch-Request)
+
+        func(eigene_schlüssel) läuft einmal für alle Schlüssel, die gerade
+        niemand abfragt, und liefert {Schlüssel: Ergebnis}. Auf Schlüssel,
+        die bereits laufen (auch über do()), wird gewartet statt sie erneut
+        anzufragen.
+
+        Returns:
+            dict Schlüssel -> Ergebnis (None für Schlüssel, die func nicht liefert)
+        """
+        led, followed = {}, {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is not None:
+                    call.waiters += 1
+                    followed[key] = call
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    led[key] = call
+
+        results = {}
+        if led:
+            try:
+                produced = func(list(led))
+                for key, call in led.items():
+                    call.result = produced.get(key)
+                    results[key] = call.result
+            except Exception as e:
+                for call in led.values():
+                    call.error = e
+                raise
+            finally:
+                self._finish(led)
+
+        if followed:
+            logger.info(f"{self.name}: {len(followed)} identische Aufrufe laufen bereits - warte auf Ergebnis")
+        for key, call in followed.items():
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results[key] = copy.deepcopy(call.shared)
+        return results
+
+    def _finish(self, calls: dict):
+        """Gibt die Schlüssel frei und weckt die Wartenden"""
+        with self._lock:
+            for key in calls:
+                self._calls.pop(key, None)
+        for call in calls.values():
+            if call.waiters:
+                # Snapshot bevor der Aufrufer das Ergebnis weiterverarbeitet
+                call.shared = copy.deepcopy(call.result)
+                logger.info(f"{self.name}: Ergebnis mit {call.waiters} Wartenden geteilt")
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Anzahl aktuell laufender Aufrufe"""
+        with self._lock:
+            return len(self._calls)
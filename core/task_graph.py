@@ -0,0 +1,110 @@
+"""
+Task Graph - Workflow-Schritte als Abhängigkeitsgraph ausführen
+
+Jeder Schritt deklariert, auf welche anderen Schritte er wartet. Schritte
+ohne offene Abhängigkeiten laufen parallel; die Gesamtlaufzeit entspricht
+dem längsten Pfad statt der Summe aller Schritte.
+
+Beispiel:
+    graph = TaskGraph('analyze_job')
+    graph.add('title', lambda: call_title(text))
+    graph.add('details', lambda: extract_details(text))
+    graph.add('briefing', lambda title: call_briefing(title), deps=['title'])
+    results = graph.run()
+    graph.timings  # {'title': 2.1, 'details': 0.0, 'briefing': 3.4}
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from core.resilience import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# Eigener Pool: Graphen laufen auch aus Threads des gemeinsamen Executors,
+# dort könnten sich wartende Graphen und ihre Schritte gegenseitig blockieren
+_graph_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='task-graph')
+
+
+class TaskGraph:
+    """
+    Abhängigkeitsgraph von Schritten - unabhängige Schritte laufen parallel
+    """
+
+    def __init__(self, name: str = 'task-graph'):
+        self.name = name
+        self._tasks = {}          # name -> (func, deps)
+        self.timings = {}         # name -> Sekunden
+
+    def add(self, name: str, func, deps=()):
+        """
+        Registriert einen Schritt
+
+        Args:
+            name: Eindeutiger Name des Schritts
+            func: Aufruf - erhält die Ergebnisse der Abhängigkeiten als Keyword-Argumente
+            deps: Namen der Schritte, die vorher fertig sein müssen
+        """
+        if name in self._tasks:
+            raise ValueError(f"{self.name}: Schritt '{name}' ist bereits registriert")
+        missing = [dep for dep in deps if dep not in self._tasks]
+        if missing:
+            # Abhängigkeiten müssen vorher registriert sein - verhindert Zyklen
+            raise ValueError(f"{self.name}: unbekannte Abhängigkeiten für '{name}': {missing}")
+        self._tasks[name] = (func, tuple(deps))
+
+    def run(self, deadline=None) -> dict:
+        """
+        Führt alle Schritte aus
+
+        Args:
+            deadline: Optionale core.resilience.Deadline für den ganzen Graphen
+
+        Returns:
+            dict Schrittname -> Ergebnis
+
+        Raises:
+            Die erste Exception eines Schritts (abhängige Schritte starten dann nicht mehr)
+            DeadlineExceeded: wenn die Deadline vor dem Ende abläuft
+        """
+        results = {}
+        running = {}              # future -> name
+        waiting = dict(self._tasks)
+        started = time.monotonic()
+
+        def _timed(name, func, kwargs):
+            step_started = time.monotonic()
+            try:
+                return func(**kwargs)
+            finally:
+                self.timings[name] = round(time.monotonic() - step_started, 3)
+
+        while waiting or running:
+            for name, (func, deps) in list(waiting.items()):
+                if all(dep in results for dep in deps):
+                    kwargs = {dep: results[dep] for dep in deps}
+                    running[_graph_executor.submit(_timed, name, func, kwargs)] = name
+                    del waiting[name]
+
+            timeout = deadline.budget(float('inf')) if deadline else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Deadline abgelaufen - laufende Schritte enden im Hintergrund
+                raise DeadlineExceeded(
+                    f"{self.name}: Deadline überschritten, offen: {sorted(running.values())}"
+                )
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.warning(f"{self.name}: Schritt '{name}' fehlgeschlagen: {e}")
+                    for pending in running:
+                        pending.cancel()
+                    raise
+
+        logger.info(
+            f"{self.name}: {len(results)} Schritte in {time.monotonic() - started:.2f}s "
+            f"(sequentiell {sum(self.timings.values()):.2f}s)"
+        )
+        return results
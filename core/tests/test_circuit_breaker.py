@@ -0,0 +1,51 @@
+from django.test import SimpleTestCase
+from core.circuit_breaker import CLOSED, OPEN, DEFAULT_BREAKER_SETTINGS, CircuitBreaker, CircuitOpenError
+
+
+def make_breaker(**overrides):
+    config = dict(DEFAULT_BREAKER_SETTINGS, MIN_CALLS=4, LATENCY_SLO=10.0, OPEN_SECONDS=60.0)
+    config.update(overrides)
+    return CircuitBreaker('test', config)
+
+
+class CircuitBreakerTest(SimpleTestCase):
+
+    def test_opens_on_failure_rate(self):
+        breaker = make_breaker()
+        for _ in range(2):
+            breaker.record_success(1.0)
+            breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.check()
+
+    def test_slow_successes_open_without_failing_the_calls(self):
+        breaker = make_breaker()
+        for _ in range(3):
+            breaker.record_success(30.0)
+        self.assertEqual(breaker.state, CLOSED)
+
+        breaker.record_success(30.0)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_probe_closes_on_fast_success(self):
+        breaker = make_breaker(OPEN_SECONDS=0.0)
+        for _ in range(4):
+            breaker.record_failure()
+
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success(1.0)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_slo_scales_with_output_tokens(self):
+        breaker = make_breaker(SLO_OUTPUT_TOKENS=1000)
+
+        self.assertFalse(breaker.is_slow(30.0, output_tokens=4000))
+        self.assertTrue(breaker.is_slow(30.0, output_tokens=500))
+        self.assertTrue(breaker.is_slow(50.0, output_tokens=4000))
+
+        for _ in range(4):
+            breaker.record_success(30.0, output_tokens=4000)
+        self.assertEqual(breaker.state, CLOSED)
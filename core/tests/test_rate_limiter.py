@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase, mock
+from core import rate_limiter
+from core.rate_limiter import (
+    AdaptiveRateLimiter, DEFAULT_LIMIT_SETTINGS, RateLimitTimeout, _FileStateStore, parse_retry_after
+)
+
+
+def make_limiter(store=None, **overrides):
+    config = dict(DEFAULT_LIMIT_SETTINGS, RATE=1000.0, BURST=1000, INITIAL_CONCURRENCY=4)
+    config.update(overrides)
+    return AdaptiveRateLimiter('test', config, store=store)
+
+
+class AimdTest(TestCase):
+
+    def test_long_successful_requests_increase_concurrency(self):
+        limiter = make_limiter()
+        with mock.patch.object(rate_limiter.time, 'monotonic', side_effect=[0.0, 0.0, 600.0]):
+            with limiter.slot():
+                pass
+
+        self.assertGreater(limiter.get_state()['limit'], 4)
+
+    def test_429_halves_concurrency_and_pauses(self):
+        limiter = make_limiter()
+        with limiter.slot() as slot:
+            slot.record_status(429, retry_after=7)
+
+        state = limiter.get_state()
+        self.assertEqual(state['limit'], 2)
+        self.assertGreater(state['paused_until'], rate_limiter.time.time() + 5)
+
+    def test_5xx_halves_concurrency(self):
+        limiter = make_limiter()
+        with limiter.slot() as slot:
+            slot.record_status(503)
+
+        self.assertEqual(limiter.get_state()['limit'], 2)
+
+    def test_client_errors_and_exceptions_leave_limit_unchanged(self):
+        limiter = make_limiter()
+        with limiter.slot() as slot:
+            slot.record_status(400)
+        limit = limiter.get_state()['limit']
+
+        with self.assertRaises(ValueError):
+            with limiter.slot():
+                raise ValueError('Verbindung abgebrochen')
+
+        state = limiter.get_state()
+        self.assertEqual(state['limit'], limit)
+        self.assertEqual(state['in_flight'], 0)
+
+    def test_concurrency_limit_blocks_until_release(self):
+        limiter = make_limiter(INITIAL_CONCURRENCY=1, MIN_CONCURRENCY=1)
+        limiter.acquire()
+
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire(timeout=0.05)
+
+        limiter.release(0.1)
+        limiter.acquire(timeout=0.05)
+
+
+class SharedStateTest(TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def test_in_flight_is_shared_between_limiters_on_one_store(self):
+        store = _FileStateStore(self.path)
+        first = make_limiter(store, INITIAL_CONCURRENCY=2)
+        second = make_limiter(store, INITIAL_CONCURRENCY=2)
+
+        first.acquire()
+        second.acquire()
+        self.assertEqual(first.get_state()['in_flight'], 2)
+        with self.assertRaises(RateLimitTimeout):
+            first.acquire(timeout=0.05)
+
+    def test_slots_of_other_and_dead_processes(self):
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+        store = _FileStateStore(self.path)
+        limiter = make_limiter(store, INITIAL_CONCURRENCY=3)
+
+        def _seed(state):
+            limiter._init_state(state, rate_limiter.time.time())
+            state['in_flight'] = {str(os.getppid()): 1, str(dead.pid): 5}
+        store.update('test', _seed)
+
+        state = limiter.get_state()
+        self.assertEqual(state['in_flight'], 1)          # toter Prozess verworfen
+        self.assertEqual(state['in_flight_local'], 0)
+
+
+class ParseRetryAfterTest(TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('-1'), 0.0)
+        self.assertIsNone(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'))
+        self.assertIsNone(parse_retry_after(None))
@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.test import SimpleTestCase
+from core.resilience import Deadline, LatencyTracker, get_latency_tracker, hedged_call
+
+
+class LatencyTrackerTest(SimpleTestCase):
+
+    def test_percentile_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(1.0)
+        tracker.record(2.0)
+        self.assertIsNone(tracker.percentile(95))
+
+        tracker.record(3.0)
+        self.assertEqual(tracker.percentile(50), 2.0)
+        self.assertEqual(tracker.percentile(95), 3.0)
+
+    def test_trackers_are_separate_per_key(self):
+        title = get_latency_tracker('title:test-model')
+        self.assertIs(title, get_latency_tracker('title:test-model'))
+        self.assertIsNot(title, get_latency_tracker('test-model'))
+
+
+class DeadlineTest(SimpleTestCase):
+
+    def test_remaining_and_expired(self):
+        self.assertFalse(Deadline(60).expired())
+        self.assertTrue(Deadline(0).expired())
+        self.assertLessEqual(Deadline(60).remaining(), 60)
+
+
+class HedgedCallTest(SimpleTestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown, wait=True)
+
+    def test_fast_call_does_not_hedge(self):
+        calls = []
+
+        def func():
+            calls.append(1)
+            return {'success': True, 'content': 'a'}
+
+        result = hedged_call(func, hedge_after=5, executor=self.executor)
+
+        self.assertEqual(result['content'], 'a')
+        self.assertNotIn('hedged', result)
+        self.assertEqual(len(calls), 1)
+
+    def test_slow_call_is_hedged_on_given_executor(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow():
+            release.wait(5)
+            return {'success': True, 'content': 'slow'}
+
+        result = hedged_call(
+            slow, hedge_after=0.01,
+            hedge_func=lambda: {'success': True, 'content': 'hedge'},
+            executor=self.executor
+        )
+
+        self.assertEqual(result['content'], 'hedge')
+        self.assertTrue(result['hedged'])
+
+    def test_returns_last_result_when_all_fail(self):
+        result = hedged_call(
+            lambda: {'success': False, 'error': 'x'}, hedge_after=0.01, executor=self.executor
+        )
+        self.assertFalse(result['success'])
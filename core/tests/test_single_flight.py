@@ -0,0 +1,146 @@
+import threading
+import time
+from unittest import TestCase
+from core.single_flight import SingleFlight
+
+
+class SingleFlightTest(TestCase):
+
+    def _run_concurrently(self, flight, func, callers=3):
+        """Startet mehrere Aufrufer, während der erste noch läuft"""
+        results = [None] * callers
+        errors = [None] * callers
+
+        def _caller(index):
+            try:
+                results[index] = flight.do('key', func)
+            except Exception as e:
+                errors[index] = e
+
+        threads = [threading.Thread(target=_caller, args=(index,)) for index in range(callers)]
+        threads[0].start()
+        self.started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        # Wartende müssen registriert sein, bevor der Leader fertig wird
+        deadline = time.monotonic() + 1
+        while flight._calls['key'].waiters < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join(1)
+        return results, errors
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _slow_result(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(1)
+        return {'content': 'x', 'usage': {'total_tokens': 10}}
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight('test')
+        results, errors = self._run_concurrently(flight, self._slow_result)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(errors, [None, None, None])
+        self.assertTrue(all(result == {'content': 'x', 'usage': {'total_tokens': 10}} for result in results))
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_waiters_get_deep_copies(self):
+        flight = SingleFlight('test')
+        results, _ = self._run_concurrently(flight, self._slow_result)
+
+        results[0]['usage']['total_tokens'] = 999
+        results[1]['usage']['total_tokens'] = 500
+        self.assertEqual(results[2]['usage']['total_tokens'], 10)
+
+    def test_error_is_raised_for_all_callers(self):
+        def _fail():
+            self.started.set()
+            self.release.wait(1)
+            raise RuntimeError('upstream down')
+
+        results, errors = self._run_concurrently(SingleFlight('test'), _fail)
+
+        self.assertTrue(all(isinstance(error, RuntimeError) for error in errors))
+
+    def test_sequential_calls_are_not_merged(self):
+        flight = SingleFlight('test')
+        counter = []
+        flight.do('key', counter.append, 1)
+        flight.do('key', counter.append, 2)
+        self.assertEqual(counter, [1, 2])
+
+
+class SingleFlightManyTest(TestCase):
+
+    def test_batch_waits_for_running_single_call_and_leads_the_rest(self):
+        flight = SingleFlight('test')
+        started = threading.Event()
+        release = threading.Event()
+        batches = []
+
+        def _single():
+            started.set()
+            release.wait(1)
+            return {'q': 'a', 'source': 'single'}
+
+        single = threading.Thread(target=flight.do, args=('a', _single))
+        single.start()
+        started.wait(1)
+
+        def _batch(keys):
+            batches.append(keys)
+            release.set()
+            return {key: {'q': key, 'source': 'batch'} for key in keys}
+
+        results = flight.do_many(['a', 'b', 'b'], _batch)
+        single.join(1)
+
+        self.assertEqual(batches, [['b']])
+        self.assertEqual(results, {'a': {'q': 'a', 'source': 'single'}, 'b': {'q': 'b', 'source': 'batch'}})
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_single_call_waits_for_running_batch(self):
+        flight = SingleFlight('test')
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def _batch(keys):
+            calls.append(keys)
+            started.set()
+            release.wait(1)
+            return {key: key.upper() for key in keys}
+
+        batch = threading.Thread(target=flight.do_many, args=(['a', 'b'], _batch))
+        batch.start()
+        started.wait(1)
+
+        result = []
+        single = threading.Thread(target=lambda: result.append(flight.do('b', lambda: calls.append('single'))))
+        single.start()
+        deadline = time.monotonic() + 1
+        while flight._calls['b'].waiters < 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        batch.join(1)
+        single.join(1)
+
+        self.assertEqual(calls, [['a', 'b']])
+        self.assertEqual(result, ['B'])
+
+    def test_batch_error_reaches_all_keys(self):
+        flight = SingleFlight('test')
+
+        def _fail(keys):
+            raise ValueError('kaputt')
+
+        with self.assertRaises(ValueError):
+            flight.do_many(['a', 'b'], _fail)
+        self.assertEqual(flight.in_flight(), 0)
@@ -0,0 +1,54 @@
+import threading
+import time
+from django.test import SimpleTestCase
+from core.resilience import Deadline, DeadlineExceeded
+from core.task_graph import TaskGraph
+
+
+class TaskGraphTest(SimpleTestCase):
+
+    def test_dependencies_receive_results_as_kwargs(self):
+        graph = TaskGraph('test')
+        graph.add('title', lambda: 'KI im Alltag')
+        graph.add('details', lambda: {'budget': 100})
+        graph.add('briefing', lambda title, details: f"{title} ({details['budget']})", deps=['title', 'details'])
+
+        results = graph.run()
+
+        self.assertEqual(results['briefing'], 'KI im Alltag (100)')
+        self.assertEqual(set(graph.timings), {'title', 'details', 'briefing'})
+
+    def test_independent_steps_run_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=2)
+        graph = TaskGraph('test')
+        graph.add('a', barrier.wait)
+        graph.add('b', barrier.wait)
+
+        # Würden die Schritte nacheinander laufen, bräche die Barriere ab
+        self.assertEqual(set(graph.run()), {'a', 'b'})
+
+    def test_rejects_duplicate_and_unknown_steps(self):
+        graph = TaskGraph('test')
+        graph.add('a', lambda: 1)
+
+        with self.assertRaises(ValueError):
+            graph.add('a', lambda: 2)
+        with self.assertRaises(ValueError):
+            graph.add('b', lambda c: c, deps=['c'])
+
+    def test_failure_stops_dependent_steps(self):
+        called = []
+        graph = TaskGraph('test')
+        graph.add('a', lambda: 1 / 0)
+        graph.add('b', lambda a: called.append(a), deps=['a'])
+
+        with self.assertRaises(ZeroDivisionError):
+            graph.run()
+        self.assertEqual(called, [])
+
+    def test_deadline_raises_while_steps_are_open(self):
+        graph = TaskGraph('test')
+        graph.add('slow', lambda: time.sleep(0.5))
+
+        with self.assertRaises(DeadlineExceeded):
+            graph.run(deadline=Deadline(0.05))
@@ -19,6 +19,9 @@ function getCookie(name) {
     return cookieValue;
 }
 
+// Laufende Requests (für das Zusammenführen identischer Aufrufe)
+const laufendeRequests = new Map();
+
 // Zentrale API-Wrapper Funktion mit Error Handling
 async function apiCall(endpoint, options = {}) {
     const url = `${API_BASE_URL}${endpoint}`;
@@ -39,23 +42,37 @@ async function apiCall(endpoint, options = {}) {
         }
     };
     
-    try {
-        console.log(`API Call: ${options.method || 'GET'} ${url}`);
-        const response = await fetch(url, finalOptions);
-        
-        if (!response.ok) {
-            throw new Error(`API Error: ${response.status} ${response.statusText}`);
-        }
-        
-        const data = await response.json();
-        console.log(`API Response:`, data);
-        return data;
-        
-    } catch (error) {
-        console.error('API Call failed:', error);
-        showError(`API-Fehler: ${error.message}`);
-        throw error;
+    // Identischer Request läuft bereits (Doppelklick)? Dann auf dasselbe Ergebnis warten
+    const requestKey = `${finalOptions.method || 'GET'} ${url} ${finalOptions.body || ''}`;
+    if (laufendeRequests.has(requestKey)) {
+        console.log(`API Call bereits unterwegs: ${finalOptions.method || 'GET'} ${url}`);
+        return laufendeRequests.get(requestKey);
     }
+    
+    const request = (async () => {
+        try {
+            console.log(`API Call: ${options.method || 'GET'} ${url}`);
+            const response = await fetch(url, finalOptions);
+            
+            if (!response.ok) {
+                throw new Error(`API Error: ${response.status} ${response.statusText}`);
+            }
+            
+            const data = await response.json();
+            console.log(`API Response:`, data);
+            return data;
+            
+        } catch (error) {
+            console.error('API Call failed:', error);
+            showError(`API-Fehler: ${error.message}`);
+            throw error;
+        } finally {
+            laufendeRequests.delete(requestKey);
+        }
+    })();
+    
+    laufendeRequests.set(requestKey, request);
+    return request;
 }
 
 // Spezifische API-Funktionen für Aufträge
@@ -154,6 +171,58 @@ const ScriptsAPI = {
     }
 };
 
+// Script-Streaming (Server-Sent Events) - Text erscheint während der Generierung
+// Erst Parameter per POST (mit CSRF-Token) prüfen lassen und ein signiertes
+// Stream-Token holen, dann die EventSource mit der stream_url öffnen
+async function streamScript(params, { onMeta, onDelta, onDone, onError } = {}) {
+    let stream;
+    try {
+        const response = await fetch('/kachel2/stream/', {
+            method: 'POST',
+            headers: { 'X-CSRFToken': getCookie('csrftoken') },
+            body: new URLSearchParams(params)
+        });
+        stream = await response.json();
+        if (!response.ok || !stream.success) {
+            throw new Error(stream.error || `${response.status} ${response.statusText}`);
+        }
+    } catch (error) {
+        console.error('Script-Stream konnte nicht gestartet werden:', error);
+        if (onError) onError({ error: error.message });
+        else showError(`Stream-Fehler: ${error.message}`);
+        return null;
+    }
+    
+    const source = new EventSource(stream.stream_url);
+    let text = '';
+    
+    source.addEventListener('meta', (event) => {
+        if (onMeta) onMeta(JSON.parse(event.data));
+    });
+    
+    source.addEventListener('delta', (event) => {
+        const data = JSON.parse(event.data);
+        text += data.content;
+        if (onDelta) onDelta(data.content, text);
+    });
+    
+    source.addEventListener('done', (event) => {
+        source.close();
+        if (onDone) onDone(JSON.parse(event.data), text);
+    });
+    
+    source.addEventListener('error', (event) => {
+        // Verbindung schließen - sonst verbindet EventSource automatisch neu
+        source.close();
+        const data = event.data ? JSON.parse(event.data) : { error: 'Verbindung unterbrochen' };
+        console.error('Script-Stream fehlgeschlagen:', data);
+        if (onError) onError(data);
+        else showError(`Stream-Fehler: ${data.error}`);
+    });
+    
+    return source;
+}
+
 // Loading States Management
 function showLoading(message = 'Lädt...') {
     // Entferne vorhandene Loading-Overlays